@@ -0,0 +1,131 @@
+"""Measure the memory held per channel/device record.
+
+Compares the previous ``__dict__``-backed layout of ``ChannelInfo`` and
+``DeviceInfo`` against the current ``__slots__`` classes and the tuple-backed
+``ChannelRecord`` / ``DeviceRecord`` types.
+
+Run with::
+
+    PYTHONPATH=. python benchmarks/record_size.py [count]
+
+"""
+import datetime
+import sys
+import tracemalloc
+
+import urbanairship as ua
+from urbanairship.devices import devicelist
+
+
+CHANNEL_PAYLOAD = {
+    'channel_id': '2ce7bb20-03a1-417d-bef5-61306e3755d7',
+    'device_type': 'ios',
+    'installed': True,
+    'opt_in': True,
+    'background': True,
+    'push_address': (
+        '28A97947F08FF0E0026EF38D157E0B1777B8DDD33D3B16130679288CEED645AF'
+    ),
+    'created': '2016-08-17T23:29:52',
+    'last_registration': '2016-08-18T17:57:31',
+    'named_user_id': None,
+    'alias': None,
+    'tags': [],
+    'tag_groups': {},
+    'ios': {'badge': 0, 'quiettime': {'start': None, 'end': None}, 'tz': None},
+}
+
+DEVICE_PAYLOAD = {
+    'device_token': (
+        '0101F9929660BAD9FFF31A0B5FA32620FA988507DFFA52BD6C1C1F4783EDA2DB'
+    ),
+    'active': True,
+    'alias': None,
+    'tags': [],
+    'created': '2013-07-17 21:17:42',
+}
+
+
+class LegacyChannelInfo(object):
+    """The ``__dict__``-backed layout ``ChannelInfo`` used previously."""
+
+    def __init__(self, airship):
+        self.airship = airship
+
+    @classmethod
+    def from_payload(cls, payload, device_key, airship):
+        obj = cls(airship)
+        obj.channel_id = payload[device_key]
+        for key in payload:
+            value = payload[key]
+            if key in ('created', 'last_registration'):
+                value = datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S')
+            setattr(obj, key, value)
+        return obj
+
+
+class LegacyDeviceInfo(object):
+    """The ``__dict__``-backed layout ``DeviceInfo`` used previously."""
+
+    def __init__(self, airship):
+        self.airship = airship
+
+    @classmethod
+    def from_payload(cls, payload, device_key, airship):
+        obj = cls(airship)
+        obj.id = payload[device_key]
+        obj.device_type = device_key
+        for key in payload:
+            value = payload[key]
+            if key == 'created':
+                value = datetime.datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+            setattr(obj, key, value)
+        return obj
+
+
+def bytes_per_record(record_class, payload, device_key, airship, count):
+    """Return the bytes allocated per record for ``count`` records.
+
+    The payload values are shared between records, so only the record
+    containers (instance, ``__dict__`` or tuple) and the values they create,
+    such as parsed datetimes, are measured.
+
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [
+        record_class.from_payload(payload, device_key, airship)
+        for _ in range(count)
+    ]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return float(after - before) / count
+
+
+def main(count=100000):
+    airship = ua.Airship('key', 'secret')
+    rows = [
+        ('channel (legacy dict)', LegacyChannelInfo, CHANNEL_PAYLOAD,
+         'channel_id'),
+        ('channel (ChannelInfo)', devicelist.ChannelInfo, CHANNEL_PAYLOAD,
+         'channel_id'),
+        ('channel (ChannelRecord)', devicelist.ChannelRecord, CHANNEL_PAYLOAD,
+         'channel_id'),
+        ('device (legacy dict)', LegacyDeviceInfo, DEVICE_PAYLOAD,
+         'device_token'),
+        ('device (DeviceInfo)', devicelist.DeviceInfo, DEVICE_PAYLOAD,
+         'device_token'),
+        ('device (DeviceRecord)', devicelist.DeviceRecord, DEVICE_PAYLOAD,
+         'device_token'),
+    ]
+    print('{0:<26} {1:>16}'.format('layout', 'bytes/record'))
+    for name, record_class, payload, device_key in rows:
+        size = bytes_per_record(
+            record_class, payload, device_key, airship, count
+        )
+        print('{0:<26} {1:>16.1f}'.format(name, size))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -22,7 +22,8 @@ setup(
         "urbanairship.push",
         "urbanairship.devices",
         "urbanairship.reports",
-        "urbanairship.automation"
+        "urbanairship.automation",
+        "urbanairship.analytics"
     ],
     license='BSD License',
     classifiers=[
@@ -37,4 +38,9 @@ setup(
         'requests>=1.2',
         'six'
     ],
+    extras_require={
+        'arrow': ['pyarrow'],
+        'zstd': ['zstandard'],
+        'analytics': ['numpy', 'pyroaring'],
+    },
 )
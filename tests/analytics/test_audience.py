@@ -0,0 +1,146 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import urbanairship as ua
+from urbanairship.analytics import AudienceEvaluator, TagIndex
+
+IOS = 'b8f9b663-0a3b-cf45-587a-be880946e881'
+ANDROID = '2ce7bb20-03a1-417d-bef5-61306e3755d7'
+WEB = 'aaabf77c-432e-4468-8b4a-0a173685e58f'
+UNINSTALLED = '4c3b6679-16f9-450a-9781-938cb3e9db7c'
+
+CHANNELS = [
+    {
+        'channel_id': IOS,
+        'device_type': 'ios',
+        'installed': True,
+        'opt_in': True,
+        'named_user_id': 'user1',
+        'tags': ['sports', 'news'],
+        'tag_groups': {'loyalty': ['gold']},
+    },
+    {
+        'channel_id': ANDROID,
+        'device_type': 'android',
+        'installed': True,
+        'opt_in': True,
+        'alias': 'alias1',
+        'tags': ['sports'],
+        'tag_groups': {'loyalty': ['silver']},
+    },
+    {
+        'channel_id': WEB,
+        'device_type': 'web',
+        'installed': True,
+        'opt_in': False,
+        'named_user_id': 'user1',
+        'tags': ['news'],
+    },
+    {
+        'channel_id': UNINSTALLED,
+        'device_type': 'ios',
+        'installed': False,
+        'opt_in': False,
+        'tags': ['sports'],
+    },
+]
+
+
+class TestAudienceEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.index = TagIndex.from_channels(CHANNELS)
+        self.evaluator = AudienceEvaluator(
+            self.index,
+            segments={
+                'sports-fans': ua.and_(ua.tag('sports'), ua.ios_channel(IOS)),
+                'loop': ua.segment('loop'),
+            }
+        )
+
+    def assertAudience(self, audience, channel_ids):
+        self.assertEqual(
+            self.evaluator.channel_ids(audience), set(channel_ids)
+        )
+        self.assertEqual(self.evaluator.count(audience), len(channel_ids))
+
+    def test_value_selectors(self):
+        self.assertAudience('all', [IOS, ANDROID, WEB, UNINSTALLED])
+        self.assertAudience(ua.tag('sports'), [IOS, ANDROID, UNINSTALLED])
+        self.assertAudience({'tag': 'gold', 'group': 'loyalty'}, [IOS])
+        self.assertAudience({'tag': ['gold', 'silver'], 'group': 'loyalty'},
+                            [IOS, ANDROID])
+        self.assertAudience(ua.tag('missing'), [])
+        self.assertAudience(ua.named_user('user1'), [IOS, WEB])
+        self.assertAudience(ua.alias('alias1'), [ANDROID])
+        self.assertAudience(ua.ios_channel(IOS.upper()), [IOS])
+        self.assertAudience(ua.android_channel(IOS), [])
+        self.assertAudience(ua.channel(WEB), [WEB])
+        self.assertAudience({'ios_channel': [IOS, UNINSTALLED]},
+                            [IOS, UNINSTALLED])
+
+    def test_compound_selectors(self):
+        self.assertAudience(
+            ua.and_(ua.tag('sports'), ua.tag('news')), [IOS]
+        )
+        self.assertAudience(
+            ua.or_(ua.tag('news'), ua.alias('alias1')), [IOS, ANDROID, WEB]
+        )
+        self.assertAudience(ua.not_(ua.tag('sports')), [WEB])
+        self.assertAudience(
+            ua.and_(ua.named_user('user1'), ua.not_(ua.tag('news'))), []
+        )
+        self.assertAudience(ua.segment('sports-fans'), [IOS])
+
+    def test_reachable_only(self):
+        evaluator = AudienceEvaluator(self.index, reachable_only=True)
+        self.assertEqual(
+            evaluator.channel_ids(ua.tag('sports')), set([IOS, ANDROID])
+        )
+        self.assertEqual(evaluator.count('all'), 2)
+
+    def test_compiled_audience_follows_index(self):
+        compiled = self.evaluator.compile(ua.tag('news'))
+        self.assertEqual(len(compiled()), 2)
+        self.index.add({'channel_id': WEB, 'tags': []})
+        self.assertEqual(len(compiled()), 1)
+        # Evaluating never modifies the index.
+        self.assertEqual(self.index.count('news'), 1)
+
+    def test_saved_index(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'tags.idx')
+            self.index.save(path)
+            evaluator = AudienceEvaluator(
+                TagIndex.load(path), reachable_only=True
+            )
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(
+            evaluator.channel_ids(
+                ua.or_(ua.named_user('user1'), ua.ios_channel(UNINSTALLED))
+            ),
+            set([IOS])
+        )
+
+    def test_chunks(self):
+        chunks = list(self.evaluator.chunks(ua.tag('sports'), 2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(
+            set(sum(chunks, [])), set([IOS, ANDROID, UNINSTALLED])
+        )
+
+    def test_invalid_selectors(self):
+        for audience in (
+                ua.device_token('A' * 64),
+                ua.apid(IOS),
+                ua.segment('unknown'),
+                ua.segment('loop'),
+                ua.and_(),
+                {'tag': 'sports', 'alias': 'x'},
+                {'tag': []},
+                'everyone',
+                {}):
+            self.assertRaises(ValueError, self.evaluator.compile, audience)
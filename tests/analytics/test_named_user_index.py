@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+from urbanairship.analytics import NamedUserIndex
+
+IOS = 'b8f9b663-0a3b-cf45-587a-be880946e881'
+ANDROID = '2ce7bb20-03a1-417d-bef5-61306e3755d7'
+WEB = 'aaabf77c-432e-4468-8b4a-0a173685e58f'
+
+NAMED_USERS = [
+    {
+        'named_user_id': 'user1',
+        'tags': {'crm': ['gold', 'vip']},
+        'channels': [
+            {'channel_id': IOS, 'device_type': 'ios', 'tags': ['a']},
+            {'channel_id': ANDROID, 'device_type': 'android'},
+        ],
+    },
+    {
+        'named_user_id': 'user2',
+        'tags': {},
+        'channels': [{'channel_id': WEB, 'device_type': 'web'}],
+    },
+]
+
+
+class TestNamedUserIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NamedUserIndex.from_named_users(NAMED_USERS)
+
+    def test_from_named_user_list(self):
+        airship = ua.Airship('key', 'secret')
+        response = requests.Response()
+        response._content = json.dumps(
+            {'named_users': NAMED_USERS}).encode('utf-8')
+        response.status_code = 200
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = response
+            index = ua.NamedUserIndex.from_named_users(
+                ua.NamedUserList(airship)
+            )
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.channel_ids('user2'), [WEB])
+
+    def test_lookups(self):
+        self.assertIn('user1', self.index)
+        self.assertEqual(
+            self.index.channels('user1'), [(IOS, 'ios'), (ANDROID, 'android')]
+        )
+        self.assertEqual(
+            self.index.channel_ids('user1', device_type='android'), [ANDROID]
+        )
+        self.assertEqual(self.index.channel_ids('unknown'), [])
+        self.assertEqual(self.index.tags('user1'), {'crm': ['gold', 'vip']})
+        self.assertEqual(self.index.named_user_for(WEB.upper()), 'user2')
+        self.assertIsNone(self.index.named_user_for('unknown'))
+        self.assertRaises(KeyError, self.index.channels, 'unknown')
+
+        named_user = self.index.get('user1')
+        self.assertIsInstance(named_user, ua.NamedUser)
+        self.assertEqual(named_user.named_user_id, 'user1')
+        self.assertEqual(
+            [c['channel_id'] for c in named_user.channels], [IOS, ANDROID]
+        )
+        self.assertIsNone(self.index.get('unknown'))
+
+    def test_associate(self):
+        self.index.associate('user2', IOS.upper(), 'ios')
+        self.assertEqual(self.index.channel_ids('user1'), [ANDROID])
+        self.assertEqual(self.index.channel_ids('user2'), [WEB, IOS])
+        self.assertEqual(self.index.named_user_for(IOS), 'user2')
+
+        self.index.associate('user3', ANDROID, 'android')
+        self.assertEqual(self.index.channel_ids('user1'), [])
+        self.assertEqual(self.index.channel_ids('user3'), [ANDROID])
+
+    def test_disassociate(self):
+        self.assertIsNone(
+            self.index.disassociate(IOS, 'ios', named_user_id='user2')
+        )
+        self.assertEqual(self.index.disassociate(IOS, 'ios'), 'user1')
+        self.assertEqual(self.index.channel_ids('user1'), [ANDROID])
+        self.assertIsNone(self.index.named_user_for(IOS))
+        self.assertIsNone(self.index.disassociate(IOS, 'ios'))
+
+    def test_tag(self):
+        self.index.tag('user1', 'crm', add=['new'], remove=['vip'])
+        self.assertEqual(self.index.tags('user1'), {'crm': ['gold', 'new']})
+        self.index.tag('user1', 'loyalty', set_tags=['silver'])
+        self.assertEqual(self.index.tags('user1')['loyalty'], ['silver'])
+        self.assertEqual(len(self.index.channels('user1')), 2)
+        self.assertRaises(
+            ValueError, self.index.tag, 'user1', 'crm', add=['a'],
+            set_tags=['b']
+        )
+        self.assertRaises(ValueError, self.index.tag, 'user1', 'crm')
+
+    def test_interns_text(self):
+        index = NamedUserIndex.from_named_users([
+            {'named_user_id': 'a', 'tags': {u'crm': [u''.join(['go', 'ld'])]}},
+            {'named_user_id': 'b', 'tags': {u'crm': [u''.join(['gol', 'd'])]}},
+        ])
+        self.assertIs(index.tags('a')['crm'][0], index.tags('b')['crm'][0])
+
+    def test_remove_and_update(self):
+        self.index.remove('user1')
+        self.assertNotIn('user1', self.index)
+        self.assertIsNone(self.index.named_user_for(IOS))
+
+        self.index.add({
+            'named_user_id': 'user2',
+            'channels': [{'channel_id': IOS, 'device_type': 'ios'}],
+        })
+        self.assertEqual(self.index.channel_ids('user2'), [IOS])
+        self.assertIsNone(self.index.named_user_for(WEB))
+        self.assertEqual(self.index.tags('user2'), {})
+
+    def test_save_and_load(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'named_users.ndjson.gz')
+            self.index.save(path)
+            loaded = NamedUserIndex.load(path)
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(loaded.named_users, self.index.named_users)
+        self.assertEqual(loaded.channel_owners, self.index.channel_owners)
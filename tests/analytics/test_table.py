@@ -0,0 +1,148 @@
+import datetime
+import json
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+from urbanairship.analytics import table
+
+CHANNELS = [
+    {
+        'channel_id': 'b8f9b663-0a3b-cf45-587a-be880946e881',
+        'device_type': 'ios',
+        'installed': True,
+        'opt_in': True,
+        'created': '2017-01-01T00:00:00',
+        'last_registration': '2017-06-30T00:00:00',
+        'named_user_id': 'user1',
+    },
+    {
+        'channel_id': '2ce7bb20-03a1-417d-bef5-61306e3755d7',
+        'device_type': 'android',
+        'installed': True,
+        'opt_in': 'false',
+        'created': '2017-01-01T00:00:00',
+        'last_registration': '2017-03-01T00:00:00',
+    },
+    {
+        'channel_id': 'aaabf77c-432e-4468-8b4a-0a173685e58f',
+        'device_type': 'ios',
+        'installed': False,
+        'opt_in': False,
+        'created': '2016-01-01T00:00:00',
+        'last_registration': 'None',
+    },
+    {
+        'channel_id': '4c3b6679-16f9-450a-9781-938cb3e9db7c',
+        'device_type': 'web',
+        'installed': True,
+        'opt_in': True,
+        'created': '2017-05-01 12:00:00',
+        'last_registration': '2017-06-25T00:00:00',
+    },
+]
+
+NOW = datetime.datetime(2017, 7, 1)
+
+
+@unittest.skipIf(table.numpy is None, 'numpy is not installed')
+class TestChannelTable(unittest.TestCase):
+    def setUp(self):
+        self.table = table.ChannelTable.from_channels(CHANNELS, chunk_size=3)
+
+    def test_from_channel_list(self):
+        airship = ua.Airship('key', 'secret')
+        response = requests.Response()
+        response._content = json.dumps(
+            {'channels': CHANNELS}).encode('utf-8')
+        response.status_code = 200
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = response
+            channels = ua.ChannelTable.from_channels(ua.ChannelList(airship))
+
+        self.assertEqual(len(channels), 4)
+        self.assertEqual(
+            list(channels.channel_ids), [c['channel_id'] for c in CHANNELS]
+        )
+
+    def test_columns(self):
+        numpy = table.numpy
+        self.assertEqual(self.table.device_types, ('ios', 'android', 'web'))
+        self.assertEqual(list(self.table.device_type_codes), [0, 1, 0, 2])
+        self.assertEqual(
+            list(self.table.device_type), ['ios', 'android', 'ios', 'web']
+        )
+        self.assertEqual(
+            list(self.table.opt_in), [True, False, False, True]
+        )
+        self.assertEqual(self.table.created.dtype, numpy.dtype('M8[s]'))
+        self.assertEqual(
+            self.table.created[3], numpy.datetime64('2017-05-01T12:00:00')
+        )
+        self.assertTrue(numpy.isnat(self.table.last_registration[2]))
+        self.assertEqual(
+            list(self.table.named_user_ids), ['user1', None, None, None]
+        )
+
+    def test_empty(self):
+        channels = table.ChannelTable.from_channels([])
+        self.assertEqual(len(channels), 0)
+        self.assertEqual(channels.device_type_counts(), {})
+        self.assertIsNone(channels.opt_in_rate())
+
+    def test_mask(self):
+        self.assertEqual(
+            list(self.table.mask(device_type='ios', installed=True)),
+            [True, False, False, False]
+        )
+        self.assertEqual(
+            list(self.table.mask(device_type=['web', 'android'])),
+            [False, True, False, True]
+        )
+        self.assertEqual(
+            list(self.table.mask(device_type='amazon')),
+            [False, False, False, False]
+        )
+        self.assertEqual(
+            list(self.table.mask(named_user=False, opt_in=True)),
+            [False, False, False, True]
+        )
+
+    def test_device_type_counts(self):
+        self.assertEqual(
+            self.table.device_type_counts(),
+            {'ios': 2, 'android': 1, 'web': 1}
+        )
+        self.assertEqual(
+            self.table.device_type_counts(where=self.table.opt_in),
+            {'ios': 1, 'android': 0, 'web': 1}
+        )
+
+    def test_opt_in_rates(self):
+        self.assertEqual(self.table.opt_in_rate(), 0.5)
+        self.assertEqual(
+            self.table.opt_in_rates(),
+            {'ios': 0.5, 'android': 0.0, 'web': 1.0}
+        )
+        self.assertEqual(
+            self.table.opt_in_rates(where=self.table.installed),
+            {'ios': 1.0, 'android': 0.0, 'web': 1.0}
+        )
+
+    def test_registration_age_histogram(self):
+        self.assertEqual(
+            list(self.table.registration_age_histogram(now=NOW)),
+            [0, 2, 0, 0, 1, 0, 0]
+        )
+        by_type = self.table.registration_age_histogram(
+            bins=[0, 30, 365], now=NOW, by_device_type=True
+        )
+        self.assertEqual(list(by_type['ios']), [1, 0])
+        self.assertEqual(list(by_type['android']), [0, 1])
+        self.assertEqual(list(by_type['web']), [1, 0])
+        self.assertRaises(
+            ValueError, self.table.registration_age_histogram, bins=[5, 1]
+        )
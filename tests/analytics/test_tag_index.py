@@ -0,0 +1,213 @@
+import array
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+from urbanairship.analytics import bitmap
+from urbanairship.analytics.tag_index import TagIndex
+
+CHANNELS = [
+    {
+        'channel_id': 'b8f9b663-0a3b-cf45-587a-be880946e881',
+        'tags': ['sports', 'news'],
+        'tag_groups': {'loyalty': ['gold']},
+    },
+    {
+        'channel_id': '2ce7bb20-03a1-417d-bef5-61306e3755d7',
+        'tags': ['sports'],
+        'tag_groups': {'loyalty': ['silver'], 'timezone': ['UTC']},
+    },
+    {
+        'channel_id': 'aaabf77c-432e-4468-8b4a-0a173685e58f',
+        'tags': [],
+        'tag_groups': {},
+    },
+]
+
+
+class TestIntBitmap(unittest.TestCase):
+    def test_set_operations(self):
+        a = bitmap.IntBitmap([1, 5, 64])
+        b = bitmap.IntBitmap([5, 100])
+        self.assertEqual(list(a | b), [1, 5, 64, 100])
+        self.assertEqual(list(a & b), [5])
+        self.assertEqual(list(a - b), [1, 64])
+        self.assertEqual(list(a ^ b), [1, 64, 100])
+        self.assertEqual(len(a), 3)
+        self.assertIn(64, a)
+        self.assertNotIn(63, a)
+        a.discard(64)
+        self.assertEqual(list(a), [1, 5])
+
+    def test_serialize(self):
+        a = bitmap.IntBitmap([0, 7, 1000000])
+        self.assertEqual(bitmap.IntBitmap.deserialize(a.serialize()), a)
+        self.assertEqual(
+            list(bitmap.deserialize(a.serialize(), 'int')), [0, 7, 1000000]
+        )
+        self.assertEqual(
+            list(bitmap.IntBitmap.deserialize(bitmap.IntBitmap().serialize())),
+            []
+        )
+
+    def test_large(self):
+        values = list(range(0, 400000, 2))
+        a = bitmap.IntBitmap()
+        for value in reversed(values):
+            a.add(value)
+        self.assertEqual(len(a), 200000)
+        self.assertEqual(list(a), values)
+        self.assertEqual(bitmap.IntBitmap.deserialize(a.serialize()), a)
+        for value in values[:100000]:
+            a.discard(value)
+        self.assertEqual(list(a), values[100000:])
+
+
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TagIndex.from_channels(CHANNELS)
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_from_channel_list(self):
+        airship = ua.Airship('key', 'secret')
+        response = requests.Response()
+        response._content = json.dumps(
+            {'channels': CHANNELS}).encode('utf-8')
+        response.status_code = 200
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = response
+            index = ua.TagIndex.from_channels(ua.ChannelList(airship))
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.count('sports'), 2)
+
+    def test_counts(self):
+        self.assertEqual(self.index.count('sports'), 2)
+        self.assertEqual(self.index.count('news'), 1)
+        self.assertEqual(self.index.count('gold', group='loyalty'), 1)
+        self.assertEqual(self.index.count('missing'), 0)
+        self.assertEqual(
+            self.index.groups(), set(['device', 'loyalty', 'timezone'])
+        )
+        self.assertEqual(
+            self.index.cardinalities('loyalty'), {'gold': 1, 'silver': 1}
+        )
+        self.assertEqual(
+            list(self.index.channel_ids_for(self.index.members('sports'))),
+            [CHANNELS[0]['channel_id'], CHANNELS[1]['channel_id']]
+        )
+
+    def test_incremental_update(self):
+        self.index.add({
+            'channel_id': CHANNELS[0]['channel_id'],
+            'tags': ['weather'],
+        })
+        self.index.add({
+            'channel_id': '4c3b6679-16f9-450a-9781-938cb3e9db7c',
+            'tags': ['weather'],
+        })
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.count('sports'), 1)
+        self.assertEqual(self.index.count('news'), 0)
+        self.assertEqual(self.index.count('gold', group='loyalty'), 0)
+        self.assertEqual(self.index.count('weather'), 2)
+
+        self.index.remove(CHANNELS[1]['channel_id'])
+        self.assertEqual(len(self.index), 3)
+        self.assertNotIn(CHANNELS[1]['channel_id'], self.index)
+        self.assertEqual(self.index.count('sports'), 0)
+        self.assertRaises(KeyError, self.index.remove, 'unknown')
+
+    def test_readd_many_channels(self):
+        channels = [
+            {
+                'channel_id': 'channel-%d' % i,
+                'tags': ['tag-%d' % i, 'shard-%d' % (i % 10)],
+                'device_type': 'ios' if i % 2 else 'android',
+            }
+            for i in range(20000)
+        ]
+        index = TagIndex.from_channels(channels)
+        for i, channel in enumerate(channels):
+            channel['tags'] = ['shard-%d' % (i % 5)]
+        index.update(channels)
+        self.assertEqual(len(index), 20000)
+        self.assertEqual(index.count('tag-1'), 0)
+        self.assertEqual(index.count('shard-0'), 4000)
+        self.assertEqual(index.count('shard-9'), 0)
+        self.assertEqual(len(index.bitmaps), 5)
+        self.assertEqual(len(index.attribute('device_type', 'ios')), 10000)
+        self.assertIsInstance(index._memberships[0], array.array)
+        self.assertEqual(len(index._memberships[0]), 2)
+
+    def test_value_fields(self):
+        index = TagIndex.from_channels([
+            {'channel_id': 'a', 'device_type': 'ios',
+             'named_user_id': 'user1', 'alias': 'alias1'},
+            {'channel_id': 'b', 'device_type': 'web',
+             'named_user_id': 'user1'},
+            {'channel_id': 'c', 'device_type': 'ios',
+             'named_user_id': 'user2'},
+        ])
+        self.assertEqual(
+            sorted(index.attributes), [('device_type', 'ios'),
+                                       ('device_type', 'web')]
+        )
+        self.assertEqual(list(index.attribute('named_user_id', 'user1')),
+                         [0, 1])
+        self.assertEqual(list(index.attribute('alias', 'alias1')), [0])
+        self.assertEqual(list(index.attribute('alias', 'missing')), [])
+
+        index.add({'channel_id': 'a', 'named_user_id': 'user2'})
+        self.assertEqual(list(index.attribute('named_user_id', 'user1')),
+                         [1])
+        self.assertEqual(list(index.attribute('named_user_id', 'user2')),
+                         [0, 2])
+        self.assertEqual(index.values['alias'], {})
+
+        path = os.path.join(self.tmpdir, 'tags.idx')
+        index.save(path)
+        loaded = TagIndex.load(path)
+        self.assertEqual(list(loaded.attribute('named_user_id', 'user2')),
+                         [0, 2])
+        loaded.remove('c')
+        self.assertEqual(list(loaded.attribute('named_user_id', 'user2')),
+                         [0])
+
+    def test_save_and_load(self):
+        self.index.remove(CHANNELS[2]['channel_id'])
+        path = os.path.join(self.tmpdir, 'tags.idx')
+        self.index.save(path)
+
+        loaded = TagIndex.load(path)
+        self.assertEqual(len(loaded), 2)
+        self.assertNotIn(CHANNELS[2]['channel_id'], loaded)
+        self.assertEqual(loaded.count('sports'), 2)
+        self.assertEqual(loaded.count('UTC', group='timezone'), 1)
+        self.assertEqual(
+            loaded.cardinalities('loyalty'), {'gold': 1, 'silver': 1}
+        )
+
+        loaded.add({'channel_id': CHANNELS[2]['channel_id'], 'tags': ['a']})
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.count('a'), 1)
+
+        loaded.add({'channel_id': CHANNELS[0]['channel_id'], 'tags': []})
+        self.assertEqual(loaded.count('sports'), 1)
+        self.assertEqual(loaded.count('gold', group='loyalty'), 0)
+
+    def test_load_invalid_file(self):
+        path = os.path.join(self.tmpdir, 'tags.idx')
+        with open(path, 'wb') as f:
+            f.write(b'not an index')
+        self.assertRaises(ValueError, TagIndex.load, path)
@@ -282,3 +282,111 @@ class TestDeviceListing(unittest.TestCase):
             )
             self.assertListEqual(apid_responses[0].tags, [])
             self.assertListEqual(apid_responses[1].tags, ['tag1'])
+
+    def test_channel_listing_records(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {
+                    "channels": [
+                        {
+                            "channel_id": self.channel1,
+                            "device_type": "ios",
+                            "opt_in": True,
+                            "created": "2016-08-17T23:29:52",
+                            "tags": ["tag1"],
+                            "unknown_field": "ignored"
+                        }
+                    ]
+                }
+            ).encode('utf-8')
+            response.status_code = 200
+            mock_request.return_value = response
+
+            airship = ua.Airship('key', 'secret')
+            records = list(ua.ChannelList(airship, records=True))
+
+            self.assertIsInstance(records[0], ua.ChannelRecord)
+            self.assertEqual(records[0].channel_id, self.channel1)
+            self.assertEqual(records[0].opt_in, True)
+            self.assertEqual(records[0].tags, ['tag1'])
+            self.assertEqual(records[0].created, '2016-08-17T23:29:52')
+            self.assertEqual(records[0].push_address, None)
+
+    def test_channel_info_has_no_dict(self):
+        channel = ua.ChannelInfo.from_payload(
+            {'channel_id': self.channel1, 'extra_field': 'ignored'},
+            'channel_id',
+            None
+        )
+        self.assertFalse(hasattr(channel, '__dict__'))
+        self.assertEqual(channel.channel_id, self.channel1)
+        self.assertEqual(channel.tags, None)
+
+        device = ua.DeviceInfo.from_payload(
+            {'apid': self.apid1, 'active': True}, 'apid', None
+        )
+        self.assertFalse(hasattr(device, '__dict__'))
+        self.assertEqual(device.apid, self.apid1)
+        self.assertEqual(device.id, self.apid1)
+        self.assertEqual(device.device_token, None)
+
+    def test_device_token_listing_records(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {
+                    "device_tokens": [
+                        {
+                            "tags": [],
+                            "alias": None,
+                            "active": True,
+                            "created": "2013-07-17 21:17:42",
+                            "device_token": self.device_token1
+                        }
+                    ]
+                }
+            ).encode('utf-8')
+            response.status_code = 200
+            mock_request.return_value = response
+
+            airship = ua.Airship('key', 'secret')
+            records = list(ua.DeviceTokenList(airship, records=True))
+
+            self.assertIsInstance(records[0], ua.DeviceRecord)
+            self.assertEqual(records[0].id, self.device_token1)
+            self.assertEqual(records[0].device_token, self.device_token1)
+            self.assertEqual(records[0].device_type, 'device_token')
+            self.assertEqual(records[0].active, True)
+
+    def test_channel_listing_fields(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {
+                    "channels": [
+                        {
+                            "channel_id": self.channel1,
+                            "device_type": "ios",
+                            "opt_in": True,
+                            "push_address": self.push_address1,
+                            "created": "2016-08-17T23:29:52",
+                            "tags": ["tag1"]
+                        }
+                    ]
+                }
+            ).encode('utf-8')
+            response.status_code = 200
+            mock_request.return_value = response
+
+            airship = ua.Airship('key', 'secret')
+            channels = list(
+                ua.ChannelList(airship, fields=['opt_in', 'tags'])
+            )
+
+            self.assertEqual(channels[0].channel_id, self.channel1)
+            self.assertEqual(channels[0].opt_in, True)
+            self.assertEqual(channels[0].tags, ['tag1'])
+            self.assertEqual(channels[0].device_type, None)
+            self.assertEqual(channels[0].push_address, None)
+            self.assertEqual(channels[0].created, None)
@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+
+
+def channel(channel_id, last_registration, tags=(), named_user_id=None,
+            opt_in=True, tag_groups=None):
+    return {
+        'channel_id': channel_id,
+        'device_type': 'ios',
+        'installed': True,
+        'opt_in': opt_in,
+        'named_user_id': named_user_id,
+        'created': '2016-08-17T23:29:52',
+        'last_registration': last_registration,
+        'tags': list(tags),
+        'tag_groups': tag_groups or {},
+    }
+
+
+def listing(*channels):
+    response = requests.Response()
+    response._content = json.dumps({'channels': channels}).encode('utf-8')
+    response.status_code = 200
+    return response
+
+
+class TestChannelMirror(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'channels.db')
+        self.airship = ua.Airship('key', 'secret')
+        self.channel1 = '0492662a-1b52-4343-a1f9-c6b0c72931c0'
+        self.channel2 = 'd95ceae2-85cb-41b7-a87d-09c9b3ce4051'
+        self.channel3 = 'f10cf38c-3fbd-47e8-a4aa-43cf91d80ba1'
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_rebuild_and_query(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = listing(
+                channel(self.channel1, '2016-08-18T17:57:31',
+                        tags=['sports'], named_user_id='user1',
+                        tag_groups={'loyalty': ['gold']}),
+                channel(self.channel2, '2016-08-18T17:57:31',
+                        tags=['sports', 'news'], named_user_id='user1',
+                        opt_in=False),
+            )
+            mirror = ua.ChannelMirror(self.airship, self.path)
+            self.assertEqual(mirror.rebuild(), 2)
+
+        channel_info = mirror.get(self.channel1.upper())
+        self.assertIsInstance(channel_info, ua.ChannelInfo)
+        self.assertEqual(channel_info.channel_id, self.channel1)
+        self.assertEqual(channel_info.tags, ['sports'])
+        self.assertIsNone(mirror.get(self.channel3))
+
+        self.assertEqual(
+            sorted(c.channel_id for c in mirror.by_named_user('user1')),
+            [self.channel1, self.channel2]
+        )
+        self.assertEqual(
+            sorted(mirror.channel_ids_with_tag('sports')),
+            [self.channel1, self.channel2]
+        )
+        self.assertEqual(
+            list(mirror.channel_ids_with_tag('gold', group='loyalty')),
+            [self.channel1]
+        )
+        self.assertEqual(mirror.count(), 2)
+        self.assertEqual(mirror.count(tag='sports', opt_in=True), 1)
+        self.assertEqual(mirror.count(tag='news'), 1)
+        mirror.close()
+
+    def test_refresh_writes_newer_registrations(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = listing(
+                channel(self.channel1, '2016-08-18T17:57:31', tags=['a']),
+                channel(self.channel2, '2016-08-18T17:57:31', tags=['a']),
+            )
+            mirror = ua.ChannelMirror(self.airship, self.path)
+            mirror.rebuild()
+
+            mock_request.return_value = listing(
+                channel(self.channel1, '2016-09-01T00:00:00', tags=['b']),
+                channel(self.channel2, '2016-08-18T17:57:31', tags=['c']),
+                channel(self.channel3, '2016-09-02T00:00:00', tags=['b']),
+            )
+            self.assertEqual(mirror.refresh(), 2)
+
+        self.assertEqual(mirror.get(self.channel1).tags, ['b'])
+        # Unchanged registration; the stored copy is kept.
+        self.assertEqual(mirror.get(self.channel2).tags, ['a'])
+        self.assertEqual(mirror.get(self.channel3).tags, ['b'])
+        self.assertEqual(
+            sorted(mirror.channel_ids_with_tag('b')),
+            [self.channel1, self.channel3]
+        )
+        self.assertEqual(list(mirror.channel_ids_with_tag('c')), [])
+        mirror.close()
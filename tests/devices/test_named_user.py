@@ -89,3 +89,57 @@ class TestNamedUserList(unittest.TestCase):
 
             for a in named_user_list:
                 self.assertEqual(a.named_user_id, name_list.pop())
+
+    def test_NamedUserlist_instances(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {
+                    'named_users': [
+                        {'named_user_id': 'name1', 'tags': {'g': ['a']},
+                         'attributes': {'city': 'Portland'}},
+                        {'named_user_id': 'name2', 'tags': {'g': ['b']}}
+                    ]
+                }
+            ).encode('utf-8')
+            mock_request.return_value = response
+
+            airship = ua.Airship('key', 'secret')
+            named_users = list(ua.NamedUserList(airship))
+
+            self.assertIsInstance(named_users[0], ua.NamedUser)
+            self.assertIsNot(named_users[0], named_users[1])
+            self.assertEqual(
+                [n.named_user_id for n in named_users], ['name1', 'name2']
+            )
+            self.assertEqual(named_users[0].tags, {'g': ['a']})
+            self.assertEqual(named_users[1].tags, {'g': ['b']})
+            self.assertEqual(
+                named_users[0].attributes, {'city': 'Portland'}
+            )
+            self.assertFalse(hasattr(named_users[1], 'attributes'))
+
+    def test_NamedUserlist_fields(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {
+                    'named_users': [
+                        {
+                            'named_user_id': 'name1',
+                            'tags': {'group': ['tag1']},
+                            'channels': [{'channel_id': 'abc'}]
+                        }
+                    ]
+                }
+            ).encode('utf-8')
+            mock_request.return_value = response
+
+            airship = ua.Airship('key', 'secret')
+            named_users = list(
+                ua.NamedUserList(airship, fields=['named_user_id', 'tags'])
+            )
+
+            self.assertEqual(named_users[0].named_user_id, 'name1')
+            self.assertEqual(named_users[0].tags, {'group': ['tag1']})
+            self.assertEqual(named_users[0].channels, None)
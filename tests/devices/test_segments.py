@@ -27,6 +27,52 @@ class TestSegmentList(unittest.TestCase):
             for a in seg_list:
                 self.assertEqual(a.display_name, name_list.pop())
 
+    def test_segment_list_instances(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {
+                    "segments": [
+                        {"id": "1", "display_name": "test1"},
+                        {"id": "2", "display_name": "test2"}
+                    ]
+                }
+            ).encode('utf-8')
+            mock_request.return_value = response
+
+            airship = ua.Airship('key', 'secret')
+            segments = list(ua.SegmentList(airship))
+
+            self.assertIsInstance(segments[0], ua.Segment)
+            self.assertEqual([s.id for s in segments], ['1', '2'])
+            self.assertEqual(
+                [s.display_name for s in segments], ['test1', 'test2']
+            )
+            self.assertIsNone(ua.Segment().display_name)
+
+    def test_segment_from_id(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {'display_name': 'test1', 'criteria': {'tag': 'a'}}
+            ).encode('utf-8')
+            mock_request.return_value = response
+            airship = ua.Airship('key', 'secret')
+
+            segment = ua.Segment()
+            segment.from_id(airship, '1')
+            self.assertEqual(segment.id, '1')
+            self.assertEqual(segment.display_name, 'test1')
+            self.assertIsNone(ua.Segment.display_name)
+
+            class LookedUp(ua.Segment):
+                pass
+
+            res = LookedUp.from_id(airship, '2')
+            self.assertIs(res, response)
+            self.assertEqual(LookedUp.id, '2')
+            self.assertEqual(LookedUp.criteria, {'tag': 'a'})
+
 
 class TestSegment(unittest.TestCase):
     def test_segment_create_update_delete(self):
@@ -0,0 +1,137 @@
+import datetime
+import json
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+from urbanairship.devices.sweep import SweepRule
+
+NOW = datetime.datetime(2017, 7, 1)
+
+
+def channel(index, device_type='ios', installed=True, opt_in=True,
+            last_registration='2017-06-30T00:00:00'):
+    return {
+        'channel_id': '00000000-0000-0000-0000-%012d' % index,
+        'device_type': device_type,
+        'installed': installed,
+        'opt_in': opt_in,
+        'last_registration': last_registration,
+    }
+
+
+def response(payload, status_code=200):
+    response = requests.Response()
+    response._content = json.dumps(payload).encode('utf-8')
+    response.status_code = status_code
+    return response
+
+
+class TestSweepRule(unittest.TestCase):
+    def test_matches(self):
+        rule = SweepRule('dormant', opt_in=False, inactive_days=90)
+        self.assertTrue(rule.matches(
+            channel(1, opt_in='false',
+                    last_registration='2017-01-01T00:00:00'), NOW
+        ))
+        self.assertFalse(rule.matches(
+            channel(1, opt_in=False), NOW
+        ))
+        self.assertFalse(rule.matches(
+            channel(1, opt_in=True,
+                    last_registration='2017-01-01T00:00:00'), NOW
+        ))
+        self.assertFalse(rule.matches(
+            channel(1, opt_in=False, last_registration=None), NOW
+        ))
+
+        rule = SweepRule('web', installed=False, device_types=['web'])
+        self.assertTrue(rule.matches(
+            channel(1, device_type='web', installed=False), NOW
+        ))
+        self.assertFalse(rule.matches(channel(1, installed=False), NOW))
+
+    def test_requires_condition(self):
+        self.assertRaises(ValueError, SweepRule, 'all', device_types=['ios'])
+
+
+class TestChannelSweep(unittest.TestCase):
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+        channels = [channel(i, installed=False) for i in range(250)]
+        channels += [
+            channel(i, device_type='android') for i in range(250, 260)
+        ]
+        channels += [
+            channel(i, device_type='android', opt_in=False,
+                    last_registration='2016-01-01T00:00:00')
+            for i in range(260, 265)
+        ]
+        self.listing = response({'channels': channels})
+        self.sweep = ua.ChannelSweep(
+            self.airship,
+            [ua.SweepRule('uninstalled', installed=False),
+             ua.SweepRule('dormant', opt_in=False, inactive_days=180)],
+            now=NOW
+        )
+
+    def test_dry_run(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = self.listing
+            report = self.sweep.run()
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertTrue(report.dry_run)
+        self.assertEqual(report.scanned, 265)
+        self.assertEqual(report.flagged, 255)
+        self.assertEqual(report.by_rule, {'uninstalled': 250, 'dormant': 5})
+        self.assertEqual(
+            report.by_device_type, {'ios': 250, 'android': 5}
+        )
+        self.assertEqual(report.batches, 2)
+        self.assertEqual(report.uninstalled, 0)
+
+    def test_batches(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = self.listing
+            batches = list(self.sweep.batches())
+
+        self.assertEqual([len(batch) for batch in batches], [200, 55])
+        self.assertEqual(
+            batches[1][-1],
+            {'channel_id': '00000000-0000-0000-0000-000000000264',
+             'device_type': 'android'}
+        )
+
+    def test_run(self):
+        uninstalled = []
+
+        def request(method, body, url, *args, **kwargs):
+            if method == 'GET':
+                return self.listing
+            batch = json.loads(body)
+            uninstalled.append(batch)
+            if len(uninstalled) == 1:
+                raise ua.AirshipFailure(
+                    'error', 500, None, response({}, 500)
+                )
+            return response({'ok': True})
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = request
+            with mock.patch('urbanairship.common.RateLimiter') as limiter:
+                report = self.sweep.run(
+                    dry_run=False, channels_per_second=100
+                )
+
+        limiter.assert_called_once_with(100)
+        self.assertEqual(
+            limiter.return_value.wait.call_args_list,
+            [mock.call(200), mock.call(55)]
+        )
+        self.assertEqual([len(batch) for batch in uninstalled], [200, 55])
+        self.assertEqual(report.uninstalled, 55)
+        self.assertEqual(len(report.failures), 1)
+        self.assertEqual(len(report.failures[0][0]), 200)
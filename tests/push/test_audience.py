@@ -1,6 +1,7 @@
 import unittest
 
 import urbanairship as ua
+from urbanairship.push import audience
 
 
 class TestAudience(unittest.TestCase):
@@ -185,3 +186,85 @@ class TestAudience(unittest.TestCase):
         self.assertRaises(ValueError, ua.location)
         self.assertRaises(ValueError, ua.location, alias=1, id=1)
         self.assertRaises(ValueError, ua.location, date=None, id='foobar')
+
+
+class TestBulkNormalization(unittest.TestCase):
+    def setUp(self):
+        self.channel_ids = [
+            '0492662A-1B52-4343-A1F9-%012X' % i for i in range(100)
+        ]
+
+    def test_channel_ids(self):
+        ids = list(self.channel_ids)
+        ids[3] = 'bogus'
+        ids[10] = None
+        ids[40] = ids[40] + '\n'
+        ids[41] = ' ' + ids[41]
+        ids[42] = ids[42][:35] + '\n'
+        ids[60] = ids[60].replace('-', 'x', 1)
+        normalized, invalid = ua.normalize_channel_ids(ids)
+
+        expected_invalid = [i in (3, 10, 41, 42, 60) for i in range(100)]
+        self.assertEqual(invalid, expected_invalid)
+        for i, value in enumerate(ids):
+            if expected_invalid[i]:
+                self.assertEqual(normalized[i], value)
+            else:
+                self.assertEqual(
+                    normalized[i], ua.ios_channel(value)['ios_channel']
+                )
+
+    def test_all_valid_batches(self):
+        normalized, invalid = ua.normalize_channel_ids(
+            iter(self.channel_ids)
+        )
+        self.assertEqual(normalized, [c.lower() for c in self.channel_ids])
+        self.assertFalse(any(invalid))
+        self.assertEqual(ua.normalize_channel_ids([]), ([], []))
+
+    def test_device_tokens(self):
+        tokens = ['a' * 64, 'F0' * 32, 'a' * 63, 'g' * 64] * 5
+        normalized, invalid = ua.normalize_device_tokens(tokens)
+        self.assertEqual(normalized[:4], ['A' * 64, 'F0' * 32] + tokens[2:4])
+        self.assertEqual(invalid[:4], [False, False, True, True])
+
+    @unittest.skipIf(audience.numpy is None, 'numpy is not installed')
+    def test_numpy_array(self):
+        ids = audience.numpy.array(self.channel_ids + ['bogus'])
+        normalized, invalid = ua.normalize_channel_ids(ids)
+        self.assertEqual(
+            normalized.tolist(),
+            [c.lower() for c in self.channel_ids] + ['bogus'],
+        )
+        self.assertEqual(invalid.dtype, bool)
+        self.assertEqual(invalid.sum(), 1)
+        self.assertTrue(invalid[-1])
+
+    @unittest.skipIf(audience.numpy is None, 'numpy is not installed')
+    def test_numpy_bytes_array(self):
+        numpy = audience.numpy
+        ids = numpy.array(
+            [c.encode('ascii') for c in self.channel_ids] + [b'bogus\xff'],
+            dtype='S36'
+        )
+        normalized, invalid = ua.normalize_channel_ids(ids)
+        self.assertEqual(normalized.dtype, ids.dtype)
+        self.assertEqual(
+            normalized.tolist(),
+            [c.lower().encode('ascii') for c in self.channel_ids] +
+            [b'bogus\xff'],
+        )
+        self.assertEqual(invalid.tolist(), [False] * 100 + [True])
+
+        tokens = numpy.array([b'a' * 64], dtype='S64')
+        normalized, invalid = ua.normalize_device_tokens(tokens)
+        self.assertEqual(normalized.tolist(), [b'A' * 64])
+        self.assertFalse(invalid[0])
+
+    @unittest.skipIf(audience.numpy is None, 'numpy is not installed')
+    def test_empty_numpy_array(self):
+        ids = audience.numpy.array([], dtype='U36')
+        normalized, invalid = ua.normalize_channel_ids(ids)
+        self.assertEqual(normalized.dtype, ids.dtype)
+        self.assertEqual(invalid.dtype, bool)
+        self.assertEqual(len(normalized), 0)
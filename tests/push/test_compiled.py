@@ -0,0 +1,106 @@
+import json
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+
+CHANNEL = '0492662a-1b52-4343-a1f9-c6b0c72931c0'
+
+
+class TestCompiledPush(unittest.TestCase):
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+        push = self.airship.create_push()
+        push.audience = ua.Variable('audience')
+        push.notification = ua.notification(
+            alert=u'Hi ' + ua.Variable('name') + '!',
+            ios=ua.ios(badge=1, title=ua.Variable('title')),
+        )
+        push.device_types = ua.device_types('ios', 'android')
+        self.push = push
+        self.compiled = ua.CompiledPush(push)
+
+    def expected(self, audience, name, title):
+        return {
+            'audience': audience,
+            'notification': {
+                'alert': u'Hi %s!' % name,
+                'ios': {'badge': 1, 'title': title},
+            },
+            'device_types': ['ios', 'android'],
+        }
+
+    def test_render(self):
+        self.assertEqual(
+            self.compiled.variables, frozenset(['audience', 'name', 'title'])
+        )
+        values = [
+            (ua.ios_channel(CHANNEL), u'Zo\xeb', u'Sale'),
+            (ua.or_(ua.named_user('a'), ua.tag('b')), 'Bob "B" \\', 'x\ny'),
+            ('all', 42, u'\U0001f600'),
+        ]
+        for audience, name, title in values:
+            body = self.compiled.render(
+                audience=audience, name=name, title=title
+            )
+            self.assertIsInstance(body, bytes)
+            self.assertEqual(
+                json.loads(body.decode('utf-8')),
+                self.expected(audience, name, title),
+            )
+
+    def test_escaped_quote_before_variable(self):
+        push = self.airship.create_push()
+        push.audience = ua.all_
+        push.notification = ua.notification(
+            alert='He said "' + ua.Variable('q'),
+            ios=ua.ios(title='\\' + ua.Variable('t') + '\\"'),
+        )
+        push.device_types = ua.device_types('ios')
+        compiled = ua.CompiledPush(push)
+        body = json.loads(compiled.render(q=42, t='x').decode('utf-8'))
+        self.assertEqual(body['notification']['alert'], 'He said "42')
+        self.assertEqual(body['notification']['ios']['title'], '\\x\\"')
+
+    def test_missing_variable(self):
+        self.assertRaises(
+            ValueError, self.compiled.render, audience='all', name='A'
+        )
+
+    def test_validation(self):
+        self.assertRaises(ValueError, ua.Variable, 'not a name')
+        self.push.device_types = None
+        self.assertRaises(ValueError, ua.CompiledPush, self.push)
+        self.assertRaises(TypeError, ua.CompiledPush, 'push')
+        self.assertRaises(
+            ValueError, ua.CompiledPush,
+            {'audience': 'all', 'device_types': 'all'}
+        )
+        self.assertRaises(
+            ValueError, ua.CompiledPush(self.expected('all', 'A', 'T')).bind
+        )
+
+    def test_send_and_batch(self):
+        rendered = self.compiled.bind(audience='all', name='A', title='T')
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            response = requests.Response()
+            response._content = json.dumps(
+                {'ok': True, 'push_ids': ['id1', 'id2']}
+            ).encode('utf-8')
+            response.status_code = 202
+            mock_request.return_value = response
+
+            self.assertEqual(rendered.send().push_ids, ['id1', 'id2'])
+            self.assertEqual(
+                mock_request.call_args[1]['body'], rendered.body
+            )
+
+            batch = self.airship.create_push_batch([rendered, rendered])
+            batch.send()
+            body = mock_request.call_args[1]['body']
+            self.assertEqual(
+                json.loads(body.decode('utf-8')),
+                [self.expected('all', 'A', 'T')] * 2,
+            )
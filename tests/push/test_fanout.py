@@ -0,0 +1,198 @@
+import json
+import unittest
+
+import urbanairship as ua
+
+CHANNELS = [
+    '0492662a-1b52-4343-a1f9-c6b0c72931c%d' % i for i in range(10)
+]
+
+
+class TestCoalescePushes(unittest.TestCase):
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+
+    def push(self, audience, alert='Hello', options=None):
+        push = self.airship.create_push()
+        push.audience = audience
+        push.notification = ua.notification(alert=alert)
+        push.device_types = ua.all_
+        push.options = options
+        return push
+
+    def test_merges_identical_payloads(self):
+        pushes = [
+            self.push(ua.ios_channel(CHANNELS[0])),
+            self.push(ua.named_user('user1')),
+            self.push(ua.ios_channel(CHANNELS[1]), alert='Other'),
+            self.push(ua.ios_channel(CHANNELS[2])),
+            self.push(ua.ios_channel(CHANNELS[0])),
+        ]
+        coalesced = ua.coalesce_pushes(pushes)
+
+        self.assertEqual(len(coalesced), 2)
+        self.assertEqual(coalesced[0].payload, {
+            'audience': ua.or_(
+                ua.ios_channel(CHANNELS[0]),
+                ua.named_user('user1'),
+                ua.ios_channel(CHANNELS[2]),
+            ),
+            'notification': {'alert': 'Hello'},
+            'device_types': 'all',
+        })
+        # A push that matches no other is returned as-is.
+        self.assertIs(coalesced[1], pushes[2])
+        self.assertEqual(pushes[0].audience, ua.ios_channel(CHANNELS[0]))
+
+    def test_other_fields_must_match(self):
+        pushes = [
+            self.push(ua.ios_channel(CHANNELS[0])),
+            self.push(ua.ios_channel(CHANNELS[1]),
+                      options=ua.options(expiry=10)),
+        ]
+        self.assertEqual(ua.coalesce_pushes(pushes), pushes)
+
+    def test_selector_limit(self):
+        pushes = [self.push(ua.ios_channel(c)) for c in CHANNELS[:7]]
+        pushes.append(self.push(ua.or_(
+            ua.ios_channel(CHANNELS[7]), ua.ios_channel(CHANNELS[8])
+        )))
+        coalesced = ua.coalesce_pushes(
+            pushes, max_selectors=3, with_sources=True
+        )
+
+        self.assertEqual(
+            [len(sources) for _, sources in coalesced], [3, 3, 2]
+        )
+        self.assertEqual(
+            [len(push.audience['or']) for push, _ in coalesced], [3, 3, 3]
+        )
+        self.assertEqual(coalesced[2][1], pushes[6:])
+
+    def test_selector_limit_counts_list_values(self):
+        pushes = [
+            self.push({'named_user': ['user-%d-%d' % (i, j)
+                                      for j in range(600)]})
+            for i in range(10)
+        ]
+        coalesced = ua.coalesce_pushes(pushes, max_selectors=1000)
+        self.assertEqual(coalesced, pushes)
+
+        pushes = [
+            self.push({'named_user': ['user-%d-%d' % (i, j)
+                                      for j in range(400)]})
+            for i in range(5)
+        ]
+        coalesced = ua.coalesce_pushes(pushes, max_selectors=1000)
+        self.assertEqual(len(coalesced), 3)
+        for push in coalesced:
+            self.assertLessEqual(
+                ua.push.fanout._selector_count(push.audience), 1000
+            )
+
+    def test_unmergeable_pushes(self):
+        broadcast = self.push(ua.all_)
+        template_push = self.airship.create_template_push()
+        pushes = [broadcast, template_push, self.push(ua.tag('a'))]
+        self.assertEqual(ua.coalesce_pushes(pushes), pushes)
+        self.assertRaises(ValueError, ua.coalesce_pushes, [], 0)
+
+
+class TestChunkPush(unittest.TestCase):
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+        self.push = self.airship.create_push()
+        self.push.notification = ua.notification(alert='Hello')
+        self.push.device_types = ua.all_
+        self.push.options = ua.options(expiry=60)
+
+    def channel_ids(self, count):
+        return [
+            '0492662a-1b52-4343-a1f9-%012d' % i for i in range(count)
+        ]
+
+    def test_or_audience(self):
+        channel_ids = self.channel_ids(25)
+        self.push.audience = ua.or_(
+            *[ua.ios_channel(c) for c in channel_ids]
+        )
+        chunks = ua.chunk_push(self.push, max_selectors=10)
+
+        self.assertEqual(
+            [chunk.audience for chunk in chunks],
+            [{'ios_channel': channel_ids[:10]},
+             {'ios_channel': channel_ids[10:20]},
+             {'ios_channel': channel_ids[20:]}],
+        )
+        for chunk in chunks:
+            payload = chunk.payload
+            del payload['audience']
+            self.assertEqual(payload, {
+                'notification': {'alert': 'Hello'},
+                'device_types': 'all',
+                'options': {'expiry': 60},
+            })
+        self.assertEqual(len(self.push.audience['or']), 25)
+
+    def test_list_selector_and_bytes(self):
+        channel_ids = self.channel_ids(30)
+        self.push.audience = ua.or_(
+            {'android_channel': channel_ids}, ua.tag('vip')
+        )
+        chunks = ua.chunk_push(self.push, max_selectors=12)
+        self.assertEqual(
+            [chunk.audience for chunk in chunks],
+            [{'android_channel': channel_ids[:12]},
+             {'android_channel': channel_ids[12:24]},
+             ua.or_({'android_channel': channel_ids[24:]}, ua.tag('vip'))],
+        )
+
+        self.push.audience = ua.or_(
+            *[ua.ios_channel(c) for c in channel_ids]
+        )
+        chunks = ua.chunk_push(self.push, max_bytes=1000)
+        self.assertEqual(
+            sum(len(chunk.audience['ios_channel']) for chunk in chunks), 30
+        )
+        for chunk in chunks:
+            self.assertTrue(len(json.dumps(chunk.payload)) <= 1000)
+        self.assertEqual(len(chunks), 2)
+
+        self.assertRaises(
+            ValueError, ua.chunk_push, self.push, max_bytes=150
+        )
+
+    def test_merges_selectors_of_one_key(self):
+        channel_ids = self.channel_ids(1800)
+        self.push.audience = ua.or_(
+            {'ios_channel': channel_ids[:600]},
+            ua.tag('vip'),
+            {'ios_channel': channel_ids[600:1200]},
+            ua.and_(ua.tag('a'), ua.tag('b')),
+            {'ios_channel': channel_ids[1200:]},
+        )
+        chunks = ua.chunk_push(self.push, max_selectors=1000)
+        self.assertEqual(
+            [chunk.audience for chunk in chunks],
+            [{'ios_channel': channel_ids[:1000]},
+             ua.or_({'ios_channel': channel_ids[1000:]}, ua.tag('vip'),
+                    ua.and_(ua.tag('a'), ua.tag('b')))],
+        )
+
+    def test_unsplittable_audience(self):
+        channel_ids = self.channel_ids(20)
+        for audience in (
+                ua.and_(ua.tag('a'), {'ios_channel': channel_ids}),
+                ua.not_({'ios_channel': channel_ids}),
+                ua.or_(ua.tag('b'),
+                       ua.and_(ua.tag('a'), {'ios_channel': channel_ids}))):
+            self.push.audience = audience
+            self.assertRaises(
+                ValueError, ua.chunk_push, self.push, max_selectors=10
+            )
+
+    def test_within_limits(self):
+        for audience in (ua.all_, ua.tag('a'), ua.or_(ua.tag('a')),
+                         ua.and_(ua.tag('a'), ua.tag('b'))):
+            self.push.audience = audience
+            self.assertEqual(ua.chunk_push(self.push), [self.push])
@@ -0,0 +1,54 @@
+import unittest
+
+import urbanairship as ua
+
+a, b, c, d = ua.tag('a'), ua.tag('b'), ua.named_user('c'), ua.alias('d')
+
+
+class TestOptimizeAudience(unittest.TestCase):
+    def test_flatten_dedupe_and_sort(self):
+        selector = ua.or_(ua.or_(b, a, ua.or_(b)), c, a)
+        self.assertEqual(ua.optimize_audience(selector), ua.or_(c, a, b))
+        self.assertEqual(selector, ua.or_(ua.or_(b, a, ua.or_(b)), c, a))
+
+    def test_canonical(self):
+        self.assertEqual(
+            ua.optimize_audience(ua.and_(a, ua.or_(b, c), d)),
+            ua.optimize_audience(ua.and_(ua.and_(d, ua.or_(c, b)), a)),
+        )
+        self.assertEqual(ua.optimize_audience(ua.or_(a, a)), a)
+
+    def test_not(self):
+        self.assertEqual(ua.optimize_audience(ua.not_(ua.not_(a))), a)
+        self.assertEqual(
+            ua.optimize_audience(ua.not_(ua.not_(ua.not_(ua.or_(a, a))))),
+            ua.not_(a),
+        )
+
+    def test_factoring(self):
+        self.assertEqual(
+            ua.optimize_audience(
+                ua.or_(ua.and_(a, b, c), ua.and_(d, b, a))
+            ),
+            ua.and_(ua.or_(d, c), a, b),
+        )
+        self.assertEqual(
+            ua.optimize_audience(ua.and_(ua.or_(a, b), ua.or_(a, c))),
+            ua.or_(ua.and_(c, b), a),
+        )
+        # Absorption.
+        self.assertEqual(
+            ua.optimize_audience(ua.or_(a, ua.and_(a, b))), a
+        )
+        self.assertEqual(
+            ua.optimize_audience(ua.and_(ua.or_(a, b), ua.or_(b, a, c))),
+            ua.or_(a, b),
+        )
+
+    def test_untouched(self):
+        self.assertEqual(ua.optimize_audience('all'), 'all')
+        self.assertEqual(ua.optimize_audience(a), a)
+        location = ua.location(
+            id='4oFkxX7RcUdirjtaenEQIV', date=ua.recent_date(days=4)
+        )
+        self.assertEqual(ua.optimize_audience(location), location)
@@ -0,0 +1,210 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+from urbanairship.push import outbox
+
+
+def response(status, data):
+    response = requests.Response()
+    response._content = json.dumps(data).encode('utf-8')
+    response.status_code = status
+    return response
+
+
+class TestPushOutbox(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'outbox.db')
+        self.airship = ua.Airship('key', 'secret')
+        self.outbox = ua.PushOutbox(self.path)
+        self.now = 1000.0
+        self.outbox.clock = lambda: self.now
+        self.sent = []
+
+    def tearDown(self):
+        self.outbox.close()
+        shutil.rmtree(self.directory)
+
+    def push(self, alert):
+        push = self.airship.create_push()
+        push.audience = ua.all_
+        push.notification = ua.notification(alert=alert)
+        push.device_types = ua.all_
+        return push
+
+    def fake_request(self, bad=(), status=None):
+        # Accept batches, assigning push IDs from the alerts, except those
+        # containing an alert in ``bad`` or when ``status`` is given.
+        def request(method, body, url, content_type, version, params=None):
+            pushes = json.loads(body.decode('utf-8'))
+            alerts = [push['notification']['alert'] for push in pushes]
+            if status == 401:
+                raise ua.Unauthorized
+            if status is not None or set(alerts) & set(bad):
+                raise ua.AirshipFailure.from_response(
+                    response(status or 400, {'ok': False})
+                )
+            self.sent.append(alerts)
+            return response(202, {
+                'ok': True, 'push_ids': ['id-' + a for a in alerts]
+            })
+        return request
+
+    def dispatcher(self, **kwargs):
+        dispatcher = ua.OutboxDispatcher(
+            self.outbox, self.airship, **kwargs
+        )
+        return dispatcher
+
+    def test_enqueue(self):
+        first = self.outbox.enqueue(self.push('a'), key='order-1')
+        self.assertEqual(self.outbox.enqueue(self.push('b'), key='order-1'),
+                         first)
+        second = self.outbox.enqueue({'audience': 'all'})
+        self.assertTrue(second > first)
+        self.assertRaises(TypeError, self.outbox.enqueue, 'push')
+
+        entry = self.outbox.get_by_key('order-1')
+        self.assertEqual(entry.id, first)
+        self.assertEqual(entry.status, 'pending')
+        self.assertEqual(json.loads(entry.payload.decode('utf-8')),
+                         self.push('a').payload)
+        self.assertEqual(self.outbox.counts(), {'pending': 2})
+
+        # Entries survive reopening the database.
+        self.outbox.close()
+        self.outbox = ua.PushOutbox(self.path)
+        self.assertEqual(self.outbox.get(second).payload, b'{"audience": '
+                                                          b'"all"}')
+
+    def test_dispatch(self):
+        ids = [self.outbox.enqueue(self.push(a)) for a in 'abcde']
+        dispatcher = self.dispatcher(batch_size=2, max_in_flight=2)
+        with mock.patch.object(ua.Airship, '_request',
+                               side_effect=self.fake_request()):
+            self.assertEqual(dispatcher.run(until_empty=True), 5)
+
+        self.assertEqual(sorted(len(alerts) for alerts in self.sent),
+                         [1, 2, 2])
+        for entry_id, alert in zip(ids, 'abcde'):
+            entry = self.outbox.get(entry_id)
+            self.assertEqual(entry.status, 'sent')
+            self.assertEqual(entry.push_ids, ['id-' + alert])
+            self.assertEqual(entry.attempts, 1)
+        self.assertEqual(self.outbox.counts(), {'sent': 5})
+
+        self.now += 10
+        self.assertEqual(self.outbox.purge(self.now), 5)
+        self.assertEqual(self.outbox.counts(), {})
+
+    def test_invalid_push_isolated(self):
+        good = self.outbox.enqueue(self.push('good'))
+        bad = self.outbox.enqueue(self.push('bad'))
+        dispatcher = self.dispatcher()
+        with mock.patch.object(ua.Airship, '_request',
+                               side_effect=self.fake_request(bad=['bad'])):
+            self.assertEqual(dispatcher.run_once(), 0)
+            self.assertTrue(self.outbox.get(good).solo)
+            self.assertEqual(dispatcher.run(until_empty=True), 1)
+
+        self.assertEqual(self.sent, [['good']])
+        self.assertEqual(self.outbox.get(good).attempts, 1)
+        self.assertEqual(self.outbox.get(bad).status, 'failed')
+        self.assertTrue(self.outbox.get(bad).last_error)
+
+    def test_retries(self):
+        entry_id = self.outbox.enqueue(self.push('a'))
+        dispatcher = self.dispatcher(max_attempts=3, retry_delay=10)
+        dispatcher.sender.sleep = lambda seconds: None
+        with mock.patch.object(ua.Airship, '_request',
+                               side_effect=self.fake_request(status=503)):
+            self.assertEqual(dispatcher.run_once(), 0)
+            self.assertEqual(self.outbox.claim(10), [])
+            self.now += 10
+            self.assertEqual(dispatcher.run_once(), 0)
+            self.now += 19
+            self.assertEqual(dispatcher.run_once(), 0)
+            self.now += 1
+            self.assertEqual(dispatcher.run_once(), 0)
+
+        entry = self.outbox.get(entry_id)
+        self.assertEqual(entry.status, 'failed')
+        self.assertEqual(entry.attempts, 3)
+
+    def test_rate_limited_request_in_batch(self):
+        ids = [self.outbox.enqueue(self.push(a)) for a in 'abcd']
+        dispatcher = self.dispatcher()
+        dispatcher.sender.sleep = lambda seconds: None
+        accept = self.fake_request()
+        calls = []
+
+        def request(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise ua.AirshipFailure.from_response(
+                    response(429, {'ok': False})
+                )
+            return accept(*args, **kwargs)
+
+        size = len(self.outbox.get(ids[0]).payload)
+        with mock.patch.object(ua.PushBatch, 'max_bytes', 2 * size + 3):
+            with mock.patch.object(ua.Airship, '_request',
+                                   side_effect=request):
+                self.assertEqual(dispatcher.run_once(), 4)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.sent, [['a', 'b'], ['c', 'd']])
+        for entry_id, alert in zip(ids, 'abcd'):
+            entry = self.outbox.get(entry_id)
+            self.assertEqual(entry.status, 'sent')
+            self.assertEqual(entry.push_ids, ['id-' + alert])
+
+    def test_oversized_push_fails(self):
+        big = self.outbox.enqueue(self.push('x' * 2000))
+        small = self.outbox.enqueue(self.push('a'))
+        dispatcher = self.dispatcher()
+        with mock.patch.object(ua.PushBatch, 'max_bytes', 1000):
+            with mock.patch.object(ua.Airship, '_request',
+                                   side_effect=self.fake_request()):
+                self.assertEqual(dispatcher.run_once(), 1)
+
+        entry = self.outbox.get(big)
+        self.assertEqual((entry.status, entry.attempts), ('failed', 1))
+        self.assertIn('limit', entry.last_error)
+        self.assertEqual(self.outbox.get(small).status, 'sent')
+        self.assertEqual(self.sent, [['a']])
+
+    def test_expired_lease_is_reclaimed(self):
+        entry_id = self.outbox.enqueue(self.push('a'))
+        self.assertEqual(
+            [e.id for e in self.outbox.claim(10, lease=60)], [entry_id]
+        )
+        self.assertEqual(self.outbox.claim(10), [])
+        # The dispatcher holding the lease crashed; another takes over.
+        self.now += 60
+        entries = self.outbox.claim(10)
+        self.assertEqual([e.attempts for e in entries], [2])
+
+    def test_unauthorized(self):
+        entry_id = self.outbox.enqueue(self.push('a'))
+        with mock.patch.object(ua.Airship, '_request',
+                               side_effect=self.fake_request(status=401)):
+            self.assertRaises(ua.Unauthorized, self.dispatcher().run_once)
+        entry = self.outbox.get(entry_id)
+        self.assertEqual((entry.status, entry.attempts), ('pending', 0))
+        self.assertEqual(
+            [e.id for e in self.outbox.claim(10)], [entry_id]
+        )
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, ua.PushOutbox, self.path,
+                          synchronous='SOMETIMES')
+        self.assertRaises(ValueError, self.dispatcher, batch_size=101)
+        self.assertEqual(outbox.PENDING, 'pending')
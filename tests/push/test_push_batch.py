@@ -0,0 +1,128 @@
+import json
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+
+
+def push_response(count, offset=0):
+    response = requests.Response()
+    response._content = json.dumps({
+        'ok': True,
+        'operation_id': 'op-%d' % offset,
+        'push_ids': ['push-%d' % (offset + i) for i in range(count)],
+    }).encode('utf-8')
+    response.status_code = 202
+    return response
+
+
+class TestPushBatch(unittest.TestCase):
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+
+    def push(self, alert):
+        push = self.airship.create_push()
+        push.audience = ua.named_user('user-%s' % alert)
+        push.notification = ua.notification(alert=alert)
+        push.device_types = ua.all_
+        return push
+
+    def test_splits_by_count(self):
+        batch = self.airship.create_push_batch(
+            [self.push(str(i)) for i in range(5)]
+        )
+        batch.max_pushes = 2
+        chunks = batch.chunks()
+        self.assertEqual(
+            [indexes for indexes, _ in chunks], [[0, 1], [2, 3], [4]]
+        )
+        payloads = json.loads(chunks[1][1].decode('utf-8'))
+        self.assertEqual(payloads, [batch.pushes[2].payload,
+                                    batch.pushes[3].payload])
+
+    def test_splits_by_bytes(self):
+        batch = ua.PushBatch(self.airship)
+        for i in range(4):
+            batch.add(self.push(str(i)))
+        size = len(json.dumps(batch.pushes[0].payload))
+        batch.max_bytes = 2 * size + 3
+        chunks = batch.chunks()
+        self.assertEqual([indexes for indexes, _ in chunks], [[0, 1], [2, 3]])
+        for _, body in chunks:
+            self.assertLessEqual(len(body), batch.max_bytes)
+
+        batch.max_bytes = size
+        self.assertRaises(ValueError, batch.chunks)
+
+    def test_add_rejects_other_objects(self):
+        batch = ua.PushBatch(self.airship)
+        batch.add({'audience': 'all'})
+        self.assertRaises(TypeError, batch.add, 'push')
+        self.assertEqual(len(batch), 1)
+
+    def test_send_maps_push_ids(self):
+        batch = ua.PushBatch(
+            self.airship, [self.push(str(i)) for i in range(3)]
+        )
+        batch.max_pushes = 2
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = [push_response(2), push_response(1, 2)]
+            responses = batch.send()
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(
+            [r.push_ids for r in responses],
+            [['push-0'], ['push-1'], ['push-2']]
+        )
+        self.assertEqual(responses[2].operation_id, 'op-2')
+        self.assertTrue(responses[0].ok)
+        self.assertEqual(
+            mock_request.call_args[1]['url'], ua.common.PUSH_URL
+        )
+
+    def test_send_failure_keeps_sent_responses(self):
+        batch = ua.PushBatch(
+            self.airship, [self.push(str(i)) for i in range(3)]
+        )
+        batch.max_pushes = 2
+        failure = ua.AirshipFailure('error', 400, None, None)
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = [push_response(2), failure]
+            self.assertRaises(ua.AirshipFailure, batch.send)
+
+        self.assertEqual(batch.responses[1].push_ids, ['push-1'])
+        self.assertIsNone(batch.responses[2])
+
+    def test_resume_sends_failed_requests_only(self):
+        batch = ua.PushBatch(
+            self.airship, [self.push(str(i)) for i in range(5)]
+        )
+        batch.max_pushes = 2
+        failure = ua.AirshipFailure('error', 500, None, None)
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = [push_response(2), failure]
+            self.assertRaises(ua.AirshipFailure, batch.send)
+            self.assertEqual(
+                [r is not None for r in batch.responses],
+                [True, True, False, False, False]
+            )
+
+            mock_request.reset_mock()
+            mock_request.side_effect = [
+                push_response(2, 2), push_response(1, 4)
+            ]
+            responses = batch.resume()
+
+        self.assertEqual(
+            [call[1]['body'] for call in mock_request.call_args_list],
+            [body for _, body in batch.chunks()[1:]]
+        )
+        self.assertEqual(
+            [r.push_ids for r in responses],
+            [['push-%d' % i] for i in range(5)]
+        )
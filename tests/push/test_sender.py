@@ -0,0 +1,208 @@
+import json
+import threading
+import unittest
+
+import mock
+import requests
+import six
+
+import urbanairship as ua
+from urbanairship.push.core import PushResponse
+
+
+class FakePush(object):
+    def __init__(self, name, errors=()):
+        self.name = name
+        self.errors = list(errors)
+        self.calls = 0
+
+    def send(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return PushResponse.from_payload({'push_ids': [self.name]})
+
+
+def failure(status_code, retry_after=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return ua.AirshipFailure('error', status_code, None, response)
+
+
+class TestPushSender(unittest.TestCase):
+    def test_sends_all_pushes(self):
+        pushes = [FakePush(str(i)) for i in range(20)]
+        sender = ua.PushSender(max_in_flight=4)
+        results = list(sender.send(iter(pushes)))
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(
+            sorted(r.response.push_ids[0] for r in results),
+            sorted(p.name for p in pushes)
+        )
+        for result in results:
+            self.assertEqual(result.response.push_ids, [result.push.name])
+
+    def test_bounds_requests_in_flight(self):
+        lock = threading.Lock()
+        state = {'current': 0, 'peak': 0}
+        release = threading.Event()
+
+        class SlowPush(FakePush):
+            def send(self):
+                with lock:
+                    state['current'] += 1
+                    state['peak'] = max(state['peak'], state['current'])
+                release.wait(0.05)
+                with lock:
+                    state['current'] -= 1
+                return super(SlowPush, self).send()
+
+        sender = ua.PushSender(max_in_flight=3)
+        results = list(sender.send(SlowPush(str(i)) for i in range(12)))
+        self.assertEqual(len(results), 12)
+        self.assertLessEqual(state['peak'], 3)
+
+    def test_failures_are_returned(self):
+        error = failure(400)
+        push = FakePush('bad', errors=[error])
+        results = list(ua.PushSender(max_in_flight=2).send([push]))
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0].ok)
+        self.assertIs(results[0].error, error)
+        self.assertIsNone(results[0].response)
+
+    def test_retries_rate_limited_pushes(self):
+        sender = ua.PushSender(max_in_flight=1, max_retries=2)
+        sender.sleep = mock.Mock()
+
+        push = FakePush('a', errors=[failure(429, '3'), failure(429)])
+        result = sender.send_one(push)
+        self.assertTrue(result.ok)
+        self.assertEqual(push.calls, 3)
+        self.assertEqual(
+            sender.sleep.call_args_list, [mock.call(3.0), mock.call(2.0)]
+        )
+
+        push = FakePush('b', errors=[failure(429)] * 3)
+        result = sender.send_one(push)
+        self.assertEqual(result.error.error_code, 429)
+
+    def test_retries_batches_from_failed_request(self):
+        airship = ua.Airship('key', 'secret')
+        batch = ua.PushBatch(airship, [
+            {'audience': {'named_user': str(i)}} for i in range(4)
+        ])
+        batch.max_pushes = 2
+        sender = ua.PushSender(max_in_flight=1)
+        sender.sleep = mock.Mock()
+
+        def response(names):
+            response = requests.Response()
+            response._content = json.dumps(
+                {'ok': True, 'push_ids': names}).encode('utf-8')
+            response.status_code = 202
+            return response
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = [
+                response(['0', '1']), failure(429), response(['2', '3'])
+            ]
+            result = sender.send_one(batch)
+
+        self.assertTrue(result.ok)
+        posted = [
+            push['audience']['named_user']
+            for call in mock_request.call_args_list
+            for push in json.loads(call[1]['body'].decode('utf-8'))
+        ]
+        # The rate limited request is retried; the accepted one is not.
+        self.assertEqual(posted, ['0', '1', '2', '3', '2', '3'])
+        self.assertEqual(
+            [r.push_ids for r in result.response],
+            [['0'], ['1'], ['2'], ['3']]
+        )
+
+    def test_rate_limit(self):
+        sender = ua.PushSender(max_in_flight=2, rate=100)
+        sender.limiter = mock.Mock()
+        list(sender.send([FakePush('a'), FakePush('b')]))
+        self.assertEqual(sender.limiter.wait.call_count, 2)
+
+    def test_input_errors_are_raised(self):
+        def pushes():
+            yield FakePush('a')
+            raise RuntimeError('bad input')
+
+        sender = ua.PushSender(max_in_flight=2)
+        self.assertRaises(RuntimeError, list, sender.send(pushes()))
+
+    def test_input_errors_after_sent_pushes(self):
+        sent = [FakePush(str(i)) for i in range(5)]
+
+        def pushes():
+            for push in sent:
+                yield push
+            raise RuntimeError('bad input')
+
+        sender = ua.PushSender(max_in_flight=2)
+        results = []
+        with self.assertRaises(RuntimeError):
+            for result in sender.send(pushes()):
+                results.append(result)
+        self.assertEqual(
+            sorted(r.push.name for r in results if r.ok),
+            ['0', '1', '2', '3', '4']
+        )
+        self.assertEqual([push.calls for push in sent], [1] * 5)
+
+    @unittest.skipIf(six.PY2, 'asyncio support requires Python 3')
+    def test_send_async_input_errors(self):
+        import asyncio
+
+        def pushes():
+            for i in range(3):
+                yield FakePush(str(i))
+            raise RuntimeError('bad input')
+
+        sender = ua.PushSender(max_in_flight=2)
+        results = sender.send_async(pushes())
+        loop = asyncio.new_event_loop()
+        collected = []
+        try:
+            with self.assertRaises(RuntimeError):
+                while True:
+                    collected.append(
+                        loop.run_until_complete(results.__anext__())
+                    )
+        finally:
+            loop.close()
+        self.assertEqual(
+            sorted(r.push.name for r in collected if r.ok), ['0', '1', '2']
+        )
+
+    @unittest.skipIf(six.PY2, 'asyncio support requires Python 3')
+    def test_send_async(self):
+        import asyncio
+
+        sender = ua.PushSender(max_in_flight=2)
+        results = sender.send_async([FakePush(str(i)) for i in range(5)])
+        loop = asyncio.new_event_loop()
+        collected = []
+        try:
+            while True:
+                try:
+                    collected.append(
+                        loop.run_until_complete(results.__anext__())
+                    )
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.close()
+        self.assertEqual(
+            sorted(r.push.name for r in collected if r.ok),
+            ['0', '1', '2', '3', '4']
+        )
@@ -0,0 +1,80 @@
+import json
+import unittest
+
+import urbanairship as ua
+from urbanairship.push import size
+
+
+class TestPayloadSizes(unittest.TestCase):
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+        self.push = self.airship.create_push()
+        self.push.audience = ua.all_
+        self.push.device_types = ua.device_types('ios', 'android')
+        self.push.notification = ua.notification(
+            alert=u'Caf\xe9',
+            ios=ua.ios(badge=1, extra={'id': '1'}, expiry=3600),
+        )
+
+    def test_sizes(self):
+        sizes = ua.payload_sizes(self.push, overhead=0)
+        self.assertEqual([s.platform for s in sizes], ['ios', 'android'])
+        ios_payload = {
+            'aps': {'alert': u'Caf\xe9', 'badge': 1}, 'id': '1'
+        }
+        self.assertEqual(sizes[0], size.PayloadSize(
+            'ios',
+            len(json.dumps(ios_payload, separators=(',', ':'),
+                           ensure_ascii=False).encode('utf-8')),
+            4096,
+        ))
+        self.assertEqual(sizes[0].over, 0)
+        self.assertEqual(
+            sizes[1].size,
+            len('{"com.urbanairship.push.ALERT":"Caf\xe9"}') + 1,
+        )
+        self.assertEqual(
+            [s.platform for s in ua.payload_sizes(self.push.notification)],
+            ['amazon', 'android', 'ios', 'web', 'wns'],
+        )
+
+    def test_ios_flags(self):
+        override = ua.ios(alert='hi', content_available=True,
+                          mutable_content=True, category='c')
+        self.assertEqual(size._ios_payload(None, override), {
+            'aps': {
+                'alert': 'hi',
+                'category': 'c',
+                'content-available': 1,
+                'mutable-content': 1,
+            },
+        })
+
+    def test_oversized(self):
+        self.assertEqual(size.oversized(self.push), [])
+        self.push.notification['ios']['extra']['blob'] = 'x' * 4000
+        over = size.oversized(self.push)
+        self.assertEqual([s.platform for s in over], ['ios'])
+        self.assertTrue(over[0].over > 100)
+
+    def test_truncate_alerts(self):
+        notification = self.push.notification
+        notification['alert'] = u'\xe9' * 3000
+        truncated = ua.truncate_alerts(self.push)
+
+        self.assertEqual(notification['alert'], u'\xe9' * 3000)
+        self.assertNotIn('alert', notification['ios'])
+        for platform in ('ios', 'android'):
+            alert = truncated[platform]['alert']
+            self.assertTrue(alert.endswith(u'\u2026'))
+            self.assertTrue(1500 < len(alert) < 2100)
+        self.assertEqual(truncated['ios']['badge'], 1)
+        self.assertEqual(size.oversized(truncated, ['ios', 'android']), [])
+
+    def test_truncate_nothing_to_cut(self):
+        notification = ua.notification(
+            ios=ua.ios(extra={'blob': 'x' * 5000})
+        )
+        self.assertRaises(ValueError, ua.truncate_alerts, notification)
+        notification['ios']['alert'] = 'Hi'
+        self.assertRaises(ValueError, ua.truncate_alerts, notification)
@@ -0,0 +1,196 @@
+import datetime
+import unittest
+
+import urbanairship as ua
+from urbanairship.push import validate
+
+CHANNEL = '0492662a-1b52-4343-a1f9-c6b0c72931c0'
+
+
+def paths(errors):
+    return sorted(error.path for error in errors)
+
+
+class TestValidatePush(unittest.TestCase):
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+        self.push = self.airship.create_push()
+        self.push.audience = ua.or_(
+            ua.ios_channel(CHANNEL), ua.tag('sports'), ua.named_user('bob')
+        )
+        self.push.notification = ua.notification(
+            alert='Hello', ios=ua.ios(badge='+1')
+        )
+        self.push.device_types = ua.device_types('ios', 'android')
+
+    def test_valid_push(self):
+        self.assertEqual(ua.validate_push(self.push), [])
+        self.push.message = ua.message('Title', 'Body')
+        self.push.in_app = ua.in_app('Alert', 'banner')
+        self.assertEqual(ua.validate_push(self.push.payload), [])
+
+    def test_reports_every_error(self):
+        payload = {
+            'audience': {'or': [
+                {'ios_channel': 'not-a-uuid'},
+                {'tag': 'a', 'group': 'g', 'color': 'red'},
+                {'bogus': 'x'},
+                {'and': []},
+            ]},
+            'notification': {
+                'alert': 'Hi',
+                'web': {},
+                'ios': {'badge': 'lots', 'priority': 7},
+            },
+            'device_types': ['ios', 'ios', 'symbian'],
+            'message': {'body': 'x'},
+            'in_app': {'alert': 'x', 'display_type': 'modal'},
+            'options': {'expiry': -1},
+            'campaigns': {'categories': []},
+            'extra': True,
+        }
+        errors = ua.validate_push(payload)
+        self.assertEqual(paths(errors), [
+            'audience.or[0].ios_channel',
+            'audience.or[1].color',
+            'audience.or[2]',
+            'audience.or[3].and',
+            'campaigns.categories',
+            'device_types[1]',
+            'device_types[2]',
+            'extra',
+            'in_app.display_type',
+            'message.title',
+            'notification.ios.badge',
+            'notification.ios.priority',
+            'notification.web',
+            'options.expiry',
+        ])
+        self.assertIn(
+            'notification.web: override for a device type not in '
+            'device_types',
+            [str(error) for error in errors],
+        )
+
+    def test_platform_overrides(self):
+        self.push.device_types = ua.all_
+        self.push.notification = ua.notification(
+            alert='Hello',
+            ios=ua.ios(alert='Hi', badge=2, sound='cat.caf', expiry=3600,
+                       priority=5, collapse_id='c', title='T',
+                       content_available=True, extra={'k': 'v'}),
+            android=ua.android(alert='Hi', collapse_key='c',
+                               time_to_live=3600, delivery_priority='high',
+                               priority=1, title='T', summary='S',
+                               sound='s', extra={'k': 'v'}),
+            amazon=ua.amazon(alert='Hi', consolidation_key='c',
+                             expires_after=3600, title='T', summary='S',
+                             extra={'k': 'v'}),
+            web=ua.web(alert='Hi', title='T', extra={'k': 'v'}),
+            wns=ua.wns_payload(alert='Hi'),
+            open_platform={
+                'email': ua.open_platform(alert='Hi', title='T',
+                                          summary='S', extra={'k': 'v'}),
+            },
+        )
+        self.assertEqual(ua.validate_push(self.push), [])
+
+        self.push.notification = ua.notification(android={
+            'alert': 'Hi', 'priority': 'high', 'delivery_priority': 1,
+        })
+        self.assertEqual(paths(ua.validate_push(self.push)), [
+            'notification.android.delivery_priority',
+            'notification.android.priority',
+        ])
+
+    def test_required_fields(self):
+        self.assertEqual(
+            paths(ua.validate_push({})), ['audience', 'device_types', 'push']
+        )
+
+    def test_audience_limit(self):
+        self.push.audience = ua.or_(
+            *[ua.tag(str(i)) for i in range(ua.push.fanout.MAX_OR_SELECTORS)]
+        )
+        self.assertEqual(ua.validate_push(self.push), [])
+        self.push.audience['or'].append(ua.tag('one more'))
+        self.assertEqual(paths(ua.validate_push(self.push)), ['audience'])
+        self.push.audience = 'everyone'
+        self.assertEqual(paths(ua.validate_push(self.push)), ['audience'])
+
+
+class TestValidateScheduledPush(unittest.TestCase):
+    def setUp(self):
+        airship = ua.Airship('key', 'secret')
+        push = airship.create_push()
+        push.audience = ua.all_
+        push.notification = ua.notification(alert='Hello')
+        push.device_types = ua.all_
+        self.scheduled = airship.create_scheduled_push()
+        self.scheduled.push = push
+        self.scheduled.schedule = ua.scheduled_time(
+            datetime.datetime(2026, 1, 1, 12)
+        )
+
+    def test_valid(self):
+        self.assertEqual(ua.validate_scheduled_push(self.scheduled), [])
+        self.assertEqual(validate(self.scheduled.payload), [])
+
+    def test_errors(self):
+        self.scheduled.schedule = {'scheduled_time': 'tomorrow'}
+        self.scheduled.push.device_types = None
+        self.scheduled.name = 7
+        self.assertEqual(
+            paths(validate(self.scheduled)),
+            ['name', 'push.device_types', 'schedule.scheduled_time'],
+        )
+        self.scheduled.schedule = None
+        self.assertIn(
+            'schedule', paths(ua.validate_scheduled_push(self.scheduled))
+        )
+
+
+class TestValidatePipeline(unittest.TestCase):
+    def outcome(self):
+        return {
+            'audience': 'triggered',
+            'notification': {'alert': 'Welcome'},
+            'device_types': 'all',
+        }
+
+    def test_valid(self):
+        pipeline = ua.automation.Pipeline(
+            enabled=True,
+            outcome=self.outcome(),
+            immediate_trigger={'tag_added': 'new'},
+            timing={'delay': 60},
+        )
+        self.assertEqual(ua.validate_pipeline(pipeline), [])
+        self.assertEqual(validate(pipeline.payload), [])
+
+    def test_errors(self):
+        payload = {
+            'enabled': 'yes',
+            'outcome': [{'push': self.outcome()}, {'push': {}}, 'x'],
+            'historical_trigger': {'event': 'close', 'equals': 0,
+                                   'days': 120},
+            'condition': [{'xor': []}],
+            'timing': {'delay': 0, 'schedule': {'type': 'moon'}},
+        }
+        self.assertEqual(paths(ua.validate_pipeline(payload)), [
+            'condition[0].xor',
+            'enabled',
+            'historical_trigger.days',
+            'historical_trigger.event',
+            'outcome[1].push',
+            'outcome[1].push.audience',
+            'outcome[1].push.device_types',
+            'outcome[2]',
+            'timing.delay',
+            'timing.schedule.dayparts',
+            'timing.schedule.type',
+        ])
+        self.assertEqual(
+            paths(ua.validate_pipeline({'enabled': True})),
+            ['outcome', 'pipeline'],
+        )
@@ -117,6 +117,41 @@ class TestResponseList(unittest.TestCase):
         self.assertEqual(push_responses[2].push_type, 'UNICAST_PUSH')
         self.assertEqual(push_responses[2].direct_responses, 7)
 
+    def test_response_list_fields(self):
+        mock_response = requests.Response()
+        mock_response._content = json.dumps(
+            {
+                'pushes': [
+                    {
+                        'push_uuid': self.uuid1,
+                        'sends': 0,
+                        'push_time': '2015-06-13 23:27:46',
+                        'push_type': 'UNICAST_PUSH',
+                        'direct_responses': 10,
+                        'group_id': self.uuid2
+                    }
+                ]
+            }
+        ).encode('utf-8')
+
+        ua.Airship._request = Mock()
+        ua.Airship._request.side_effect = [mock_response]
+
+        airship = ua.Airship('key', 'secret')
+        return_list = ua.reports.ResponseList(
+            airship,
+            datetime(2015, 6, 29),
+            datetime(2015, 6, 30),
+            fields=['push_uuid', 'direct_responses']
+        )
+
+        push_responses = list(return_list)
+
+        self.assertEqual(push_responses[0].push_uuid, self.uuid1)
+        self.assertEqual(push_responses[0].direct_responses, 10)
+        self.assertFalse(hasattr(push_responses[0], 'push_time'))
+        self.assertFalse(hasattr(push_responses[0], 'group_id'))
+
     def test_next_page(self):
         mock_response = requests.Response()
         mock_response._content = json.dumps(
@@ -0,0 +1,299 @@
+# coding=utf-8
+import json
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+from urbanairship import common
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def streamed_response(payload):
+    response = requests.Response()
+    response._content = json.dumps(payload).encode('utf-8')
+    response._content_consumed = True
+    response.status_code = 200
+    return response
+
+
+class TestJSONStreamDecoder(unittest.TestCase):
+    def test_items_across_chunk_boundaries(self):
+        payload = {
+            'next_page': 'https://example.com/next',
+            'items': [
+                {'id': 1, 'name': u'café ☃'},
+                12345678,
+                [1.5, None, True],
+                u'ünicode',
+            ],
+            'count': 4,
+        }
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        for size in (1, 2, 3, 7, 64, len(data)):
+            page = {}
+            decoder = common.JSONStreamDecoder(chunked(data, size))
+            items = list(decoder.items('items', page))
+            self.assertEqual(items, payload['items'])
+            self.assertEqual(page, {
+                'next_page': 'https://example.com/next',
+                'count': 4,
+            })
+
+    def test_empty_list_and_object(self):
+        page = {}
+        decoder = common.JSONStreamDecoder([b'{"items": [], "ok": true}'])
+        self.assertEqual(list(decoder.items('items', page)), [])
+        self.assertEqual(page, {'ok': True})
+
+        decoder = common.JSONStreamDecoder([b' { } '])
+        self.assertEqual(list(decoder.items('items', {})), [])
+
+    def test_truncated_input(self):
+        decoder = common.JSONStreamDecoder([b'{"items": [{"id": 1}, {"id"'])
+        items = decoder.items('items', {})
+        self.assertEqual(next(items), {'id': 1})
+        self.assertRaises(ValueError, next, items)
+
+
+class TestStreamingIterator(unittest.TestCase):
+    def test_stream_pages(self):
+        first = streamed_response({
+            'channels': [
+                {'channel_id': '0492662a-1b52-4343-a1f9-c6b0c72931c0',
+                 'opt_in': True},
+                {'channel_id': 'd95ceae2-85cb-41b7-a87d-09c9b3ce4051',
+                 'opt_in': False},
+            ],
+            'next_page': 'https://go.urbanairship.com/api/channels/?start=2',
+        })
+        second = streamed_response({
+            'next_page': None,
+            'channels': [
+                {'channel_id': 'f10cf38c-3fbd-47e8-a4aa-43cf91d80ba1',
+                 'opt_in': True},
+            ],
+        })
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = [first, second]
+            airship = ua.Airship('key', 'secret')
+            channel_list = ua.ChannelList(airship, stream=True)
+            channel_list.stream_chunk_size = 16
+
+            channels = [(c.channel_id, c.opt_in) for c in channel_list]
+
+            self.assertEqual(channels, [
+                ('0492662a-1b52-4343-a1f9-c6b0c72931c0', True),
+                ('d95ceae2-85cb-41b7-a87d-09c9b3ce4051', False),
+                ('f10cf38c-3fbd-47e8-a4aa-43cf91d80ba1', True),
+            ])
+            self.assertEqual(mock_request.call_count, 2)
+            self.assertTrue(mock_request.call_args[1]['stream'])
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_paces_to_rate(self):
+        clock = mock.Mock(return_value=10.0)
+        sleep = mock.Mock()
+        limiter = common.RateLimiter(100, clock=clock, sleep=sleep)
+
+        self.assertEqual(limiter.wait(50), 0)
+        self.assertAlmostEqual(limiter.wait(200), 0.5)
+        clock.return_value = 10.6
+        self.assertAlmostEqual(limiter.wait(), 1.9)
+        self.assertEqual(
+            [round(c[0][0], 6) for c in sleep.call_args_list], [0.5, 1.9]
+        )
+
+        # After an idle period, no sleep is needed.
+        clock.return_value = 20.0
+        self.assertEqual(limiter.wait(), 0)
+
+    def test_invalid_rate(self):
+        self.assertRaises(ValueError, common.RateLimiter, 0)
+
+
+class TestPageSizeTuner(unittest.TestCase):
+    def test_grows_while_throughput_improves(self):
+        tuner = common.PageSizeTuner(initial=100, max_limit=1000)
+        self.assertEqual(tuner.limit, 100)
+        self.assertEqual(tuner.record(100, 1.0, 5000), 200)
+        self.assertEqual(tuner.record(200, 1.0, 10000), 400)
+        # Slower per item at 400; settle on 200.
+        self.assertEqual(tuner.record(400, 4.0, 20000), 200)
+        self.assertTrue(tuner.converged)
+        self.assertEqual(tuner.record(200, 1.0, 10000), 200)
+
+        report = tuner.report()
+        self.assertEqual(report['limit'], 200)
+        self.assertEqual(report['pages'], 4)
+        self.assertEqual(report['items'], 900)
+        self.assertEqual(report['items_per_second'], 900 / 7.0)
+
+    def test_limits(self):
+        tuner = common.PageSizeTuner(initial=500, max_limit=1000)
+        # The server returned fewer items than requested.
+        self.assertEqual(tuner.record(300, 1.0, 1000), 300)
+        self.assertEqual(tuner.max_limit, 300)
+
+        tuner = common.PageSizeTuner(initial=100, max_page_bytes=20000)
+        self.assertEqual(tuner.record(100, 1.0, 10000), 200)
+        self.assertEqual(tuner.record(200, 0.5, 20000), 200)
+        self.assertTrue(tuner.converged)
+
+        self.assertRaises(ValueError, common.PageSizeTuner, min_limit=0)
+        self.assertRaises(ValueError, common.PageSizeTuner, factor=1)
+
+    def test_set_query_param(self):
+        self.assertEqual(
+            common.set_query_param('https://example.com/a', 'limit', 5),
+            'https://example.com/a?limit=5'
+        )
+
+
+class TestAdaptiveIterator(unittest.TestCase):
+    def test_rewrites_page_limit(self):
+        airship = ua.Airship('key', 'secret')
+        url = 'https://go.urbanairship.com/api/channels/'
+        pages = []
+        for i in range(3):
+            response = requests.Response()
+            payload = {'channels': [{'channel_id': str(i)}]}
+            if i < 2:
+                payload['next_page'] = url + '?limit=100&start=%d' % (i + 1)
+            response._content = json.dumps(payload).encode('utf-8')
+            response.status_code = 200
+            pages.append(response)
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = pages
+            channels = ua.ChannelList(airship, limit=100, adaptive=True)
+            self.assertEqual(
+                [c.channel_id for c in channels], ['0', '1', '2']
+            )
+
+        calls = mock_request.call_args_list
+        self.assertEqual(calls[0][0][5], {'limit': 100})
+        # One item per 100 requested looks like a server cap, so the limit
+        # is held at the smallest allowed size.
+        self.assertEqual(calls[1][0][2], url + '?limit=100&start=1')
+        self.assertIsNone(calls[1][0][5])
+        self.assertEqual(channels.page_size_report['pages'], 3)
+        self.assertEqual(channels.page_size_report['items'], 3)
+
+    def test_streamed_pages(self):
+        airship = ua.Airship('key', 'secret')
+        url = 'https://go.urbanairship.com/api/channels/'
+        first = streamed_response({
+            'channels': [{'channel_id': str(i)} for i in range(100)],
+            'next_page': url + '?limit=100&start=100',
+        })
+        last = streamed_response({'channels': [{'channel_id': '100'}]})
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = [first, last]
+            channels = ua.ChannelList(airship, stream=True, adaptive=True)
+            self.assertEqual(len(list(channels.iter_payloads())), 101)
+
+        self.assertEqual(
+            mock_request.call_args_list[1][0][2],
+            url + '?limit=200&start=100'
+        )
+        report = channels.page_size_report
+        self.assertEqual(report['items'], 101)
+        self.assertEqual(
+            report['bytes'], len(first._content) + len(last._content)
+        )
+
+    def test_uses_given_tuner(self):
+        airship = ua.Airship('key', 'secret')
+        tuner = common.PageSizeTuner(initial=250)
+        channels = ua.ChannelList(airship, adaptive=tuner)
+        self.assertIs(channels.tuner, tuner)
+        self.assertEqual(channels.params, {'limit': 250})
+
+
+class TestBudgetedIterator(unittest.TestCase):
+    url = 'https://go.urbanairship.com/api/channels/'
+
+    def setUp(self):
+        self.airship = ua.Airship('key', 'secret')
+
+    def pages(self, count, per_page=2, streamed=False):
+        pages = []
+        for i in range(count):
+            payload = {'channels': [
+                {'channel_id': '%d-%d' % (i, j)} for j in range(per_page)
+            ]}
+            if i < count - 1:
+                payload['next_page'] = (
+                    self.url + '?limit=%d&start=%d' % (per_page, i + 1)
+                )
+            if streamed:
+                pages.append(streamed_response(payload))
+            else:
+                response = requests.Response()
+                response._content = json.dumps(payload).encode('utf-8')
+                response.status_code = 200
+                pages.append(response)
+        return pages
+
+    def test_max_items(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = self.pages(3)
+            channels = ua.ChannelList(self.airship, limit=2, max_items=3)
+            self.assertEqual(
+                [c.channel_id for c in channels], ['0-0', '0-1', '1-0']
+            )
+
+        calls = mock_request.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0][0][5], {'limit': 2})
+        # Only one more item is needed from the second page.
+        self.assertEqual(calls[1][0][2], self.url + '?limit=1&start=1')
+        self.assertEqual(channels.stop_reason, 'max_items')
+
+    def test_max_items_shrinks_first_page(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = self.pages(1, per_page=1)
+            channels = ua.ChannelList(self.airship, limit=100, max_items=1)
+            self.assertEqual(len(list(channels)), 1)
+        self.assertEqual(mock_request.call_args[0][5], {'limit': 1})
+
+    def test_max_pages(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = self.pages(3)
+            channels = ua.ChannelList(self.airship, max_pages=2)
+            self.assertEqual(len(list(channels.iter_payloads())), 4)
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(channels.stop_reason, 'max_pages')
+
+    def test_time_budget(self):
+        with mock.patch.object(ua.Airship, '_request') as mock_request, \
+                mock.patch('urbanairship.common._clock') as clock:
+            mock_request.side_effect = self.pages(3)
+            clock.side_effect = [0.0, 1.0, 1.0, 5.0, 5.0]
+            channels = ua.ChannelList(self.airship, time_budget=5)
+            self.assertEqual(len(list(channels)), 4)
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(channels.stop_reason, 'time_budget')
+
+    def test_cancel(self):
+        pages = self.pages(3, streamed=True)
+        pages[0].close = mock.Mock()
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.side_effect = pages
+            channels = ua.ChannelList(self.airship, stream=True)
+            self.assertEqual(next(channels).channel_id, '0-0')
+            channels.cancel()
+            self.assertRaises(StopIteration, next, channels)
+
+        self.assertTrue(channels.cancelled)
+        self.assertEqual(channels.stop_reason, 'cancelled')
+        self.assertEqual(mock_request.call_count, 1)
+        # The partly read streamed page was released.
+        pages[0].close.assert_called_once_with()
@@ -0,0 +1,190 @@
+import datetime
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import requests
+
+import urbanairship as ua
+from urbanairship import export
+
+CHANNELS = [
+    {
+        'channel_id': '2ce7bb20-03a1-417d-bef5-61306e3755d7',
+        'device_type': 'ios',
+        'installed': True,
+        'opt_in': 'true',
+        'background': True,
+        'push_address': 'ABCDEF',
+        'created': '2016-08-17T23:29:52',
+        'last_registration': 'None',
+        'named_user_id': None,
+        'alias': None,
+        'tags': ['a', 'b'],
+        'tag_groups': {'timezone': ['America/Los_Angeles']},
+        'ios': {
+            'badge': 2,
+            'quiettime': {'start': '22:00', 'end': '06:00'},
+            'tz': 'America/Los_Angeles'
+        }
+    },
+    {
+        'channel_id': 'aaabf77c-432e-4468-8b4a-0a173685e58f',
+        'device_type': 'open',
+        'installed': True,
+        'opt_in': True,
+        'address': '+1 8008675309',
+        'created': '2017-08-11T19:17:33',
+        'tags': [],
+        'tag_groups': {},
+        'open': {
+            'open_platform_name': 'sms',
+            'identifiers': {'likes-cats': 'very true'}
+        }
+    },
+    {
+        'channel_id': '4c3b6679-16f9-450a-9781-938cb3e9db7c',
+        'device_type': 'web',
+        'installed': False,
+        'opt_in': False,
+        'web': {'subscription': {'auth': 'xyz', 'p256dh': 'abc'}}
+    },
+]
+
+
+@unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+class TestParquetExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def channel_list(self, mock_request):
+        response = requests.Response()
+        response._content = json.dumps({'channels': CHANNELS}).encode('utf-8')
+        response.status_code = 200
+        mock_request.return_value = response
+        return ua.ChannelList(ua.Airship('key', 'secret'))
+
+    def test_record_batches(self):
+        batches = list(export.channel_record_batches(CHANNELS, batch_size=2))
+
+        self.assertEqual([b.num_rows for b in batches], [2, 1])
+        self.assertEqual(batches[0].schema, export.channel_schema())
+
+        rows = batches[0].to_pylist() + batches[1].to_pylist()
+        self.assertEqual(rows[0]['opt_in'], True)
+        self.assertEqual(
+            rows[0]['created'], datetime.datetime(2016, 8, 17, 23, 29, 52)
+        )
+        self.assertEqual(rows[0]['last_registration'], None)
+        self.assertEqual(rows[0]['tags'], ['a', 'b'])
+        self.assertEqual(
+            rows[0]['tag_groups'], [('timezone', ['America/Los_Angeles'])]
+        )
+        self.assertEqual(rows[0]['ios']['badge'], 2)
+        self.assertEqual(rows[0]['ios']['quiettime']['start'], '22:00')
+        self.assertEqual(rows[1]['open']['open_platform_name'], 'sms')
+        self.assertEqual(
+            rows[1]['open']['identifiers'], [('likes-cats', 'very true')]
+        )
+        self.assertEqual(rows[1]['ios'], None)
+        self.assertEqual(rows[2]['web']['subscription']['p256dh'], 'abc')
+
+    def test_export_single_file(self):
+        import pyarrow.parquet
+
+        path = os.path.join(self.tmpdir, 'channels.parquet')
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            paths = export.export_channels_parquet(
+                self.channel_list(mock_request), path, batch_size=2
+            )
+
+        self.assertEqual(paths, [path])
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(
+            table.column('channel_id').to_pylist(),
+            [c['channel_id'] for c in CHANNELS]
+        )
+
+    def test_export_chunked_files(self):
+        import pyarrow.parquet
+
+        path = os.path.join(self.tmpdir, 'channels-{0:02d}.parquet')
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            paths = export.export_channels_parquet(
+                self.channel_list(mock_request), path, batch_size=1,
+                rows_per_file=2
+            )
+
+        self.assertEqual(paths, [path.format(0), path.format(1)])
+        self.assertEqual(
+            [pyarrow.parquet.read_table(p).num_rows for p in paths], [2, 1]
+        )
+
+
+class TestNDJSONExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'channels.ndjson')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_export_listing(self):
+        airship = ua.Airship('key', 'secret')
+        response = requests.Response()
+        response._content = json.dumps(
+            {'channels': CHANNELS}).encode('utf-8')
+        response.status_code = 200
+        progress = mock.Mock()
+
+        with mock.patch.object(ua.Airship, '_request') as mock_request:
+            mock_request.return_value = response
+            count = export.export_ndjson(
+                ua.ChannelList(airship), self.path,
+                checkpoint_every=2, fsync=True, progress=progress
+            )
+
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            progress.call_args_list, [mock.call(2), mock.call(3)]
+        )
+        with open(self.path, 'rb') as f:
+            lines = f.read().decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], CHANNELS)
+
+    def test_export_gzip(self):
+        export.export_ndjson(iter(CHANNELS), self.path, compress='gzip')
+        with gzip.open(self.path, 'rb') as f:
+            lines = f.read().decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], CHANNELS)
+
+    @unittest.skipIf(export.zstandard is None, 'zstandard is not installed')
+    def test_export_zstd(self):
+        export.export_ndjson(
+            iter(CHANNELS), self.path, compress='zstd', checkpoint_every=1
+        )
+        with open(self.path, 'rb') as f:
+            reader = export.zstandard.ZstdDecompressor().stream_reader(f)
+            lines = reader.read().decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], CHANNELS)
+
+    def test_export_empty(self):
+        progress = mock.Mock()
+        self.assertEqual(
+            export.export_ndjson([], self.path, progress=progress), 0
+        )
+        progress.assert_called_once_with(0)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_invalid_compression(self):
+        self.assertRaises(
+            ValueError, export.export_ndjson, [], self.path, compress='bz2'
+        )
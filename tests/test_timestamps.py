@@ -0,0 +1,79 @@
+import datetime
+import unittest
+
+import urbanairship as ua
+from urbanairship.timestamps import parse_timestamp
+
+
+class TestParseTimestamp(unittest.TestCase):
+    def test_formats(self):
+        expected = datetime.datetime(2016, 8, 17, 23, 29, 52)
+        self.assertEqual(parse_timestamp('2016-08-17T23:29:52'), expected)
+        self.assertEqual(parse_timestamp('2016-08-17 23:29:52'), expected)
+        self.assertEqual(parse_timestamp('2016-08-17T23:29:52Z'), expected)
+        self.assertEqual(
+            parse_timestamp('2016-08-17T23:29:52.123Z'),
+            datetime.datetime(2016, 8, 17, 23, 29, 52, 123000)
+        )
+        self.assertEqual(
+            parse_timestamp('2012-2-01 00:00:00'),
+            datetime.datetime(2012, 2, 1)
+        )
+        self.assertEqual(parse_timestamp(expected), expected)
+
+    def test_invalid(self):
+        for value in ('None', '', '2016-08-17', '2016-13-01T00:00:00', None,
+                      12345):
+            self.assertRaises(ValueError, parse_timestamp, value)
+
+
+class TestLazyTimestamp(unittest.TestCase):
+    def test_channel_info_parses_on_read(self):
+        channel = ua.ChannelInfo.from_payload(
+            {
+                'channel_id': '0492662a-1b52-4343-a1f9-c6b0c72931c0',
+                'created': '2014-04-17T23:35:15',
+                'last_registration': 'None',
+            },
+            'channel_id',
+            None
+        )
+        self.assertEqual(channel._created, '2014-04-17T23:35:15')
+        self.assertEqual(
+            channel.created, datetime.datetime(2014, 4, 17, 23, 35, 15)
+        )
+        self.assertEqual(
+            channel._created, datetime.datetime(2014, 4, 17, 23, 35, 15)
+        )
+        self.assertEqual(channel.last_registration, 'UNKNOWN')
+
+    def test_assignment(self):
+        channel = ua.ChannelInfo(None)
+        self.assertEqual(channel.created, None)
+        channel.created = datetime.datetime(2014, 4, 17)
+        self.assertEqual(channel.created, datetime.datetime(2014, 4, 17))
+
+    def test_readonly(self):
+        template = ua.Template(None)
+        self.assertEqual(template.created_at, None)
+        self.assertRaises(
+            AttributeError, setattr, template, 'created_at', 'value'
+        )
+
+
+class TestIteratorDataObj(unittest.TestCase):
+    def test_only_report_format_converted(self):
+        obj = ua.common.IteratorDataObj.from_payload({
+            'push_time': '2013-07-17 21:17:42',
+            'created': '2016-08-17T23:29:52',
+            'updated': '2017-08-11 19:17:33.123Z',
+            'name': 'None',
+            'count': 5,
+        })
+        self.assertEqual(
+            obj.push_time, datetime.datetime(2013, 7, 17, 21, 17, 42)
+        )
+        self.assertEqual(obj.created, '2016-08-17T23:29:52')
+        self.assertEqual(obj.updated, '2017-08-11 19:17:33.123Z')
+        self.assertEqual(obj.name, 'None')
+        self.assertEqual(obj.count, 5)
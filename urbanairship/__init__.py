@@ -3,6 +3,21 @@ from .core import Airship
 from .common import AirshipFailure, Unauthorized
 from .push import (
     Push,
+    PushBatch,
+    PushSender,
+    PushOutbox,
+    OutboxDispatcher,
+    coalesce_pushes,
+    chunk_push,
+    CompiledPush,
+    RenderedPush,
+    Variable,
+    PayloadError,
+    validate_push,
+    validate_scheduled_push,
+    validate_pipeline,
+    payload_sizes,
+    truncate_alerts,
     ScheduledPush,
     ScheduledList,
     TemplatePush,
@@ -23,6 +38,9 @@ from .push import (
     and_,
     or_,
     not_,
+    optimize_audience,
+    normalize_channel_ids,
+    normalize_device_tokens,
     location,
     recent_date,
     absolute_date,
@@ -61,6 +79,8 @@ from .devices import (
     DeviceTokenList,
     APIDList,
     DeviceInfo,
+    ChannelRecord,
+    DeviceRecord,
     TagList,
     Tag,
     DeleteTag,
@@ -75,6 +95,9 @@ from .devices import (
     StaticList,
     StaticLists,
     LocationFinder,
+    ChannelMirror,
+    ChannelSweep,
+    SweepRule,
 )
 
 from .reports import (
@@ -89,12 +112,34 @@ from .reports import (
     TimeInAppList,
 )
 
+from .analytics import (
+    ChannelTable,
+    TagIndex,
+    AudienceEvaluator,
+    NamedUserIndex,
+)
+
 __all__ = [
     Airship,
     AirshipFailure,
     Unauthorized,
     all_,
     Push,
+    PushBatch,
+    PushSender,
+    PushOutbox,
+    OutboxDispatcher,
+    coalesce_pushes,
+    chunk_push,
+    CompiledPush,
+    RenderedPush,
+    Variable,
+    PayloadError,
+    validate_push,
+    validate_scheduled_push,
+    validate_pipeline,
+    payload_sizes,
+    truncate_alerts,
     ScheduledPush,
     TemplatePush,
     ios_channel,
@@ -111,6 +156,9 @@ __all__ = [
     and_,
     or_,
     not_,
+    optimize_audience,
+    normalize_channel_ids,
+    normalize_device_tokens,
     location,
     recent_date,
     absolute_date,
@@ -136,6 +184,8 @@ __all__ = [
     DeviceTokenList,
     APIDList,
     DeviceInfo,
+    ChannelRecord,
+    DeviceRecord,
     TagList,
     Tag,
     DeleteTag,
@@ -157,6 +207,9 @@ __all__ = [
     StaticList,
     StaticLists,
     LocationFinder,
+    ChannelMirror,
+    ChannelSweep,
+    SweepRule,
     named_user,
     merge_data,
     Template,
@@ -164,6 +217,10 @@ __all__ = [
     ScheduledList,
     Automation,
     Pipeline,
+    ChannelTable,
+    TagIndex,
+    AudienceEvaluator,
+    NamedUserIndex,
 ]
 
 # Silence urllib3 INFO logging by default
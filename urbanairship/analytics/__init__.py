@@ -0,0 +1,15 @@
+from .table import (
+    ChannelTable
+)
+
+from .tag_index import (
+    TagIndex
+)
+
+from .audience import (
+    AudienceEvaluator
+)
+
+from .named_user_index import (
+    NamedUserIndex
+)
@@ -0,0 +1,209 @@
+import six
+
+from urbanairship.analytics.tag_index import DEVICE_TAG_GROUP
+
+# Channel selectors and the device type they are restricted to; None matches
+# any device type.
+CHANNEL_SELECTORS = {
+    'ios_channel': 'ios',
+    'android_channel': 'android',
+    'amazon_channel': 'amazon',
+    'open_channel': 'open',
+    'channel': None,
+}
+
+# Value selectors answered from TagIndex attributes.
+ATTRIBUTE_SELECTORS = {
+    'named_user': 'named_user_id',
+    'alias': 'alias',
+}
+
+
+class AudienceEvaluator(object):
+    """Evaluate push audience selectors against a local :py:class:`TagIndex`.
+
+    Selectors built with :py:func:`tag`, :py:func:`named_user`,
+    :py:func:`alias`, the channel selectors such as :py:func:`ios_channel`,
+    :py:func:`segment`, and :py:func:`and_`, :py:func:`or_` and
+    :py:func:`not_` are compiled into bitmap operations over the index, and
+    ``'all'`` selects every indexed channel. Selector values may also be
+    lists, which match any of the values, and ``tag`` selectors may carry a
+    ``group``.
+
+    Device token, APID, WNS and location selectors cannot be answered from
+    a channel listing and raise ``ValueError``.
+
+    >>> evaluator = AudienceEvaluator(index) # doctest: +SKIP
+    >>> evaluator.count(and_(tag('sports'), not_(tag('churned'))))
+    ... # doctest: +SKIP
+    120448
+
+    :param index: A :py:class:`TagIndex`.
+    :keyword segments: Optional mapping of segment ID to the segment's
+        audience selector, i.e. its ``criteria``, used for ``segment``
+        selectors.
+    :keyword reachable_only: If True, only count channels that are
+        installed and opted in.
+
+    """
+
+    def __init__(self, index, segments=None, reachable_only=False):
+        self.index = index
+        self.segments = segments or {}
+        self.reachable_only = reachable_only
+
+    def compile(self, audience):
+        """Compile an audience selector into a callable.
+
+        The callable takes no arguments and returns a new bitmap of the
+        matching channel ordinals. It reads the index on every call, so a
+        compiled audience stays current as the index is updated.
+
+        :raises ValueError: The selector is malformed or cannot be evaluated
+            locally.
+
+        """
+        node = self._compile(audience, ())
+        if not self.reachable_only:
+            return node
+        index = self.index
+
+        def reachable():
+            return (node() & index.attribute('installed') &
+                    index.attribute('opt_in'))
+        return reachable
+
+    def evaluate(self, audience):
+        """Return a bitmap of the channel ordinals matching ``audience``."""
+        return self.compile(audience)()
+
+    def count(self, audience):
+        """Return the number of channels matching ``audience``."""
+        return len(self.evaluate(audience))
+
+    def channel_ids(self, audience):
+        """Return the set of channel IDs matching ``audience``."""
+        return set(self.index.channel_ids_for(self.evaluate(audience)))
+
+    def chunks(self, audience, size):
+        """Yield lists of at most ``size`` matching channel IDs.
+
+        Useful for splitting a large send into several pushes addressed to
+        explicit channels.
+
+        """
+        if size < 1:
+            raise ValueError('size must be a positive integer')
+        chunk = []
+        for channel_id in self.index.channel_ids_for(self.evaluate(audience)):
+            chunk.append(channel_id)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _compile(self, audience, segments):
+        index = self.index
+        if audience == 'all':
+            return lambda: index.channels.copy()
+        if not isinstance(audience, dict) or not audience:
+            raise ValueError('Invalid audience selector: %r' % (audience,))
+
+        if 'and' in audience or 'or' in audience:
+            operator = 'and' if 'and' in audience else 'or'
+            children = audience[operator]
+            if len(audience) != 1 or not isinstance(children, list) or \
+                    not children:
+                raise ValueError(
+                    '"%s" must be the only key and hold a non-empty list'
+                    % operator
+                )
+            nodes = [self._compile(child, segments) for child in children]
+            if operator == 'and':
+                return lambda: _reduce(nodes, lambda a, b: a & b)
+            return lambda: _reduce(nodes, lambda a, b: a | b)
+
+        if 'not' in audience:
+            if len(audience) != 1:
+                raise ValueError('"not" must be the only key')
+            node = self._compile(audience['not'], segments)
+            return lambda: index.channels - node()
+
+        if 'tag' in audience:
+            group = audience.get('group', DEVICE_TAG_GROUP)
+            if set(audience) - set(['tag', 'group']):
+                raise ValueError('Invalid tag selector: %r' % (audience,))
+            tags = _values(audience['tag'])
+            return lambda: _union(index.members(tag, group) for tag in tags)
+
+        if len(audience) != 1:
+            raise ValueError('Invalid audience selector: %r' % (audience,))
+        key, value = list(audience.items())[0]
+
+        if key == 'segment':
+            segment_ids = _values(value)
+            for segment_id in segment_ids:
+                if segment_id not in self.segments:
+                    raise ValueError(
+                        'Unknown segment %r; pass its criteria in segments'
+                        % (segment_id,)
+                    )
+                if segment_id in segments:
+                    raise ValueError(
+                        'Segment %r refers to itself' % (segment_id,)
+                    )
+            nodes = [
+                self._compile(
+                    self.segments[segment_id], segments + (segment_id,)
+                )
+                for segment_id in segment_ids
+            ]
+            return lambda: _reduce(nodes, lambda a, b: a | b)
+
+        if key in ATTRIBUTE_SELECTORS:
+            field = ATTRIBUTE_SELECTORS[key]
+            values = _values(value)
+            return lambda: _union(
+                index.attribute(field, v) for v in values
+            )
+
+        if key in CHANNEL_SELECTORS:
+            device_type = CHANNEL_SELECTORS[key]
+            channel_ids = [v.lower().strip() for v in _values(value)]
+
+            def channels():
+                members = _union(
+                    index.members_for_channel(channel_id)
+                    for channel_id in channel_ids
+                )
+                if device_type is not None:
+                    members &= index.attribute('device_type', device_type)
+                return members
+            return channels
+
+        raise ValueError(
+            'The %r selector cannot be evaluated locally' % (key,)
+        )
+
+
+def _values(value):
+    if isinstance(value, six.string_types):
+        return [value]
+    if isinstance(value, list) and value:
+        return value
+    raise ValueError('Invalid selector value: %r' % (value,))
+
+
+def _reduce(nodes, operation):
+    result = nodes[0]()
+    for node in nodes[1:]:
+        result = operation(result, node())
+    return result
+
+
+def _union(bitmaps):
+    result = None
+    for members in bitmaps:
+        result = members.copy() if result is None else result | members
+    return result
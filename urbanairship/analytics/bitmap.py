@@ -0,0 +1,132 @@
+import zlib
+
+try:
+    import pyroaring
+except ImportError:
+    pyroaring = None
+
+
+class IntBitmap(object):
+    """Set of non-negative integers backed by a Python ``set``.
+
+    A pure Python stand-in for ``pyroaring.BitMap`` supporting the subset of
+    its interface used by the analytics indexes; adding, removing and
+    testing a value take constant time. Iteration is in ascending order.
+    Serialized bitmaps are the zlib compressed bits of the set, which keeps
+    sparse and dense bitmaps small on disk.
+
+    """
+
+    __slots__ = ('values',)
+
+    def __init__(self, values=()):
+        self.values = set(values)
+
+    def add(self, value):
+        self.values.add(value)
+
+    def update(self, values):
+        self.values.update(values)
+
+    def discard(self, value):
+        self.values.discard(value)
+
+    def copy(self):
+        return IntBitmap(self.values)
+
+    def __contains__(self, value):
+        return value in self.values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __bool__(self):
+        return bool(self.values)
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        return iter(sorted(self.values))
+
+    def __eq__(self, other):
+        if isinstance(other, IntBitmap):
+            return self.values == other.values
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __or__(self, other):
+        return IntBitmap(self.values | other.values)
+
+    def __and__(self, other):
+        return IntBitmap(self.values & other.values)
+
+    def __sub__(self, other):
+        return IntBitmap(self.values - other.values)
+
+    def __xor__(self, other):
+        return IntBitmap(self.values ^ other.values)
+
+    def __ior__(self, other):
+        self.values |= other.values
+        return self
+
+    def __iand__(self, other):
+        self.values &= other.values
+        return self
+
+    def __isub__(self, other):
+        self.values -= other.values
+        return self
+
+    def __repr__(self):
+        return 'IntBitmap(%r)' % list(self)
+
+    def serialize(self):
+        # Big-endian bytes of the int with bit n set for each value n.
+        size = (max(self.values) >> 3) + 1 if self.values else 1
+        data = bytearray(size)
+        for value in self.values:
+            data[size - 1 - (value >> 3)] |= 1 << (value & 7)
+        return zlib.compress(bytes(data))
+
+    @classmethod
+    def deserialize(cls, data):
+        data = bytearray(zlib.decompress(data))
+        size = len(data)
+        values = []
+        for position, byte in enumerate(data):
+            if byte:
+                offset = (size - 1 - position) << 3
+                values.extend(
+                    offset + bit for bit in range(8) if byte >> bit & 1
+                )
+        return cls(values)
+
+
+if pyroaring is not None:
+    Bitmap = pyroaring.BitMap
+    BACKEND = 'roaring'
+else:
+    Bitmap = IntBitmap
+    BACKEND = 'int'
+
+
+def deserialize(data, backend=BACKEND):
+    """Load a bitmap serialized by ``backend`` as a :py:data:`Bitmap`."""
+    if backend == BACKEND:
+        return Bitmap.deserialize(data)
+    if backend == 'roaring':
+        if pyroaring is None:
+            raise ImportError(
+                'pyroaring is required to load this index; '
+                'install it with "pip install pyroaring"'
+            )
+        return Bitmap(pyroaring.BitMap.deserialize(data))
+    if backend == 'int':
+        return Bitmap(IntBitmap.deserialize(data))
+    raise ValueError('Unknown bitmap backend: %r' % (backend,))
@@ -0,0 +1,262 @@
+import gzip
+import json
+import logging
+
+import six
+from six.moves import intern
+
+from urbanairship.devices.named_users import NamedUser
+
+logger = logging.getLogger('urbanairship')
+
+
+class NamedUserIndex(object):
+    """Local index of named users to their channels and tags.
+
+    Built from a :py:class:`NamedUserList` scan and kept current by
+    mirroring the :py:meth:`NamedUser.associate`,
+    :py:meth:`NamedUser.disassociate` and :py:meth:`NamedUser.tag` calls made
+    against the API, so that lookups need no requests.
+
+    Each named user is held as a tuple of ``(channel_id, device_type)``
+    pairs and a dict of tag group to tuple of tags. Device types, tag groups
+    and tags are interned, so repeated values are stored once.
+
+    >>> index = NamedUserIndex.from_named_users(
+    ...     ua.NamedUserList(airship, stream=True)) # doctest: +SKIP
+    >>> ua.NamedUser(airship, 'user-1').associate(channel_id, 'ios')
+    ... # doctest: +SKIP
+    >>> index.associate('user-1', channel_id, 'ios') # doctest: +SKIP
+    >>> index.channel_ids('user-1', device_type='ios') # doctest: +SKIP
+    ['9c36e8c7-5a73-47c0-9716-99fd3d4197d5']
+
+    """
+
+    def __init__(self):
+        self.named_users = {}
+        self.channel_owners = {}
+        # Strings that intern() does not take, such as unicode on Python 2.
+        self._strings = {}
+
+    def _intern(self, value):
+        if isinstance(value, str):
+            return intern(value)
+        if isinstance(value, six.string_types):
+            return self._strings.setdefault(value, value)
+        return value
+
+    def _tags(self, tags):
+        if not tags:
+            return None
+        return dict(
+            (self._intern(group),
+             tuple(self._intern(tag) for tag in group_tags))
+            for group, group_tags in tags.items()
+        )
+
+    @classmethod
+    def from_named_users(cls, named_users):
+        """Build an index from a :py:class:`NamedUserList` or raw payloads."""
+        index = cls()
+        index.update(named_users)
+        return index
+
+    def __len__(self):
+        return len(self.named_users)
+
+    def __contains__(self, named_user_id):
+        return named_user_id in self.named_users
+
+    def _set(self, named_user_id, channels, tags):
+        previous = self.named_users.get(named_user_id)
+        if previous is not None:
+            for channel_id, _ in previous[0]:
+                if self.channel_owners.get(channel_id) == named_user_id:
+                    del self.channel_owners[channel_id]
+        for channel_id, _ in channels:
+            owner = self.channel_owners.get(channel_id)
+            if owner is not None and owner != named_user_id:
+                self._drop_channel(owner, channel_id)
+            self.channel_owners[channel_id] = named_user_id
+        self.named_users[named_user_id] = (tuple(channels), tags)
+
+    def _drop_channel(self, named_user_id, channel_id):
+        channels, tags = self.named_users[named_user_id]
+        self.named_users[named_user_id] = (
+            tuple(c for c in channels if c[0] != channel_id), tags
+        )
+        if self.channel_owners.get(channel_id) == named_user_id:
+            del self.channel_owners[channel_id]
+
+    def add(self, payload):
+        """Index one raw named user payload, replacing any previous entry."""
+        channels = [
+            (channel['channel_id'].lower(),
+             self._intern(channel.get('device_type')))
+            for channel in payload.get('channels') or ()
+        ]
+        self._set(
+            payload['named_user_id'], channels,
+            self._tags(payload.get('tags'))
+        )
+
+    def update(self, named_users):
+        """Index every named user of a :py:class:`NamedUserList` or iterable.
+
+        :returns: Number of named users indexed.
+
+        """
+        payloads = getattr(
+            named_users, 'iter_payloads', lambda: named_users
+        )()
+        count = 0
+        for payload in payloads:
+            self.add(payload)
+            count += 1
+        logger.info(
+            'Indexed %d named users; index holds %d named users and %d '
+            'channels', count, len(self.named_users), len(self.channel_owners)
+        )
+        return count
+
+    def remove(self, named_user_id):
+        """Remove a named user and its channel associations."""
+        channels, _ = self.named_users.pop(named_user_id)
+        for channel_id, _ in channels:
+            if self.channel_owners.get(channel_id) == named_user_id:
+                del self.channel_owners[channel_id]
+
+    def associate(self, named_user_id, channel_id, device_type):
+        """Record a channel association, as made by
+        :py:meth:`NamedUser.associate`.
+
+        A channel belongs to one named user, so it is moved from any
+        previous one.
+
+        """
+        channel_id = channel_id.lower()
+        channels, tags = self.named_users.get(named_user_id, ((), None))
+        channels = [c for c in channels if c[0] != channel_id]
+        channels.append((channel_id, self._intern(device_type)))
+        self._set(named_user_id, channels, tags)
+
+    def disassociate(self, channel_id, device_type=None, named_user_id=None):
+        """Record a channel disassociation, as made by
+        :py:meth:`NamedUser.disassociate`.
+
+        ``device_type`` is accepted to match that method's arguments and is
+        not used.
+
+        :returns: The named user ID the channel was removed from, or None if
+            it was not associated.
+
+        """
+        channel_id = channel_id.lower()
+        owner = self.channel_owners.get(channel_id)
+        if owner is None or named_user_id not in (None, owner):
+            return None
+        self._drop_channel(owner, channel_id)
+        return owner
+
+    def tag(self, named_user_id, group, add=None, remove=None,
+            set_tags=None):
+        """Record a tag change, as made by :py:meth:`NamedUser.tag`.
+
+        ``set_tags`` is the ``set`` argument of :py:meth:`NamedUser.tag`.
+
+        """
+        if set_tags and (add or remove):
+            raise ValueError('A tag request can only contain an add or '
+                             'remove field, both, or a single set field')
+        if not add and not remove and not set_tags:
+            raise ValueError('An add, remove, or set field was not set')
+        channels, tags = self.named_users.get(named_user_id, ((), None))
+        tags = dict(tags or {})
+        if set_tags:
+            group_tags = list(set_tags)
+        else:
+            group_tags = [
+                t for t in tags.get(group, ()) if t not in (remove or ())
+            ]
+            for t in add or ():
+                if t not in group_tags:
+                    group_tags.append(t)
+        tags[group] = group_tags
+        self.named_users[named_user_id] = (channels, self._tags(tags))
+
+    def channels(self, named_user_id):
+        """Return a named user's ``(channel_id, device_type)`` pairs.
+
+        :raises KeyError: The named user is not in the index.
+
+        """
+        return list(self.named_users[named_user_id][0])
+
+    def channel_ids(self, named_user_id, device_type=None):
+        """Return a named user's channel IDs, optionally of one device type.
+
+        Unknown named users have no channels.
+
+        """
+        entry = self.named_users.get(named_user_id)
+        if entry is None:
+            return []
+        return [
+            channel_id for channel_id, channel_type in entry[0]
+            if device_type is None or channel_type == device_type
+        ]
+
+    def tags(self, named_user_id):
+        """Return a named user's dict of tag group to list of tags.
+
+        :raises KeyError: The named user is not in the index.
+
+        """
+        tags = self.named_users[named_user_id][1] or {}
+        return dict((group, list(t)) for group, t in tags.items())
+
+    def named_user_for(self, channel_id):
+        """Return the named user ID a channel is associated with, or None."""
+        return self.channel_owners.get(channel_id.lower())
+
+    def get(self, named_user_id, airship=None):
+        """Return a :py:class:`NamedUser` for an indexed named user, or None.
+
+        Its ``channels`` hold ``channel_id`` and ``device_type`` only.
+
+        """
+        if named_user_id not in self.named_users:
+            return None
+        return NamedUser.from_payload(
+            self._payload(named_user_id), airship=airship
+        )
+
+    def _payload(self, named_user_id):
+        channels, _ = self.named_users[named_user_id]
+        return {
+            'named_user_id': named_user_id,
+            'channels': [
+                {'channel_id': channel_id, 'device_type': device_type}
+                for channel_id, device_type in channels
+            ],
+            'tags': self.tags(named_user_id),
+        }
+
+    def save(self, path):
+        """Write the index to ``path`` as gzipped, line delimited JSON."""
+        with gzip.open(path, 'wb') as f:
+            for named_user_id in self.named_users:
+                f.write(json.dumps(
+                    self._payload(named_user_id), separators=(',', ':')
+                ).encode('utf-8'))
+                f.write(b'\n')
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by :py:meth:`save`."""
+        index = cls()
+        with gzip.open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    index.add(json.loads(line.decode('utf-8')))
+        return index
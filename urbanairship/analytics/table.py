@@ -0,0 +1,276 @@
+import datetime
+import logging
+
+from urbanairship.common import parse_bool
+from urbanairship.timestamps import parse_timestamp
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger('urbanairship')
+
+DEFAULT_CHUNK_SIZE = 100000
+
+# Registration age bin edges, in days.
+DEFAULT_AGE_BINS = (0, 1, 7, 30, 90, 180, 365, float('inf'))
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError(
+            'numpy is required for ChannelTable; '
+            'install it with "pip install numpy"'
+        )
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    try:
+        return parse_timestamp(value)
+    except ValueError:
+        return None
+
+
+class ChannelTable(object):
+    """Columnar, NumPy-backed table of an application's channels.
+
+    Each channel attribute is held in one array, indexed by row:
+
+    - ``channel_ids``, ``named_user_ids``: object arrays of strings or None.
+    - ``device_type_codes``: ``int16`` codes into ``device_types``.
+    - ``opt_in``, ``installed``, ``background``: bool arrays; missing values
+      are False.
+    - ``created``, ``last_registration``: ``datetime64[s]`` arrays, with
+      ``NaT`` for missing or unparseable timestamps.
+
+    Aggregations are vectorized over these arrays. Most take a ``where``
+    boolean row mask, such as one built with :py:meth:`mask`.
+
+    >>> table = ChannelTable.from_channels(
+    ...     ua.ChannelList(airship, stream=True)) # doctest: +SKIP
+    >>> table.opt_in_rates(where=table.mask(installed=True)) # doctest: +SKIP
+    {'android': 0.61, 'ios': 0.48, 'web': 0.92}
+
+    """
+
+    def __init__(self, channel_ids, device_type_codes, device_types, opt_in,
+                 installed, background, created, last_registration,
+                 named_user_ids):
+        _require_numpy()
+        self.channel_ids = channel_ids
+        self.device_type_codes = device_type_codes
+        self.device_types = tuple(device_types)
+        self.opt_in = opt_in
+        self.installed = installed
+        self.background = background
+        self.created = created
+        self.last_registration = last_registration
+        self.named_user_ids = named_user_ids
+
+    @classmethod
+    def from_channels(cls, channels, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Build a table by scanning a channel listing.
+
+        Rows are converted to arrays every ``chunk_size`` channels, so the
+        scan never holds more than one chunk of Python values.
+
+        :param channels: A :py:class:`ChannelList`, or any iterable of raw
+            channel payload dictionaries.
+        :keyword chunk_size: Number of channels per conversion chunk.
+
+        """
+        _require_numpy()
+        payloads = getattr(channels, 'iter_payloads', lambda: channels)()
+        codes = {}
+        chunks = []
+        rows = []
+        for payload in payloads:
+            device_type = payload.get('device_type')
+            code = codes.get(device_type)
+            if code is None:
+                code = codes[device_type] = len(codes)
+            rows.append((
+                payload.get('channel_id'),
+                code,
+                parse_bool(payload.get('opt_in')) or False,
+                parse_bool(payload.get('installed')) or False,
+                parse_bool(payload.get('background')) or False,
+                _timestamp(payload.get('created')),
+                _timestamp(payload.get('last_registration')),
+                payload.get('named_user_id'),
+            ))
+            if len(rows) >= chunk_size:
+                chunks.append(cls._chunk(rows))
+                rows = []
+        if rows or not chunks:
+            chunks.append(cls._chunk(rows))
+
+        columns = [
+            numpy.concatenate([chunk[i] for chunk in chunks])
+            for i in range(len(chunks[0]))
+        ]
+        device_types = sorted(codes, key=codes.get)
+        logger.info(
+            'Built channel table with %d channels', len(columns[0])
+        )
+        return cls(
+            columns[0], columns[1], device_types, columns[2], columns[3],
+            columns[4], columns[5], columns[6], columns[7]
+        )
+
+    @staticmethod
+    def _chunk(rows):
+        columns = list(zip(*rows)) or [()] * 8
+        channel_ids = numpy.empty(len(rows), dtype=object)
+        channel_ids[:] = columns[0]
+        named_user_ids = numpy.empty(len(rows), dtype=object)
+        named_user_ids[:] = columns[7]
+        return (
+            channel_ids,
+            numpy.array(columns[1], dtype=numpy.int16),
+            numpy.array(columns[2], dtype=bool),
+            numpy.array(columns[3], dtype=bool),
+            numpy.array(columns[4], dtype=bool),
+            numpy.array(columns[5], dtype='datetime64[s]'),
+            numpy.array(columns[6], dtype='datetime64[s]'),
+            named_user_ids,
+        )
+
+    def __len__(self):
+        return len(self.channel_ids)
+
+    @property
+    def device_type(self):
+        """Object array of each row's device type name."""
+        return numpy.array(self.device_types, dtype=object)[
+            self.device_type_codes]
+
+    def mask(self, device_type=None, opt_in=None, installed=None,
+             background=None, named_user=None):
+        """Return a boolean row mask matching every given condition.
+
+        :keyword device_type: A device type name, or a list of them.
+        :keyword opt_in: Match rows whose ``opt_in`` equals this value.
+        :keyword installed: Match rows whose ``installed`` equals this value.
+        :keyword background: Match rows whose ``background`` equals this
+            value.
+        :keyword named_user: If True, match rows associated with a named
+            user; if False, rows without one.
+
+        """
+        mask = numpy.ones(len(self), dtype=bool)
+        if device_type is not None:
+            if not isinstance(device_type, (list, tuple, set)):
+                device_type = [device_type]
+            codes = [
+                self.device_types.index(name) for name in device_type
+                if name in self.device_types
+            ]
+            mask &= numpy.isin(self.device_type_codes, codes)
+        for column, value in ((self.opt_in, opt_in),
+                              (self.installed, installed),
+                              (self.background, background)):
+            if value is not None:
+                mask &= column == bool(value)
+        if named_user is not None:
+            has_named_user = numpy.not_equal(self.named_user_ids, None)
+            mask &= has_named_user == bool(named_user)
+        return mask
+
+    def _group_sum(self, weights=None, where=None):
+        codes = self.device_type_codes
+        if where is not None:
+            codes = codes[where]
+            if weights is not None:
+                weights = weights[where]
+        return numpy.bincount(
+            codes, weights=weights, minlength=len(self.device_types)
+        )
+
+    def device_type_counts(self, where=None):
+        """Return a dict of device type name to number of channels."""
+        counts = self._group_sum(where=where)
+        return dict(
+            (name, int(count))
+            for name, count in zip(self.device_types, counts)
+        )
+
+    def opt_in_rate(self, where=None):
+        """Return the fraction of channels that are opted in.
+
+        :returns: A float, or None if no rows are selected.
+
+        """
+        opt_in = self.opt_in if where is None else self.opt_in[where]
+        if not len(opt_in):
+            return None
+        return float(numpy.count_nonzero(opt_in)) / len(opt_in)
+
+    def opt_in_rates(self, where=None):
+        """Return a dict of device type name to opt-in fraction.
+
+        Device types with no selected rows are omitted.
+
+        """
+        totals = self._group_sum(where=where)
+        opted_in = self._group_sum(
+            weights=self.opt_in.astype(numpy.float64), where=where
+        )
+        return dict(
+            (name, float(opted_in[code]) / totals[code])
+            for code, name in enumerate(self.device_types) if totals[code]
+        )
+
+    def registration_age(self, now=None):
+        """Return each row's days since ``last_registration`` as floats.
+
+        Rows without a registration time are ``nan``.
+
+        :keyword now: A ``datetime`` to measure from; defaults to the current
+            UTC time.
+
+        """
+        if now is None:
+            now = datetime.datetime.utcnow()
+        age = numpy.datetime64(now, 's') - self.last_registration
+        return age / numpy.timedelta64(1, 'D')
+
+    def registration_age_histogram(self, bins=DEFAULT_AGE_BINS, now=None,
+                                   by_device_type=False, where=None):
+        """Count channels by days since their last registration.
+
+        :keyword bins: Increasing bin edges in days. Bin ``i`` counts ages in
+            ``[bins[i], bins[i + 1])``; ages outside the edges, and rows
+            without a registration time, are not counted.
+        :keyword now: A ``datetime`` to measure from; defaults to the current
+            UTC time.
+        :keyword by_device_type: If True, return a dict of device type name
+            to counts instead.
+        :keyword where: Optional boolean row mask.
+        :returns: An integer array of ``len(bins) - 1`` counts.
+
+        """
+        edges = numpy.asarray(bins, dtype=numpy.float64)
+        if edges.ndim != 1 or len(edges) < 2 or \
+                numpy.any(numpy.diff(edges) <= 0):
+            raise ValueError('bins must be at least two increasing edges')
+        nbins = len(edges) - 1
+        age = self.registration_age(now)
+        codes = self.device_type_codes
+        if where is not None:
+            age = age[where]
+            codes = codes[where]
+        bin_index = numpy.searchsorted(edges, age, side='right') - 1
+        valid = (bin_index >= 0) & (bin_index < nbins)
+        if not by_device_type:
+            return numpy.bincount(bin_index[valid], minlength=nbins)
+
+        ntypes = len(self.device_types)
+        counts = numpy.bincount(
+            codes[valid].astype(numpy.int64) * nbins + bin_index[valid],
+            minlength=ntypes * nbins
+        ).reshape(ntypes, nbins)
+        return dict(zip(self.device_types, counts))
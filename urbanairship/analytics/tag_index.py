@@ -0,0 +1,366 @@
+import array
+import json
+import logging
+import struct
+import zlib
+
+from urbanairship.analytics import bitmap
+from urbanairship.common import parse_bool
+
+logger = logging.getLogger('urbanairship')
+
+DEVICE_TAG_GROUP = 'device'
+
+# Low cardinality channel fields indexed by value alongside tags, and
+# flags indexed when true.
+ATTRIBUTE_FIELDS = ('device_type',)
+FLAG_FIELDS = ('installed', 'opt_in')
+# Channel fields with about one value per channel, looked up through a dict
+# of value to ordinals rather than a bitmap per value.
+VALUE_FIELDS = ('named_user_id', 'alias')
+
+_MAGIC = b'UATAGIDX1\n'
+_TAG, _ATTRIBUTE, _VALUE = range(3)
+_LENGTH = struct.Struct('>I')
+
+
+def _write_block(f, data):
+    f.write(_LENGTH.pack(len(data)))
+    f.write(data)
+
+
+def _read_block(f):
+    header = f.read(_LENGTH.size)
+    if len(header) != _LENGTH.size:
+        raise ValueError('Truncated tag index file')
+    length, = _LENGTH.unpack(header)
+    data = f.read(length)
+    if len(data) != length:
+        raise ValueError('Truncated tag index file')
+    return data
+
+
+class TagIndex(object):
+    """Inverted index of (tag group, tag) to the channels carrying it.
+
+    Each channel is given an ordinal on first sight, and each (group, tag)
+    pair maps to a compressed bitmap of ordinals. Bitmaps are
+    ``pyroaring.BitMap`` objects when ``pyroaring`` is installed and a
+    set-backed fallback otherwise. Device tags are stored in the
+    ``'device'`` group.
+
+    Channels are also indexed by ``device_type`` value and by whether they
+    are ``installed`` and ``opt_in``, and can be looked up by
+    ``named_user_id`` and ``alias``; see :py:meth:`attribute`.
+
+    The index can be built incrementally with :py:meth:`add` and
+    :py:meth:`update`, and written to and read from disk with
+    :py:meth:`save` and :py:meth:`load`.
+
+    >>> index = TagIndex.from_channels(
+    ...     ua.ChannelList(airship, stream=True)) # doctest: +SKIP
+    >>> index.count('gold', group='loyalty') # doctest: +SKIP
+    48213
+
+    """
+
+    def __init__(self):
+        self.channel_ids = []
+        self.ordinals = {}
+        self.channels = bitmap.Bitmap()
+        self.bitmaps = {}
+        self.attributes = {}
+        self.values = dict((field, {}) for field in VALUE_FIELDS)
+        # Each ordinal's entries, as an array of ids into _entries, so a
+        # channel is discarded from its own entries only. Entries are
+        # (kind, key) pairs interned once, kind being one of _TAG,
+        # _ATTRIBUTE or _VALUE.
+        self._memberships = []
+        self._entries = []
+        self._entry_ids = {}
+
+    @classmethod
+    def from_channels(cls, channels):
+        """Build an index from a :py:class:`ChannelList` or raw payloads."""
+        index = cls()
+        index.update(channels)
+        return index
+
+    def __len__(self):
+        return len(self.channels)
+
+    def __contains__(self, channel_id):
+        ordinal = self.ordinals.get(channel_id)
+        return ordinal is not None and ordinal in self.channels
+
+    def _ordinal(self, channel_id):
+        ordinal = self.ordinals.get(channel_id)
+        if ordinal is None:
+            ordinal = self.ordinals[channel_id] = len(self.channel_ids)
+            self.channel_ids.append(channel_id)
+            self._memberships.append(None)
+        return ordinal
+
+    def _entry_id(self, kind, key):
+        entry = (kind, key)
+        entry_id = self._entry_ids.get(entry)
+        if entry_id is None:
+            entry_id = self._entry_ids[entry] = len(self._entries)
+            self._entries.append(entry)
+        return entry_id
+
+    def _discard(self, ordinal):
+        memberships = self._memberships[ordinal]
+        if memberships is None:
+            return
+        self._memberships[ordinal] = None
+        for entry_id in memberships:
+            kind, key = self._entries[entry_id]
+            if kind == _VALUE:
+                field, value = key
+                container, key = self.values[field], value
+            else:
+                container = self.bitmaps if kind == _TAG else self.attributes
+            members = container.get(key)
+            if members is None:
+                continue
+            members.discard(ordinal)
+            if not members:
+                del container[key]
+
+    @staticmethod
+    def _add_member(bitmaps, key, ordinal):
+        members = bitmaps.get(key)
+        if members is None:
+            members = bitmaps[key] = bitmap.Bitmap()
+        members.add(ordinal)
+
+    @staticmethod
+    def _keys(payload):
+        keys = [(DEVICE_TAG_GROUP, tag) for tag in payload.get('tags') or ()]
+        for group, tags in (payload.get('tag_groups') or {}).items():
+            keys.extend((group, tag) for tag in tags)
+        return keys
+
+    @staticmethod
+    def _attribute_keys(payload):
+        keys = [
+            (field, payload[field]) for field in ATTRIBUTE_FIELDS
+            if payload.get(field) is not None
+        ]
+        keys.extend(
+            (field, True) for field in FLAG_FIELDS
+            if parse_bool(payload.get(field))
+        )
+        return keys
+
+    @staticmethod
+    def _value_keys(payload):
+        return [
+            (field, payload[field]) for field in VALUE_FIELDS
+            if payload.get(field) is not None
+        ]
+
+    def _add_value(self, key, ordinal):
+        field, value = key
+        ordinals = self.values[field].get(value)
+        if ordinals is None:
+            ordinals = self.values[field][value] = set()
+        ordinals.add(ordinal)
+
+    def add(self, payload):
+        """Index one raw channel payload.
+
+        A channel already in the index has its previous tags and
+        attributes replaced.
+
+        :returns: The channel's ordinal.
+
+        """
+        channel_id = payload['channel_id']
+        known = channel_id in self.ordinals
+        ordinal = self._ordinal(channel_id)
+        if known:
+            self._discard(ordinal)
+        self.channels.add(ordinal)
+        memberships = []
+        for key in self._keys(payload):
+            self._add_member(self.bitmaps, key, ordinal)
+            memberships.append(self._entry_id(_TAG, key))
+        for key in self._attribute_keys(payload):
+            self._add_member(self.attributes, key, ordinal)
+            memberships.append(self._entry_id(_ATTRIBUTE, key))
+        for key in self._value_keys(payload):
+            self._add_value(key, ordinal)
+            memberships.append(self._entry_id(_VALUE, key))
+        self._memberships[ordinal] = array.array('I', memberships)
+        return ordinal
+
+    def update(self, channels):
+        """Index every channel of a :py:class:`ChannelList` or iterable.
+
+        :returns: Number of channels indexed.
+
+        """
+        payloads = getattr(channels, 'iter_payloads', lambda: channels)()
+        count = 0
+        for payload in payloads:
+            self.add(payload)
+            count += 1
+        logger.info(
+            'Indexed %d channels; tag index holds %d channels and %d tags',
+            count, len(self.channels), len(self.bitmaps)
+        )
+        return count
+
+    def remove(self, channel_id):
+        """Remove a channel from the index, e.g. after it was uninstalled.
+
+        Its ordinal is never given to another channel.
+
+        """
+        ordinal = self.ordinals.get(channel_id)
+        if ordinal is None or ordinal not in self.channels:
+            raise KeyError(channel_id)
+        self._discard(ordinal)
+        self.channels.discard(ordinal)
+
+    def members(self, tag, group=DEVICE_TAG_GROUP):
+        """Return the bitmap of channel ordinals carrying a tag.
+
+        The returned bitmap is shared with the index and must not be
+        modified; copy it first.
+
+        """
+        members = self.bitmaps.get((group, tag))
+        return bitmap.Bitmap() if members is None else members
+
+    def members_for_channel(self, channel_id):
+        """Return a new bitmap holding just a channel's ordinal.
+
+        The bitmap is empty if the channel is not in the index.
+
+        """
+        members = bitmap.Bitmap()
+        if channel_id in self:
+            members.add(self.ordinals[channel_id])
+        return members
+
+    def attribute(self, field, value=True):
+        """Return the bitmap of channel ordinals with a field value.
+
+        ``field`` is one of ``'device_type'``, ``'named_user_id'`` or
+        ``'alias'``, or ``'installed'`` or ``'opt_in'`` to select channels
+        where that flag is true. As with :py:meth:`members`, the bitmap must
+        not be modified.
+
+        """
+        if field in self.values:
+            return bitmap.Bitmap(self.values[field].get(value, ()))
+        members = self.attributes.get((field, value))
+        return bitmap.Bitmap() if members is None else members
+
+    def count(self, tag, group=DEVICE_TAG_GROUP):
+        """Return the number of channels carrying a tag in a tag group."""
+        members = self.bitmaps.get((group, tag))
+        return 0 if members is None else len(members)
+
+    def channel_ids_for(self, members):
+        """Yield the channel IDs for a bitmap of ordinals."""
+        for ordinal in members:
+            yield self.channel_ids[ordinal]
+
+    def groups(self):
+        """Return the set of indexed tag groups."""
+        return set(group for group, _ in self.bitmaps)
+
+    def cardinalities(self, group=DEVICE_TAG_GROUP):
+        """Return a dict of each tag in a group to its channel count."""
+        return dict(
+            (tag, len(members))
+            for (tag_group, tag), members in self.bitmaps.items()
+            if tag_group == group
+        )
+
+    def save(self, path):
+        """Write the index to ``path``.
+
+        Channel IDs and tag names are stored zlib compressed; bitmaps in
+        their compressed serialized form.
+
+        """
+        keys = sorted(self.bitmaps)
+        attribute_keys = sorted(self.attributes)
+        header = json.dumps({
+            'backend': bitmap.BACKEND,
+            'channel_ids': [
+                channel_id if ordinal in self.channels else None
+                for ordinal, channel_id in enumerate(self.channel_ids)
+            ],
+            'keys': keys,
+            'attribute_keys': attribute_keys,
+            'values': dict(
+                (field, [
+                    [value, sorted(ordinals)]
+                    for value, ordinals in sorted(values.items())
+                ])
+                for field, values in self.values.items()
+            ),
+        }, separators=(',', ':')).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(_MAGIC)
+            _write_block(f, zlib.compress(header))
+            _write_block(f, self.channels.serialize())
+            for key in keys:
+                _write_block(f, self.bitmaps[key].serialize())
+            for key in attribute_keys:
+                _write_block(f, self.attributes[key].serialize())
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by :py:meth:`save`."""
+        index = cls()
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError('%s is not a tag index file' % path)
+            header = json.loads(
+                zlib.decompress(_read_block(f)).decode('utf-8')
+            )
+            backend = header['backend']
+            index.channels = bitmap.deserialize(_read_block(f), backend)
+            for key in header['keys']:
+                index.bitmaps[tuple(key)] = bitmap.deserialize(
+                    _read_block(f), backend
+                )
+            for key in header['attribute_keys']:
+                index.attributes[tuple(key)] = bitmap.deserialize(
+                    _read_block(f), backend
+                )
+        for field, values in header['values'].items():
+            for value, ordinals in values:
+                index.values[field][value] = set(ordinals)
+        index.channel_ids = header['channel_ids']
+        index._memberships = [None] * len(index.channel_ids)
+        value_keys = [
+            ((field, value), ordinals)
+            for field, values in index.values.items()
+            for value, ordinals in values.items()
+        ]
+        for kind, items in ((_TAG, index.bitmaps.items()),
+                            (_ATTRIBUTE, index.attributes.items()),
+                            (_VALUE, value_keys)):
+            for key, members in items:
+                entry_id = index._entry_id(kind, key)
+                for ordinal in members:
+                    memberships = index._memberships[ordinal]
+                    if memberships is None:
+                        memberships = index._memberships[ordinal] = (
+                            array.array('I')
+                        )
+                    memberships.append(entry_id)
+        index.ordinals = dict(
+            (channel_id, ordinal)
+            for ordinal, channel_id in enumerate(index.channel_ids)
+            if channel_id is not None
+        )
+        return index
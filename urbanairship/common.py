@@ -1,6 +1,22 @@
+import codecs
+import json
 import logging
-import datetime
+import re
+import threading
+import time
+
 import six
+from six.moves.urllib.parse import (
+    parse_qsl, urlencode, urlsplit, urlunsplit
+)
+
+from urbanairship.timestamps import parse_timestamp
+
+# IteratorDataObj only converts the space separated timestamps report
+# endpoints return, e.g. 2013-07-17 21:17:42, and leaves other strings alone.
+DATA_TIMESTAMP_FORMAT = re.compile(
+    r'^\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{1,2}:\d{1,2}$'
+)
 
 SERVER = 'go.urbanairship.com'
 BASE_URL = "https://go.urbanairship.com/api"
@@ -25,6 +41,22 @@ NAMED_USER_ASSOCIATE_URL = NAMED_USER_URL + 'associate/'
 
 logger = logging.getLogger('urbanairship')
 
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def parse_bool(value):
+    """Return a payload boolean, accepting ``'true'``/``'false'`` strings.
+
+    >>> parse_bool('true'), parse_bool(False), parse_bool(None)
+    (True, False, None)
+
+    """
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, six.string_types):
+        return {'true': True, 'false': False}.get(value.lower())
+    return bool(value)
+
 
 class Unauthorized(Exception):
     """Raised when we get a 401 from the server"""
@@ -81,6 +113,43 @@ class AirshipFailure(Exception):
         )
 
 
+class RateLimiter(object):
+    """Pace operations to an average rate, shared safely between threads.
+
+    Each :py:meth:`wait` reserves the next free slot and sleeps until it,
+    so a call for ``n`` units is spaced ``n / rate`` seconds from the next.
+
+    :param rate: Units per second.
+    :keyword clock: Monotonic clock function, for testing.
+    :keyword sleep: Sleep function, for testing.
+
+    """
+
+    def __init__(self, rate, clock=None, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.clock = clock or _clock
+        self.sleep = sleep
+        self._next = None
+        self._lock = threading.Lock()
+
+    def wait(self, units=1):
+        """Block until ``units`` more units may be used.
+
+        :returns: Seconds slept.
+
+        """
+        with self._lock:
+            now = self.clock()
+            start = now if self._next is None else max(now, self._next)
+            self._next = start + units / self.rate
+        delay = start - now
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+
+
 @six.python_2_unicode_compatible
 class IteratorDataObj(object):
     @classmethod
@@ -93,13 +162,13 @@ class IteratorDataObj(object):
         if airship:
             obj.airship = airship
         for key in payload:
-            try:
-                val = datetime.datetime.strptime(
-                    payload[key],
-                    '%Y-%m-%d %H:%M:%S'
-                )
-            except (TypeError, ValueError):
-                val = payload[key]
+            val = payload[key]
+            if isinstance(val, six.string_types) and \
+                    DATA_TIMESTAMP_FORMAT.match(val):
+                try:
+                    val = parse_timestamp(val)
+                except ValueError:
+                    pass
             setattr(obj, key, val)
         return obj
 
@@ -114,54 +183,493 @@ class IteratorDataObj(object):
         return print_str[:-2]
 
 
+class JSONStreamDecoder(object):
+    """Incrementally decode a JSON object read as a sequence of byte chunks.
+
+    Only the top level object is walked by hand; each value inside it is
+    decoded with the standard ``json`` decoder as soon as enough input has
+    arrived, so memory is bounded by the largest single value rather than the
+    whole document.
+
+    :param chunks: Iterable of ``bytes`` holding UTF-8 encoded JSON.
+
+    """
+    whitespace = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buf = u''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Append the next chunk to the buffer; False at end of input."""
+        if self._eof:
+            return False
+        text = u''
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                break
+        else:
+            text = self._text.decode(b'', True)
+            self._eof = True
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return bool(text)
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            self._pos = self.whitespace.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON input')
+
+    def _next_char(self, expected):
+        char = self._peek()
+        if char not in expected:
+            raise ValueError(
+                'Expected one of %r at %r' % (expected, self._buf[self._pos:])
+            )
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            # A number ending the buffer may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self, key, page):
+        """Yield each element of the array at ``key`` as it is decoded.
+
+        Every other key of the object is decoded whole and stored in the
+        ``page`` dictionary, which is complete once the generator finishes.
+
+        """
+        self._next_char('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            name = self._value()
+            self._next_char(':')
+            if name == key and self._peek() == '[':
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._next_char(',]') == ']':
+                            break
+            else:
+                page[name] = self._value()
+            if self._next_char(',}') == '}':
+                return
+
+
+def set_query_param(url, key, value):
+    """Return ``url`` with query parameter ``key`` set to ``value``.
+
+    >>> set_query_param('https://example.com/a?limit=10&start=x', 'limit', 50)
+    'https://example.com/a?limit=50&start=x'
+
+    """
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    params = parse_qsl(query, keep_blank_values=True)
+    value = str(value)
+    if any(k == key for k, _ in params):
+        params = [(k, value if k == key else v) for k, v in params]
+    else:
+        params.append((key, value))
+    return urlunsplit((scheme, netloc, path, urlencode(params), fragment))
+
+
+class PageSizeTuner(object):
+    """Choose the page size of a listing scan to maximize items per second.
+
+    After each page, :py:meth:`record` is given the page's item count,
+    elapsed time and size in bytes, and returns the page size to request
+    next. The tuner grows the page size by ``factor`` while throughput keeps
+    improving, and settles on the best size seen once it stops. Page sizes
+    stay within ``min_limit`` and ``max_limit``; ``max_limit`` is lowered if
+    the server returns fewer items than requested on a non-final page, and
+    ``max_page_bytes`` caps the page size by the observed bytes per item.
+
+    :keyword initial: First page size; defaults to the listing's ``limit``
+        or ``min_limit``.
+    :keyword min_limit: Smallest page size to request.
+    :keyword max_limit: Largest page size to request.
+    :keyword factor: Multiplier between page sizes tried.
+    :keyword tolerance: Relative throughput gain needed to count as an
+        improvement.
+    :keyword max_page_bytes: Optional cap on the expected bytes per page.
+
+    """
+
+    def __init__(self, initial=None, min_limit=100, max_limit=1000,
+                 factor=2.0, tolerance=0.05, max_page_bytes=None):
+        if not 0 < min_limit <= max_limit:
+            raise ValueError('Page size limits must be 0 < min <= max')
+        if factor <= 1:
+            raise ValueError('factor must be greater than 1')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.factor = factor
+        self.tolerance = tolerance
+        self.max_page_bytes = max_page_bytes
+        self.converged = False
+        self.pages = 0
+        self.items = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.rates = {}
+        self._best = None
+        self.limit = self._clamp(initial or min_limit)
+
+    def _clamp(self, limit):
+        limit = max(self.min_limit, min(self.max_limit, int(limit)))
+        if self.max_page_bytes and self.items:
+            per_item = float(self.bytes) / self.items
+            limit = min(limit, max(self.min_limit,
+                                   int(self.max_page_bytes / per_item)))
+        return limit
+
+    def record(self, items, seconds, nbytes, last=False):
+        """Record a fetched page and return the next page size.
+
+        :param items: Number of items in the page.
+        :param seconds: Time spent fetching and decoding the page.
+        :param nbytes: Size of the page body in bytes.
+        :keyword last: True if this was the final page.
+
+        """
+        requested = self.limit
+        self.pages += 1
+        self.items += items
+        self.bytes += nbytes
+        self.seconds += seconds
+        if last or not items:
+            return self.limit
+        if items < requested:
+            # The server caps page sizes below what was requested.
+            self.max_limit = max(self.min_limit, items)
+        rate = items / max(seconds, 1e-6)
+        previous = self.rates.get(requested)
+        self.rates[requested] = (
+            rate if previous is None else (previous + rate) / 2
+        )
+
+        best = self._best
+        improved = best is None or (
+            self.rates[requested] > self.rates[best] * (1 + self.tolerance)
+        )
+        if improved:
+            self._best = requested
+            if not self.converged:
+                grown = self._clamp(requested * self.factor)
+                if grown == requested:
+                    self.converged = True
+                self.limit = grown
+                return self.limit
+        elif requested == best:
+            # The best size slowed down; fall back to the fastest measured.
+            self._best = max(self.rates, key=self.rates.get)
+        self.converged = True
+        self.limit = self._clamp(self._best)
+        return self.limit
+
+    def report(self):
+        """Return a dict summarizing the scan and the chosen page size."""
+        return {
+            'limit': self.limit,
+            'pages': self.pages,
+            'items': self.items,
+            'bytes': self.bytes,
+            'seconds': self.seconds,
+            'items_per_second': (
+                self.items / self.seconds if self.seconds else None
+            ),
+            'rates': dict(self.rates),
+        }
+
+
 class IteratorParent(six.Iterator):
+    """Base class for iterators over paginated API listings.
+
+    :ivar fields: Optional list of payload keys to keep for each item. Other
+        keys are dropped from each item once it is decoded, before the
+        item's object is built. This saves the memory held by dropped values
+        and the cost of building objects from them; the JSON is still
+        parsed in full. The listing's ``id_key`` is always kept.
+    :ivar stream: If True, each page is read from the network incrementally
+        and items are yielded as soon as they are decoded, instead of
+        decoding the whole page first.
+    :ivar tuner: A :py:class:`PageSizeTuner` adjusting the ``limit`` of each
+        page request, if the listing was created with ``adaptive``.
+    :ivar page_size_report: The tuner's :py:meth:`PageSizeTuner.report` once
+        the scan has finished.
+    :ivar max_items: Stop after this many items. Page requests are shrunk
+        so that no more items than needed are fetched.
+    :ivar max_pages: Stop before fetching more than this many pages.
+    :ivar time_budget: Stop before fetching another page once this many
+        seconds have passed since the first page was requested.
+    :ivar stop_reason: Why iteration stopped early: ``'cancelled'``,
+        ``'max_items'``, ``'max_pages'`` or ``'time_budget'``; None if the
+        listing has not been cut short.
+
+    """
     next_url = None
     data_attribute = None
     data_list = None
     params = None
     id_key = None
+    fields = None
+    stream = False
+    stream_chunk_size = 64 * 1024
     instance_class = IteratorDataObj
+    tuner = None
+    page_size_report = None
+    max_items = None
+    max_pages = None
+    time_budget = None
+    stop_reason = None
 
-    def __init__(self, airship, params):
+    def __init__(self, airship, params, fields=None, stream=False,
+                 adaptive=False, max_items=None, max_pages=None,
+                 time_budget=None):
         self.airship = airship
         self.params = params
+        self.stream = stream
+        self.max_items = max_items
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+        self.items_read = 0
+        self.pages_read = 0
+        self._started = None
+        self._final_page = False
+        self._cancelled = threading.Event()
+        if adaptive:
+            if not isinstance(adaptive, PageSizeTuner):
+                adaptive = PageSizeTuner(
+                    initial=(params or {}).get('limit')
+                )
+            self.tuner = adaptive
+            self.params = dict(params or {}, limit=adaptive.limit)
+        if fields is not None:
+            fields = list(fields)
+            if self.id_key and self.id_key not in fields:
+                fields.append(self.id_key)
+            self.fields = tuple(fields)
         self._token_iter = iter(())
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        try:
-            return self.instance_class.from_payload(
-                next(self._token_iter),
-                self.id_key,
-                self.airship
-            )
-        except StopIteration:
-            if self._load_page():
-                return self.instance_class.from_payload(
-                    next(self._token_iter),
-                    self.id_key,
-                    self.airship
-                )
-            else:
+        return self.instance_class.from_payload(
+            self._next_payload(),
+            self.id_key,
+            self.airship
+        )
+
+    def iter_payloads(self):
+        """Yield the raw payload of each remaining item.
+
+        Pages are loaded as usual, but no ``instance_class`` objects are
+        built; useful for exporting listings without per-item overhead.
+
+        """
+        while True:
+            try:
+                item = self._next_payload()
+            except StopIteration:
+                return
+            yield item
+
+    def cancel(self):
+        """Stop the iteration; safe to call from any thread.
+
+        No further items are returned and no further pages are fetched.
+
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _next_payload(self):
+        while True:
+            if self._cancelled.is_set():
+                self._stop('cancelled')
+                raise StopIteration
+            if self.max_items is not None and \
+                    self.items_read >= self.max_items:
+                self._stop('max_items')
                 raise StopIteration
+            try:
+                item = next(self._token_iter)
+            except StopIteration:
+                if not self._load_page():
+                    raise
+                continue
+            self.items_read += 1
+            return item
+
+    def _stop(self, reason):
+        if self.stop_reason is None:
+            self.stop_reason = reason
+            logger.info(
+                'Stopped %s after %d items in %d pages: %s',
+                type(self).__name__, self.items_read, self.pages_read, reason
+            )
+        close = getattr(self._token_iter, 'close', None)
+        if close is not None:
+            close()
+        self._token_iter = iter(())
+        self._finish_tuning()
+
+    def _budget_exhausted(self):
+        if self._cancelled.is_set():
+            return 'cancelled'
+        if self.max_pages is not None and self.pages_read >= self.max_pages:
+            return 'max_pages'
+        if self.time_budget is not None and self._started is not None and \
+                _clock() - self._started >= self.time_budget:
+            return 'time_budget'
+        return None
+
+    def _request_limit(self, url, params):
+        """Shrink the requested page to the items still wanted."""
+        if self.max_items is None:
+            return url, params
+        remaining = self.max_items - self.items_read
+        if params and params.get('limit'):
+            if remaining < int(params['limit']):
+                self._final_page = True
+                params = dict(params, limit=remaining)
+        elif not params:
+            query = dict(parse_qsl(urlsplit(url).query))
+            if query.get('limit', '').isdigit() and \
+                    remaining < int(query['limit']):
+                self._final_page = True
+                url = set_query_param(url, 'limit', remaining)
+        return url, params
 
     def _load_page(self):
         if not self.next_url:
+            self._finish_tuning()
             return False
+        reason = self._budget_exhausted()
+        if reason is not None:
+            self._stop(reason)
+            return False
+        started = _clock()
+        if self._started is None:
+            self._started = started
+        url, params = self._request_limit(self.next_url, self.params)
         response = self.airship.request(
             method='GET',
             body=None,
-            url=self.next_url,
+            url=url,
             version=3,
-            params=self.params
+            params=params,
+            stream=self.stream
         )
         self.params = None
+        self.pages_read += 1
+        if self.stream:
+            self._page = {}
+            self._token_iter = self._stream_items(response, started)
+            return True
         self._page = response.json()
         check_url = self._page.get('next_page')
         if check_url == self.next_url:
+            self._finish_tuning()
             return False
         self.next_url = check_url
-        self._token_iter = iter(self._page[self.data_attribute])
+        items = self._page.pop(self.data_attribute)
+        if self.tuner is not None:
+            self._tune(len(items), _clock() - started, len(response.content))
+        if self.fields is not None:
+            items = [self._project(item) for item in items]
+        self._token_iter = iter(items)
         return True
+
+    def _stream_items(self, response, started):
+        current_url, self.next_url = self.next_url, None
+        received = [0]
+
+        def chunks():
+            for chunk in response.iter_content(self.stream_chunk_size):
+                received[0] += len(chunk)
+                yield chunk
+
+        items = JSONStreamDecoder(chunks()).items(
+            self.data_attribute, self._page
+        )
+        # Time spent waiting on the network and decoding, excluding the
+        # time the consumer takes between items.
+        elapsed = _clock() - started
+        count = 0
+        try:
+            while True:
+                resumed = _clock()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    elapsed += _clock() - resumed
+                    break
+                elapsed += _clock() - resumed
+                count += 1
+                if self.fields is not None:
+                    item = self._project(item)
+                yield item
+        finally:
+            response.close()
+        check_url = self._page.get('next_page')
+        if check_url != current_url:
+            self.next_url = check_url
+        if self.tuner is not None:
+            self._tune(count, elapsed, received[0])
+
+    def _tune(self, items, seconds, nbytes):
+        limit = self.tuner.record(
+            items, seconds, nbytes,
+            last=not self.next_url or self._final_page
+        )
+        if self.next_url:
+            self.next_url = set_query_param(self.next_url, 'limit', limit)
+
+    def _finish_tuning(self):
+        if self.tuner is None or self.page_size_report is not None:
+            return
+        self.page_size_report = self.tuner.report()
+        logger.info(
+            'Finished %s scan: %d items in %d pages at %s items/s; '
+            'settled on limit=%d',
+            type(self).__name__, self.tuner.items, self.tuner.pages,
+            '%.1f' % self.page_size_report['items_per_second']
+            if self.page_size_report['items_per_second'] else 'n/a',
+            self.tuner.limit
+        )
+
+    def _project(self, item):
+        # Dropping keys after decoding is cheaper than skipping them in a
+        # pure Python scanner, which would be slower than the C decoder.
+        return {key: item[key] for key in self.fields if key in item}
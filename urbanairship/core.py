@@ -3,7 +3,7 @@ import logging
 import requests
 
 from . import common, __about__
-from .push import Push, ScheduledPush, TemplatePush
+from .push import Push, PushBatch, ScheduledPush, TemplatePush
 
 
 logger = logging.getLogger('urbanairship')
@@ -19,12 +19,12 @@ class Airship(object):
         self.session.auth = (key, secret)
 
     def request(self, method, body, url,
-                content_type=None, version=None, params=None):
+                content_type=None, version=None, params=None, stream=False):
         return self._request(method, body, url,
-                             content_type, version, params)
+                             content_type, version, params, stream=stream)
 
     def _request(self, method, body, url, content_type=None,
-                 version=None, params=None, encoding=None):
+                 version=None, params=None, encoding=None, stream=False):
 
         headers = \
                 {'User-agent': 'UAPythonLib/{0}'.format(__about__.__version__)}
@@ -47,7 +47,8 @@ class Airship(object):
         )
 
         response = self.session.request(
-            method, url, data=body, params=params, headers=headers)
+            method, url, data=body, params=params, headers=headers,
+            stream=stream)
 
         logger.debug(
             'Received %s response. Headers:\n\t%s\nBody:\n\t%s',
@@ -56,7 +57,7 @@ class Airship(object):
                 '%s: %s' % (key, value) for (key, value)
                 in response.headers.items()
             ),
-            response.content
+            '<streamed>' if stream else response.content
         )
 
         if response.status_code == 401:
@@ -70,6 +71,10 @@ class Airship(object):
         """Create a Push notification."""
         return Push(self)
 
+    def create_push_batch(self, pushes=None):
+        """Create a PushBatch for sending many pushes together."""
+        return PushBatch(self, pushes)
+
     def create_scheduled_push(self):
         """Create a Scheduled Push notification."""
         return ScheduledPush(self)
@@ -4,6 +4,8 @@ from .devicelist import (
     DeviceTokenList,
     APIDList,
     DeviceInfo,
+    ChannelRecord,
+    DeviceRecord,
 )
 
 from .tag import (
@@ -41,3 +43,13 @@ from .static_lists import (
 from .locationfinder import (
     LocationFinder
 )
+
+from .mirror import (
+    ChannelMirror
+)
+
+from .sweep import (
+    ChannelSweep,
+    SweepRule,
+    SweepReport,
+)
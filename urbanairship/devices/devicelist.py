@@ -1,9 +1,30 @@
-import datetime
+import collections
 import logging
 from urbanairship import common
+from urbanairship.timestamps import LazyTimestamp
 
 logger = logging.getLogger('urbanairship')
 
+CHANNEL_FIELDS = (
+    'channel_id', 'device_type', 'installed', 'opt_in', 'background',
+    'push_address', 'address', 'named_user_id', 'alias', 'created',
+    'last_registration', 'tags', 'tag_groups', 'ios', 'web', 'open',
+)
+DEVICE_FIELDS = (
+    'active', 'alias', 'created', 'tags', 'device_token', 'apid',
+)
+TIMESTAMP_FIELDS = ('created', 'last_registration')
+
+# Timestamps are stored raw under a leading underscore and parsed on read.
+_CHANNEL_SLOTS = tuple(
+    '_' + name if name in TIMESTAMP_FIELDS else name
+    for name in CHANNEL_FIELDS
+)
+_DEVICE_SLOTS = tuple(
+    '_' + name if name in TIMESTAMP_FIELDS else name
+    for name in DEVICE_FIELDS
+)
+
 
 class ChannelInfo(object):
     """Information object for iOS, Android, Amazon, web, and open channels.
@@ -30,43 +51,30 @@ class ChannelInfo(object):
         ``open_platform_name``.
     :ivar web: Web notify specific information, e.g. ``subscription``.
 
+    Instances use ``__slots__`` so large listings can be held in memory;
+    payload keys not listed above are not kept. ``created`` and
+    ``last_registration`` are parsed from the payload on first access.
+
     """
 
-    address = None
-    alias = None
-    background = None
-    channel_id = None
-    created = None
-    device_type = None
-    installed = None
-    last_registration = None
-    opt_in = None
-    push_address = None
-    tag_groups = None
-    tags = None
-    ios = None
-    open = None
-    web = None
+    __slots__ = ('airship',) + _CHANNEL_SLOTS
+
+    created = LazyTimestamp('created')
+    last_registration = LazyTimestamp('last_registration')
 
     def __init__(self, airship):
         self.airship = airship
+        for name in _CHANNEL_SLOTS:
+            setattr(self, name, None)
 
     @classmethod
     def from_payload(cls, payload, device_key, airship):
         """Create based on results from a ChannelList iterator."""
-        obj = cls(airship)
+        obj = cls.__new__(cls)
+        obj.airship = airship
+        for name, slot in zip(CHANNEL_FIELDS, _CHANNEL_SLOTS):
+            setattr(obj, slot, payload.get(name))
         obj.channel_id = payload[device_key]
-        if airship:
-            obj.airship = airship
-        for key in payload:
-            if key in ('created', 'last_registration'):
-                try:
-                    payload[key] = datetime.datetime.strptime(
-                        payload[key], '%Y-%m-%dT%H:%M:%S'
-                    )
-                except:
-                    payload[key] = 'UNKNOWN'
-            setattr(obj, key, payload[key])
         return obj
 
     def lookup(self, channel_id):
@@ -103,39 +111,78 @@ class DeviceInfo(object):
 
     """
 
-    id = None
-    device_type = None
-    active = None
-    tags = None
-    alias = None
+    __slots__ = ('airship', 'id', 'device_type') + _DEVICE_SLOTS
+
+    created = LazyTimestamp('created')
 
     def __init__(self, airship):
         self.airship = airship
+        self.id = None
+        self.device_type = None
+        for name in _DEVICE_SLOTS:
+            setattr(self, name, None)
 
     @classmethod
     def from_payload(cls, payload, device_key, airship):
         """Create based on results from a DeviceTokenList or APIDList iterator.
 
         """
-        obj = cls(airship)
+        obj = cls.__new__(cls)
+        obj.airship = airship
         obj.id = payload[device_key]
         obj.device_type = device_key
-        for key in payload:
-            if key in 'created':
-                try:
-                    payload[key] = datetime.datetime.strptime(
-                        payload[key], '%Y-%m-%d %H:%M:%S'
-                    )
-                except:
-                    payload[key] = 'UNKNOWN'
-            setattr(obj, key, payload[key])
+        for name, slot in zip(DEVICE_FIELDS, _DEVICE_SLOTS):
+            setattr(obj, slot, payload.get(name))
         return obj
 
 
+class ChannelRecord(collections.namedtuple('ChannelRecord', CHANNEL_FIELDS)):
+    """Immutable, tuple-backed alternative to :py:class:`ChannelInfo`.
+
+    Has the same attribute names as :py:class:`ChannelInfo` but holds the raw
+    payload values: ``created`` and ``last_registration`` are left as the ISO
+    8601 strings returned by the API (see
+    :py:func:`urbanairship.timestamps.parse_timestamp`), and no ``airship``
+    reference is kept.
+    Use ``ChannelList(airship, records=True)`` to iterate over these.
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_payload(cls, payload, device_key, airship=None):
+        """Create based on results from a ChannelList iterator."""
+        return tuple.__new__(cls, map(payload.get, CHANNEL_FIELDS))
+
+
+class DeviceRecord(collections.namedtuple(
+        'DeviceRecord', ('id', 'device_type') + DEVICE_FIELDS)):
+    """Immutable, tuple-backed alternative to :py:class:`DeviceInfo`.
+
+    Holds the raw payload values; ``created`` is left as the string returned
+    by the API. Use ``DeviceTokenList(airship, records=True)`` or
+    ``APIDList(airship, records=True)`` to iterate over these.
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_payload(cls, payload, device_key, airship=None):
+        """Create based on results from a DeviceTokenList or APIDList iterator.
+
+        """
+        values = [payload[device_key], device_key]
+        values.extend(map(payload.get, DEVICE_FIELDS))
+        return tuple.__new__(cls, values)
+
+
 class DeviceTokenList(common.IteratorParent):
     """Iterator for listing all device tokens for this application.
 
     :ivar limit: Number of entries to fetch in each page request.
+    :ivar records: If True, yield :py:class:`DeviceRecord` tuples.
+    :ivar fields: Optional list of fields to keep, e.g. ``['tags']``; other
+        fields are dropped when each page is loaded and left as ``None``.
     :returns: Each ``next`` returns a :py:class:`DeviceInfo` object.
 
     """
@@ -143,16 +190,26 @@ class DeviceTokenList(common.IteratorParent):
     data_attribute = 'device_tokens'
     id_key = 'device_token'
     instance_class = DeviceInfo
+    record_class = DeviceRecord
 
-    def __init__(self, airship, limit=None):
+    def __init__(self, airship, limit=None, records=False, fields=None,
+                 **kwargs):
         params = {'limit': limit} if limit else {}
-        super(DeviceTokenList, self).__init__(airship, params)
+        if records:
+            self.instance_class = self.record_class
+        super(DeviceTokenList, self).__init__(
+            airship, params, fields, **kwargs
+        )
 
 
 class ChannelList(DeviceTokenList):
     """Iterator for listing all channels for this application.
 
     :ivar limit: Number of entries to fetch in each page request.
+    :ivar records: If True, yield :py:class:`ChannelRecord` tuples.
+    :ivar fields: Optional list of fields to keep, e.g.
+        ``['opt_in', 'tags']``; other fields are dropped when each page is
+        loaded and left as ``None``. ``channel_id`` is always kept.
     :returns: Each ``next`` returns a :py:class:`ChannelInfo` object.
 
     """
@@ -160,12 +217,16 @@ class ChannelList(DeviceTokenList):
     data_attribute = 'channels'
     id_key = 'channel_id'
     instance_class = ChannelInfo
+    record_class = ChannelRecord
 
 
 class APIDList(DeviceTokenList):
     """Iterator for listing all APIDs for this application.
 
     :ivar limit: Number of entries to fetch in each page request.
+    :ivar records: If True, yield :py:class:`DeviceRecord` tuples.
+    :ivar fields: Optional list of fields to keep, e.g. ``['tags']``; other
+        fields are dropped when each page is loaded and left as ``None``.
     :returns: Each ``next`` returns a :py:class:`DeviceInfo` object.
 
     """
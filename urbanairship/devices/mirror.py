@@ -0,0 +1,230 @@
+import json
+import logging
+import sqlite3
+
+from urbanairship.common import parse_bool
+from urbanairship.devices.devicelist import ChannelList, ChannelInfo
+
+logger = logging.getLogger('urbanairship')
+
+DEVICE_TAG_GROUP = 'device'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    device_type TEXT,
+    installed INTEGER,
+    opt_in INTEGER,
+    named_user_id TEXT,
+    last_registration TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channels_named_user_id
+    ON channels (named_user_id);
+CREATE TABLE IF NOT EXISTS channel_tags (
+    channel_id TEXT NOT NULL,
+    tag_group TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (channel_id, tag_group, tag)
+);
+CREATE INDEX IF NOT EXISTS channel_tags_tag
+    ON channel_tags (tag, tag_group);
+'''
+
+
+class ChannelMirror(object):
+    """A local SQLite copy of this application's channels.
+
+    Channel lookups against the mirror are local reads instead of
+    :py:meth:`ChannelInfo.lookup` requests. The database uses WAL journaling,
+    so readers in other processes see the previous contents until a
+    :py:meth:`rebuild` or :py:meth:`refresh` commits.
+
+    Device tags are stored in the ``'device'`` tag group. A mirror holds a
+    single SQLite connection and should not be shared between threads; open
+    one mirror per thread on the same path instead.
+
+    :param airship: An :py:class:`Airship` used for listing channels and
+        attached to the returned :py:class:`ChannelInfo` objects.
+    :param path: Path to the SQLite database file; created if missing.
+    :keyword list_options: Extra keyword arguments for :py:class:`ChannelList`,
+        e.g. ``{'limit': 1000, 'stream': True}``.
+
+    """
+
+    batch_size = 1000
+
+    def __init__(self, airship, path, list_options=None):
+        self.airship = airship
+        self.path = path
+        self.list_options = list_options or {}
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _channels(self):
+        return ChannelList(self.airship, **self.list_options).iter_payloads()
+
+    def rebuild(self):
+        """Replace the mirror's contents with a full channel listing.
+
+        :returns: Number of channels stored.
+
+        """
+        cursor = self.connection.cursor()
+        count = 0
+        cursor.execute('BEGIN')
+        try:
+            cursor.execute('DELETE FROM channel_tags')
+            cursor.execute('DELETE FROM channels')
+            rows, tags = [], []
+            for payload in self._channels():
+                rows.append(self._row(payload))
+                tags.extend(self._tag_rows(payload))
+                count += 1
+                if len(rows) >= self.batch_size:
+                    self._insert(cursor, rows, tags)
+                    rows, tags = [], []
+            self._insert(cursor, rows, tags)
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        logger.info('Rebuilt channel mirror %s with %d channels',
+                    self.path, count)
+        return count
+
+    def refresh(self):
+        """Update the mirror from a channel listing, writing only changes.
+
+        New channels are added, and stored channels are replaced when the
+        listed ``last_registration`` is newer than the stored one. Channels
+        deleted upstream, and changes made without a new registration, are
+        only picked up by :py:meth:`rebuild`.
+
+        :returns: Number of channels added or updated.
+
+        """
+        cursor = self.connection.cursor()
+        changed = 0
+        cursor.execute('BEGIN')
+        try:
+            for payload in self._channels():
+                row = self._row(payload)
+                cursor.execute(
+                    'INSERT OR IGNORE INTO channels '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    row
+                )
+                if not cursor.rowcount:
+                    cursor.execute(
+                        'UPDATE channels SET device_type = ?, installed = ?, '
+                        'opt_in = ?, named_user_id = ?, '
+                        'last_registration = ?, payload = ? '
+                        'WHERE channel_id = ? AND ('
+                        'last_registration IS NULL OR last_registration < ?)',
+                        row[1:] + (row[0], row[5])
+                    )
+                    if not cursor.rowcount:
+                        continue
+                    cursor.execute(
+                        'DELETE FROM channel_tags WHERE channel_id = ?',
+                        (row[0],)
+                    )
+                cursor.executemany(
+                    'INSERT OR IGNORE INTO channel_tags VALUES (?, ?, ?)',
+                    self._tag_rows(payload)
+                )
+                changed += 1
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        logger.info('Refreshed channel mirror %s; %d channels changed',
+                    self.path, changed)
+        return changed
+
+    def get(self, channel_id):
+        """Return the :py:class:`ChannelInfo` for a channel ID, or None."""
+        row = self.connection.execute(
+            'SELECT payload FROM channels WHERE channel_id = ?',
+            (channel_id.lower(),)
+        ).fetchone()
+        return self._channel(row[0]) if row else None
+
+    def by_named_user(self, named_user_id):
+        """Return the list of channels associated with a named user."""
+        return [
+            self._channel(row[0]) for row in self.connection.execute(
+                'SELECT payload FROM channels WHERE named_user_id = ?',
+                (named_user_id,)
+            )
+        ]
+
+    def channel_ids_with_tag(self, tag, group=DEVICE_TAG_GROUP):
+        """Yield the IDs of channels carrying a tag in a tag group."""
+        for row in self.connection.execute(
+                'SELECT channel_id FROM channel_tags '
+                'WHERE tag = ? AND tag_group = ?', (tag, group)):
+            yield row[0]
+
+    def count(self, tag=None, group=DEVICE_TAG_GROUP, opt_in=None):
+        """Count mirrored channels, optionally by tag and opt-in status."""
+        query = 'SELECT COUNT(*) FROM channels c'
+        clauses, params = [], []
+        if tag is not None:
+            query += ' JOIN channel_tags t ON t.channel_id = c.channel_id'
+            clauses.append('t.tag = ? AND t.tag_group = ?')
+            params.extend([tag, group])
+        if opt_in is not None:
+            clauses.append('c.opt_in = ?')
+            params.append(int(opt_in))
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        return self.connection.execute(query, params).fetchone()[0]
+
+    def _channel(self, payload):
+        return ChannelInfo.from_payload(
+            json.loads(payload), 'channel_id', self.airship
+        )
+
+    @staticmethod
+    def _row(payload):
+        def flag(value):
+            value = parse_bool(value)
+            return None if value is None else int(value)
+
+        return (
+            payload['channel_id'].lower(),
+            payload.get('device_type'),
+            flag(payload.get('installed')),
+            flag(payload.get('opt_in')),
+            payload.get('named_user_id'),
+            payload.get('last_registration'),
+            json.dumps(payload, separators=(',', ':')),
+        )
+
+    @staticmethod
+    def _tag_rows(payload):
+        channel_id = payload['channel_id'].lower()
+        rows = [
+            (channel_id, DEVICE_TAG_GROUP, tag)
+            for tag in payload.get('tags') or ()
+        ]
+        for group, tags in (payload.get('tag_groups') or {}).items():
+            rows.extend((channel_id, group, tag) for tag in tags)
+        return rows
+
+    @staticmethod
+    def _insert(cursor, rows, tags):
+        cursor.executemany(
+            'INSERT OR REPLACE INTO channels VALUES (?, ?, ?, ?, ?, ?, ?)',
+            rows
+        )
+        cursor.executemany(
+            'INSERT OR IGNORE INTO channel_tags VALUES (?, ?, ?)', tags
+        )
@@ -2,17 +2,54 @@ import json
 import logging
 
 from urbanairship import common
+from urbanairship.timestamps import LazyTimestamp
 
 logger = logging.getLogger('urbanairship')
 
+# Payload keys NamedUser keeps in attributes of its own.
+NAMED_USER_FIELDS = frozenset([
+    'named_user_id', 'tags', 'channels', 'created', 'last_modified',
+])
+
 
 class NamedUser(object):
-    """Perform various operations on a named user object"""
+    """Perform various operations on a named user object
+
+    :ivar named_user_id: The named user ID.
+    :ivar tags: Dictionary of tag group names to lists of tags, if any.
+    :ivar channels: List of channel objects associated with the named user,
+        if any.
+    :ivar created: UTC datetime when the named user was created.
+    :ivar last_modified: UTC datetime when the named user was last modified.
+
+    Other fields of a listed named user can be read as attributes too.
+
+    """
+
+    __slots__ = (
+        '_airship', 'named_user_id', 'tags', 'channels', '_created',
+        '_last_modified', '_extra',
+    )
+
+    created = LazyTimestamp('created')
+    last_modified = LazyTimestamp('last_modified')
 
     def __init__(self, airship, named_user_id=None):
 
         self._airship = airship
         self.named_user_id = named_user_id
+        self.tags = None
+        self.channels = None
+        self._created = None
+        self._last_modified = None
+        self._extra = {}
+
+    def __getattr__(self, name):
+        # Only called for names not found otherwise: unmodeled payload keys.
+        try:
+            return object.__getattribute__(self, '_extra')[name]
+        except (AttributeError, KeyError):
+            raise AttributeError(name)
 
     def associate(self, channel_id, device_type):
         """Associate a channel with a named user ID
@@ -121,22 +158,36 @@ class NamedUser(object):
         return response.json()
 
     @classmethod
-    def from_payload(cls, payload):
+    def from_payload(cls, payload, id_key=None, airship=None):
         """
         Create NamedUser object based on results from a NamedUserList iterator.
         :param payload: Payload used to create the NamedUser object
 
         """
-        for key in payload:
-            setattr(cls, key, payload[key])
-
-        return cls
+        obj = cls(airship, payload.get('named_user_id'))
+        obj.tags = payload.get('tags')
+        obj.channels = payload.get('channels')
+        obj._created = payload.get('created')
+        obj._last_modified = payload.get('last_modified')
+        obj._extra = dict(
+            (key, value) for key, value in payload.items()
+            if key not in NAMED_USER_FIELDS
+        )
+        return obj
 
 
 class NamedUserList(common.IteratorParent):
-    """Retrieves a list of NamedUsers"""
+    """Retrieves a list of NamedUsers
+
+    :ivar fields: Optional list of fields to keep for each named user, e.g.
+        ``['named_user_id', 'channels']``; other fields are dropped when each
+        page is loaded.
+
+    """
     next_url = common.NAMED_USER_URL
     data_attribute = 'named_users'
+    id_key = 'named_user_id'
+    instance_class = NamedUser
 
-    def __init__(self, airship):
-        super(NamedUserList, self).__init__(airship, None)
+    def __init__(self, airship, fields=None, **kwargs):
+        super(NamedUserList, self).__init__(airship, None, fields, **kwargs)
@@ -1,8 +1,8 @@
-import datetime
 import json
 import logging
 
 from urbanairship import common
+from urbanairship.timestamps import LazyTimestamp
 
 logger = logging.getLogger('urbanairship')
 
@@ -14,8 +14,8 @@ class OpenChannel(object):
     identifiers = None
     opt_in = None
     installed = None
-    created = None
-    last_registration = None
+    created = LazyTimestamp('created')
+    last_registration = LazyTimestamp('last_registration')
     tags = None
 
     def __init__(self, airship):
@@ -126,13 +126,6 @@ class OpenChannel(object):
                 obj.identifiers = payload['open'].get('identifiers', [])
                 continue
 
-            if key in ('created', 'last_registration'):
-                try:
-                    payload[key] = datetime.datetime.strptime(
-                        payload[key], '%Y-%m-%dT%H:%M:%S'
-                    )
-                except:
-                    payload[key] = 'UNKNOWN'
             setattr(obj, key, payload[key])
 
         return obj
@@ -1,12 +1,44 @@
 import json
 import logging
 
+import six
+
 from urbanairship import common
 
 logger = logging.getLogger('urbanairship')
 
 
+class _class_or_instance_method(object):
+    # Like classmethod, but bound to the instance when called on one.
+
+    def __init__(self, func):
+        self.func = func
+
+    def __get__(self, obj, objtype=None):
+        return six.create_bound_method(
+            self.func, objtype if obj is None else obj
+        )
+
+
+def _set_fields(target, payload):
+    for key in payload:
+        setattr(target, key, payload[key])
+
+
 class Segment(object):
+    """A segment of this application's audience.
+
+    :ivar id: Segment ID, set on creation or lookup.
+    :ivar display_name: Human readable name of the segment.
+    :ivar creation_date: Creation time, in milliseconds since the epoch.
+    :ivar modification_date: Last modification time, in milliseconds since
+        the epoch.
+    :ivar criteria: Audience selector defining the segment.
+
+    Other fields returned by the API are set as attributes as well.
+
+    """
+
     _airship = None
     url = None
 
@@ -46,9 +78,16 @@ class Segment(object):
 
         return response
 
-    @classmethod
-    def from_id(cls, airship, seg_id):
-        """Retrieve a segment based on the provided ID."""
+    @_class_or_instance_method
+    def from_id(self, airship, seg_id):
+        """Retrieve a segment based on the provided ID.
+
+        Called on a segment, such as ``segment.from_id(airship, seg_id)``,
+        the segment's fields are set; called on the class, as
+        ``Segment.from_id(airship, seg_id)``, the class attributes are set,
+        as in earlier releases.
+
+        """
 
         url = common.SEGMENTS_URL + seg_id
         response = airship._request(
@@ -59,19 +98,20 @@ class Segment(object):
         )
 
         payload = response.json()
-        cls.id = seg_id
-        cls.from_payload(payload)
+        self.id = seg_id
+        _set_fields(self, payload)
 
         return response
 
     @classmethod
-    def from_payload(cls, payload):
+    def from_payload(cls, payload, id_key=None, airship=None):
         """Create segment based on results from a SegmentList iterator."""
 
-        for key in payload:
-            setattr(cls, key, payload[key])
+        obj = cls()
+        obj._airship = airship
+        _set_fields(obj, payload)
 
-        return cls
+        return obj
 
     def update(self, airship):
         """Updates the segment associated with data in the current object."""
@@ -114,7 +154,9 @@ class SegmentList(common.IteratorParent):
     """
     next_url = common.SEGMENTS_URL
     data_attribute = 'segments'
+    id_key = 'id'
+    instance_class = Segment
 
-    def __init__(self, airship, limit=None):
+    def __init__(self, airship, limit=None, **kwargs):
         params = {'limit': limit} if limit else {}
-        super(SegmentList, self).__init__(airship, params)
+        super(SegmentList, self).__init__(airship, params, **kwargs)
@@ -1,13 +1,16 @@
 import json
 import gzip
 import collections
-import datetime
 from urbanairship import common
+from urbanairship.timestamps import LazyTimestamp
 
 CHUNK = 16 * 1024
 
 
 class StaticList(object):
+    created = LazyTimestamp('created')
+    last_updated = LazyTimestamp('last_updated')
+
     def __init__(self, airship, name):
         self.airship = airship
         self.name = name
@@ -74,10 +77,6 @@ class StaticList(object):
     def from_payload(cls, payload, airship):
         obj = cls(airship, payload['name'])
         for key in payload:
-            if key in 'created' or key in 'last_updated':
-                payload[key] = datetime.datetime.strptime(
-                    payload[key], '%Y-%m-%dT%H:%M:%S'
-                )
             setattr(obj, key, payload[key])
         return obj
 
@@ -103,8 +102,8 @@ class StaticLists(common.IteratorParent):
     next_url = common.LISTS_URL
     data_attribute = 'lists'
 
-    def __init__(self, airship):
-        super(StaticLists, self).__init__(airship, None)
+    def __init__(self, airship, **kwargs):
+        super(StaticLists, self).__init__(airship, None, **kwargs)
 
 
 class Buffer(object):
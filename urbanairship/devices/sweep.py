@@ -0,0 +1,218 @@
+import datetime
+import logging
+
+from urbanairship import common
+from urbanairship.common import parse_bool
+from urbanairship.devices.channel_uninstall import ChannelUninstall
+from urbanairship.devices.devicelist import ChannelList
+from urbanairship.timestamps import parse_timestamp
+
+logger = logging.getLogger('urbanairship')
+
+# Maximum channels per ChannelUninstall.uninstall call.
+UNINSTALL_BATCH_SIZE = 200
+
+
+class SweepRule(object):
+    """Flag channels that match every given condition.
+
+    Conditions left as None are not checked.
+
+    :param name: Rule name, used in :py:class:`SweepReport` counts.
+    :keyword installed: Match channels whose ``installed`` equals this.
+    :keyword opt_in: Match channels whose ``opt_in`` equals this.
+    :keyword inactive_days: Match channels whose ``last_registration`` is at
+        least this many days old. Channels without a parseable
+        ``last_registration`` do not match.
+    :keyword device_types: Match only channels of these device types.
+
+    """
+
+    def __init__(self, name, installed=None, opt_in=None,
+                 inactive_days=None, device_types=None):
+        if installed is None and opt_in is None and inactive_days is None:
+            raise ValueError(
+                'A sweep rule needs installed, opt_in or inactive_days'
+            )
+        self.name = name
+        self.installed = installed
+        self.opt_in = opt_in
+        self.inactive_days = inactive_days
+        self.device_types = device_types
+
+    def matches(self, payload, now):
+        """Return True if a raw channel payload matches this rule."""
+        if self.device_types is not None and \
+                payload.get('device_type') not in self.device_types:
+            return False
+        for field in ('installed', 'opt_in'):
+            expected = getattr(self, field)
+            if expected is not None and \
+                    parse_bool(payload.get(field)) is not bool(expected):
+                return False
+        if self.inactive_days is not None:
+            try:
+                last_registration = parse_timestamp(
+                    payload.get('last_registration')
+                )
+            except ValueError:
+                return False
+            age = now - last_registration
+            if age < datetime.timedelta(days=self.inactive_days):
+                return False
+        return True
+
+
+class SweepReport(object):
+    """Outcome of a :py:meth:`ChannelSweep.run`.
+
+    :ivar dry_run: Whether uninstalls were skipped.
+    :ivar scanned: Number of channels listed.
+    :ivar flagged: Number of channels matching a rule.
+    :ivar by_rule: Dict of rule name to flagged channel count.
+    :ivar by_device_type: Dict of device type to flagged channel count.
+    :ivar batches: Number of uninstall batches produced.
+    :ivar uninstalled: Number of channels uninstalled.
+    :ivar failures: List of ``(batch, exception)`` for failed uninstalls.
+
+    """
+
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.scanned = 0
+        self.flagged = 0
+        self.by_rule = {}
+        self.by_device_type = {}
+        self.batches = 0
+        self.uninstalled = 0
+        self.failures = []
+
+    def __str__(self):
+        return (
+            '{0}scanned {1} channels, flagged {2} in {3} batches, '
+            'uninstalled {4}, {5} failed batches'.format(
+                'Dry run: ' if self.dry_run else '', self.scanned,
+                self.flagged, self.batches, self.uninstalled,
+                len(self.failures)
+            )
+        )
+
+
+class ChannelSweep(object):
+    """Stream a channel listing and uninstall channels matching rules.
+
+    Channels are flagged by the first :py:class:`SweepRule` they match and
+    grouped into batches of up to 200, the most
+    :py:meth:`ChannelUninstall.uninstall` accepts.
+
+    >>> sweep = ChannelSweep(airship, [
+    ...     SweepRule('uninstalled', installed=False),
+    ...     SweepRule('dormant', opt_in=False, inactive_days=180),
+    ... ]) # doctest: +SKIP
+    >>> print(sweep.run()) # doctest: +SKIP
+    Dry run: scanned 1204332 channels, flagged 98211 in 492 batches, ...
+    >>> sweep.run(dry_run=False, channels_per_second=1000) # doctest: +SKIP
+
+    :param airship: An :py:class:`Airship`.
+    :param rules: List of :py:class:`SweepRule`.
+    :keyword list_options: Extra keyword arguments for :py:class:`ChannelList`,
+        e.g. ``{'stream': True}``.
+    :keyword now: UTC ``datetime`` that channel ages are measured from;
+        defaults to the time the sweep starts.
+
+    """
+
+    batch_size = UNINSTALL_BATCH_SIZE
+
+    def __init__(self, airship, rules, list_options=None, now=None):
+        if not rules:
+            raise ValueError('At least one sweep rule is required')
+        self.airship = airship
+        self.rules = list(rules)
+        self.list_options = list_options or {}
+        self.now = now
+
+    def flagged(self, report=None):
+        """Yield ``(payload, rule)`` for each listed channel matching a rule.
+
+        :keyword report: Optional :py:class:`SweepReport` to tally into.
+
+        """
+        now = self.now or datetime.datetime.utcnow()
+        channels = ChannelList(self.airship, **self.list_options)
+        for payload in channels.iter_payloads():
+            if report is not None:
+                report.scanned += 1
+            for rule in self.rules:
+                if rule.matches(payload, now):
+                    if report is not None:
+                        report.flagged += 1
+                        report.by_rule[rule.name] = (
+                            report.by_rule.get(rule.name, 0) + 1
+                        )
+                        device_type = payload.get('device_type')
+                        report.by_device_type[device_type] = (
+                            report.by_device_type.get(device_type, 0) + 1
+                        )
+                    yield payload, rule
+                    break
+
+    def batches(self, report=None):
+        """Yield lists of channels ready for
+        :py:meth:`ChannelUninstall.uninstall`.
+
+        Each list holds up to 200 ``{'channel_id', 'device_type'}`` dicts.
+
+        """
+        batch = []
+        for payload, _ in self.flagged(report):
+            batch.append({
+                'channel_id': payload['channel_id'],
+                'device_type': payload.get('device_type'),
+            })
+            if len(batch) >= self.batch_size:
+                if report is not None:
+                    report.batches += 1
+                yield batch
+                batch = []
+        if batch:
+            if report is not None:
+                report.batches += 1
+            yield batch
+
+    def run(self, dry_run=True, channels_per_second=None):
+        """Sweep the channel listing.
+
+        With ``dry_run`` (the default), nothing is uninstalled and the report
+        shows what would be. Otherwise each batch is uninstalled as soon as
+        it is full. A failed batch is recorded in the report and the sweep
+        continues.
+
+        :keyword dry_run: If False, uninstall flagged channels.
+        :keyword channels_per_second: Limit the average uninstall rate.
+        :returns: A :py:class:`SweepReport`.
+
+        """
+        report = SweepReport(dry_run)
+        uninstaller = ChannelUninstall(self.airship)
+        limiter = (
+            common.RateLimiter(channels_per_second)
+            if channels_per_second and not dry_run else None
+        )
+        for batch in self.batches(report):
+            if dry_run:
+                continue
+            if limiter is not None:
+                limiter.wait(len(batch))
+            try:
+                uninstaller.uninstall(batch)
+            except common.AirshipFailure as exc:
+                logger.error(
+                    'Failed to uninstall a batch of %d channels: %s',
+                    len(batch), exc
+                )
+                report.failures.append((batch, exc))
+            else:
+                report.uninstalled += len(batch)
+        logger.info('Channel sweep: %s', report)
+        return report
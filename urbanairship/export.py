@@ -0,0 +1,333 @@
+import gzip
+import json
+import logging
+import os
+
+import six
+
+from urbanairship.common import parse_bool
+from urbanairship.timestamps import parse_timestamp
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger('urbanairship')
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_CHECKPOINT_EVERY = 10000
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError(
+            'pyarrow is required for Arrow and Parquet export; '
+            'install it with "pip install pyarrow"'
+        )
+
+
+def channel_schema():
+    """Return the Arrow schema used for channel exports.
+
+    ``created`` and ``last_registration`` are UTC timestamps; ``tag_groups``
+    maps each group name to its list of tags; ``ios``, ``web`` and ``open``
+    are structs holding the platform specific channel information.
+
+    """
+    _require_pyarrow()
+    pa = pyarrow
+    return pa.schema([
+        ('channel_id', pa.string()),
+        ('device_type', pa.string()),
+        ('installed', pa.bool_()),
+        ('opt_in', pa.bool_()),
+        ('background', pa.bool_()),
+        ('push_address', pa.string()),
+        ('address', pa.string()),
+        ('named_user_id', pa.string()),
+        ('alias', pa.string()),
+        ('created', pa.timestamp('s')),
+        ('last_registration', pa.timestamp('s')),
+        ('tags', pa.list_(pa.string())),
+        ('tag_groups', pa.map_(pa.string(), pa.list_(pa.string()))),
+        ('ios', pa.struct([
+            ('badge', pa.int64()),
+            ('quiettime', pa.struct([
+                ('start', pa.string()),
+                ('end', pa.string()),
+            ])),
+            ('tz', pa.string()),
+        ])),
+        ('web', pa.struct([
+            ('subscription', pa.struct([
+                ('auth', pa.string()),
+                ('p256dh', pa.string()),
+            ])),
+        ])),
+        ('open', pa.struct([
+            ('open_platform_name', pa.string()),
+            ('identifiers', pa.map_(pa.string(), pa.string())),
+        ])),
+    ])
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    try:
+        return parse_timestamp(value)
+    except ValueError:
+        return None
+
+
+def _string(value):
+    if value is None or isinstance(value, six.string_types):
+        return value
+    return six.text_type(value)
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _string_map(value):
+    if not value:
+        return None
+    return [(_string(k), _string(v)) for k, v in value.items()]
+
+
+def _tag_groups(value):
+    if not value:
+        return None
+    return [(group, list(tags)) for group, tags in value.items()]
+
+
+def _ios(value):
+    if not value:
+        return None
+    return {
+        'badge': _int(value.get('badge')),
+        'quiettime': value.get('quiettime'),
+        'tz': _string(value.get('tz')),
+    }
+
+
+def _open(value):
+    if not value:
+        return None
+    return {
+        'open_platform_name': value.get('open_platform_name'),
+        'identifiers': _string_map(value.get('identifiers')),
+    }
+
+
+# Column name, converter from the raw payload value.
+_CHANNEL_COLUMNS = (
+    ('channel_id', _string),
+    ('device_type', _string),
+    ('installed', parse_bool),
+    ('opt_in', parse_bool),
+    ('background', parse_bool),
+    ('push_address', _string),
+    ('address', _string),
+    ('named_user_id', _string),
+    ('alias', _string),
+    ('created', _timestamp),
+    ('last_registration', _timestamp),
+    ('tags', lambda value: value),
+    ('tag_groups', _tag_groups),
+    ('ios', _ios),
+    ('web', lambda value: value or None),
+    ('open', _open),
+)
+
+
+def _channel_batch(payloads, schema):
+    columns = [
+        pyarrow.array(
+            [convert(payload.get(name)) for payload in payloads],
+            type=schema.field(name).type
+        )
+        for name, convert in _CHANNEL_COLUMNS
+    ]
+    return pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def channel_record_batches(channels, batch_size=DEFAULT_BATCH_SIZE):
+    """Convert a channel listing into Arrow record batches.
+
+    Only ``batch_size`` raw channel payloads are held at a time, and no
+    :py:class:`ChannelInfo` objects are built.
+
+    :param channels: A :py:class:`ChannelList`, or any iterable of raw
+        channel payload dictionaries.
+    :keyword batch_size: Number of channels per record batch.
+    :returns: Generator of ``pyarrow.RecordBatch`` objects using
+        :py:func:`channel_schema`.
+
+    """
+    _require_pyarrow()
+    schema = channel_schema()
+    payloads = getattr(channels, 'iter_payloads', lambda: channels)()
+    batch = []
+    for payload in payloads:
+        batch.append(payload)
+        if len(batch) >= batch_size:
+            yield _channel_batch(batch, schema)
+            batch = []
+    if batch:
+        yield _channel_batch(batch, schema)
+
+
+def export_channels_parquet(channels, path, batch_size=DEFAULT_BATCH_SIZE,
+                            rows_per_file=None, compression='snappy'):
+    """Stream a channel listing into one or more Parquet files.
+
+    Each record batch is written as a row group as soon as it is full, so
+    memory use is bounded by ``batch_size`` regardless of listing size.
+
+    >>> channels = ua.ChannelList(airship, stream=True) # doctest: +SKIP
+    >>> export_channels_parquet(
+    ...     channels, 'channels-{0:04d}.parquet',
+    ...     rows_per_file=1000000) # doctest: +SKIP
+    ['channels-0000.parquet', 'channels-0001.parquet', ...]
+
+    :param channels: A :py:class:`ChannelList`, or any iterable of raw
+        channel payload dictionaries.
+    :param path: Output file path. With ``rows_per_file``, a format string
+        that is given the zero based file number, e.g.
+        ``'channels-{0:04d}.parquet'``.
+    :keyword batch_size: Number of channels per record batch and row group.
+    :keyword rows_per_file: Start a new file after roughly this many rows.
+        Files are split on batch boundaries.
+    :keyword compression: Parquet compression codec.
+    :returns: List of the file paths written.
+
+    """
+    _require_pyarrow()
+    schema = channel_schema()
+    paths = []
+    writer = None
+    file_rows = 0
+    total_rows = 0
+    try:
+        for batch in channel_record_batches(channels, batch_size):
+            if writer is None or (
+                    rows_per_file and file_rows >= rows_per_file):
+                if writer is not None:
+                    writer.close()
+                file_path = (
+                    path.format(len(paths)) if rows_per_file else path
+                )
+                writer = pyarrow.parquet.ParquetWriter(
+                    file_path, schema, compression=compression
+                )
+                paths.append(file_path)
+                file_rows = 0
+            writer.write_table(pyarrow.Table.from_batches([batch], schema))
+            file_rows += batch.num_rows
+            total_rows += batch.num_rows
+        if writer is None:
+            file_path = path.format(0) if rows_per_file else path
+            writer = pyarrow.parquet.ParquetWriter(
+                file_path, schema, compression=compression
+            )
+            paths.append(file_path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger.info(
+        'Exported %d channels to %d Parquet file(s)', total_rows, len(paths)
+    )
+    return paths
+
+
+def _ndjson_writer(raw, compress):
+    if compress is None:
+        return raw
+    if compress == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb')
+    if compress == 'zstd':
+        if zstandard is None:
+            raise ImportError(
+                'zstandard is required for zstd compression; '
+                'install it with "pip install zstandard"'
+            )
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    raise ValueError(
+        'compress must be None, "gzip" or "zstd", not %r' % (compress,)
+    )
+
+
+def export_ndjson(iterator, path, compress=None,
+                  checkpoint_every=DEFAULT_CHECKPOINT_EVERY, fsync=False,
+                  progress=None):
+    """Write each item of a listing to a newline delimited JSON file.
+
+    Items are written as raw API payloads as soon as they are read from
+    each page, so memory use does not grow with the size of the listing.
+    Pass a listing created with ``stream=True`` to also avoid holding whole
+    pages.
+
+    >>> export_ndjson(
+    ...     ua.NamedUserList(airship, stream=True), 'named_users.ndjson.gz',
+    ...     compress='gzip', fsync=True) # doctest: +SKIP
+    1250000
+
+    :param iterator: Any paginated listing, such as :py:class:`ChannelList`
+        or :py:class:`NamedUserList`, or an iterable of JSON serializable
+        items.
+    :param path: Output file path.
+    :keyword compress: ``None``, ``'gzip'`` or ``'zstd'``. zstd requires the
+        ``zstandard`` package (``pip install urbanairship[zstd]``).
+    :keyword checkpoint_every: Flush the output every this many items.
+    :keyword fsync: If True, also ``fsync`` the file at each checkpoint, so
+        a crashed export keeps everything up to the last checkpoint.
+    :keyword progress: Callable given the number of items written so far,
+        at each checkpoint and once when the export finishes.
+    :returns: Number of items written.
+
+    """
+    if checkpoint_every < 1:
+        raise ValueError('checkpoint_every must be a positive integer')
+    items = getattr(iterator, 'iter_payloads', lambda: iterator)()
+    count = 0
+    with open(path, 'wb') as raw:
+        writer = _ndjson_writer(raw, compress)
+
+        def checkpoint():
+            raw.flush()
+            if fsync:
+                os.fsync(raw.fileno())
+            if progress is not None:
+                progress(count)
+
+        try:
+            for item in items:
+                writer.write(
+                    json.dumps(item, separators=(',', ':')).encode('utf-8')
+                )
+                writer.write(b'\n')
+                count += 1
+                if count % checkpoint_every == 0:
+                    if writer is not raw:
+                        writer.flush()
+                    checkpoint()
+        finally:
+            if writer is not raw:
+                writer.close()
+        checkpoint()
+
+    logger.info('Exported %d items to %s', count, path)
+    return count
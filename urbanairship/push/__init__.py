@@ -1,4 +1,28 @@
-from .core import Push, ScheduledPush, TemplatePush
+from .core import (
+    Push,
+    PushBatch,
+    RenderedPush,
+    ScheduledPush,
+    TemplatePush,
+)
+
+from .compiled import CompiledPush, Variable
+
+from .sender import PushSender, SendResult
+
+from .fanout import chunk_push, coalesce_pushes
+
+from .validation import (
+    PayloadError,
+    validate,
+    validate_push,
+    validate_scheduled_push,
+    validate_pipeline,
+)
+
+from .size import PayloadSize, payload_sizes, oversized, truncate_alerts
+
+from .outbox import OutboxDispatcher, OutboxEntry, PushOutbox
 
 from .audience import (
     ios_channel,
@@ -15,6 +39,9 @@ from .audience import (
     and_,
     or_,
     not_,
+    optimize_audience,
+    normalize_channel_ids,
+    normalize_device_tokens,
     location,
     recent_date,
     absolute_date,
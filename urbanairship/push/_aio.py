@@ -0,0 +1,55 @@
+"""asyncio support for :py:class:`PushSender`; Python 3.6 or later only.
+
+The module name starts with an underscore so that test collection, which
+imports every module for doctests, skips it on Python 2.
+"""
+import asyncio
+import concurrent.futures
+
+
+async def _aiter(pushes):
+    if hasattr(pushes, '__aiter__'):
+        async for push in pushes:
+            yield push
+    else:
+        for push in pushes:
+            yield push
+
+
+async def send_async(sender, pushes):
+    """Async generator behind :py:meth:`PushSender.send_async`."""
+    try:
+        loop = asyncio.get_running_loop()
+    except AttributeError:
+        # Python 3.6; inside a coroutine this is the running loop.
+        loop = asyncio.get_event_loop()
+    executor = concurrent.futures.ThreadPoolExecutor(sender.max_in_flight)
+    pending = set()
+    error = None
+    try:
+        try:
+            async for push in _aiter(pushes):
+                if len(pending) >= sender.max_in_flight:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield future.result()
+                pending.add(
+                    loop.run_in_executor(executor, sender.send_one, push)
+                )
+        except Exception as exc:
+            # Finish and yield the pushes in flight before raising.
+            error = exc
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield future.result()
+        if error is not None:
+            raise error
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -1,10 +1,20 @@
+import json
 import re
 
+import six
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 DEVICE_TOKEN_FORMAT = re.compile(r'^[0-9a-fA-F]{64}$')
 UUID_FORMAT = re.compile(
     r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}'
     r'-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
 
+UUID_DASHES = (8, 13, 18, 23)
+
 
 # Value selectors; device IDs, aliases, tags, etc.
 
@@ -81,6 +91,127 @@ def segment(segment):
     return {'segment': segment}
 
 
+# Bulk validation of many device IDs
+
+_HEX_DIGITS = b'0123456789abcdefABCDEF'
+# IDs checked together; a failing batch is halved until the invalid IDs
+# are found.
+BULK_BATCH_SIZE = 4096
+_MIN_BULK_BATCH = 16
+
+
+def _lower(value):
+    return value.lower()
+
+
+def _upper(value):
+    return value.upper()
+
+
+def _check_batch(ids, length, dashes):
+    # Join the IDs into one string and check its structure with a few
+    # string operations that run in C, instead of one match per ID.
+    count = len(ids)
+    step = length + 1
+    try:
+        joined = u'\n'.join(ids)
+        data = joined.encode('ascii')
+    except (TypeError, UnicodeError):
+        return None
+    # Only hex digits, dashes and newlines, with the dashes and newlines
+    # where each ID's dashes and separator belong.
+    if len(data) != step * count - 1 or \
+            data.translate(None, _HEX_DIGITS + b'\n') != \
+            b'-' * (len(dashes) * count) or \
+            data[length::step] != b'\n' * (count - 1):
+        return None
+    for position in dashes:
+        if data[position::step] != b'-' * count:
+            return None
+    return joined
+
+
+def _bulk(ids, pattern, normalize, length, dashes):
+    dtype = getattr(ids, 'dtype', None)
+    is_array = dtype is not None and hasattr(ids, 'tolist')
+    is_bytes = is_array and dtype.kind == 'S'
+    if is_array:
+        ids = ids.tolist()
+        if is_bytes:
+            # Latin-1 maps every byte to one character, so non-ASCII bytes
+            # decode without error and fail the checks below.
+            ids = [value.decode('latin-1') for value in ids]
+    elif not isinstance(ids, list):
+        ids = list(ids)
+    normalized = []
+    invalid = []
+    match = pattern.match
+    pending = [(start, min(start + BULK_BATCH_SIZE, len(ids)))
+               for start in range(0, len(ids), BULK_BATCH_SIZE)]
+    pending.reverse()
+    while pending:
+        start, end = pending.pop()
+        if end - start >= _MIN_BULK_BATCH:
+            joined = _check_batch(ids[start:end], length, dashes)
+            batch = None if joined is None else normalize(joined).split(u'\n')
+            # An ID containing a newline would split into extra items.
+            if batch is not None and len(batch) == end - start:
+                normalized.extend(batch)
+                invalid.extend([False] * (end - start))
+                continue
+            middle = (start + end) // 2
+            pending.append((middle, end))
+            pending.append((start, middle))
+            continue
+        for value in ids[start:end]:
+            if isinstance(value, six.string_types) and match(value):
+                normalized.append(normalize(value.strip()))
+                invalid.append(False)
+            else:
+                normalized.append(value)
+                invalid.append(True)
+    if is_bytes:
+        normalized = [value.encode('latin-1') for value in normalized]
+    if is_array:
+        return (numpy.array(normalized, dtype=dtype),
+                numpy.array(invalid, dtype=bool))
+    return normalized, invalid
+
+
+def normalize_channel_ids(channel_ids):
+    """Validate and normalize many channel IDs at once.
+
+    Each ID is checked and normalized as by :py:func:`ios_channel` and the
+    other channel selectors: it must be a UUID, and is lower cased. IDs are
+    checked in large batches with a few string operations each, about twice
+    as fast as one regular expression match per ID; batches with invalid
+    IDs are narrowed down to find them.
+
+    >>> normalize_channel_ids(
+    ...     ['9C36E8C7-5A73-47C0-9716-99FD3D4197D5', 'bogus'])
+    (['9c36e8c7-5a73-47c0-9716-99fd3d4197d5', 'bogus'], [False, True])
+
+    :param channel_ids: Sequence of channel IDs, or a numpy string array.
+        Bytes arrays, such as dtype ``S36``, are read as ASCII.
+    :returns: Tuple of the normalized IDs, with invalid entries left as
+        given, and a mask that is True for invalid entries. For a numpy
+        array, both are numpy arrays, the IDs with the input's dtype;
+        otherwise, both are lists.
+
+    """
+    return _bulk(channel_ids, UUID_FORMAT, _lower, 36, UUID_DASHES)
+
+
+def normalize_device_tokens(device_tokens):
+    """Validate and normalize many iOS device tokens at once.
+
+    Like :py:func:`normalize_channel_ids`, with the checks and upper case
+    normalization of :py:func:`device_token`.
+
+    """
+    return _bulk(device_tokens, DEVICE_TOKEN_FORMAT, _upper, 64, ())
+
+
 # Compound selectors
 
 
@@ -114,6 +245,87 @@ def not_(child):
     return {'not': child}
 
 
+_DUAL = {'and': 'or', 'or': 'and'}
+
+
+def _key(selector):
+    return json.dumps(selector, sort_keys=True, separators=(',', ':'))
+
+
+def _node(operator, children):
+    if len(children) == 1:
+        return children[0]
+    return {operator: children}
+
+
+def _terms(selector, operator):
+    # Children of ``selector`` under ``operator``, keyed canonically.
+    if isinstance(selector, dict) and list(selector) == [operator]:
+        return dict((_key(child), child) for child in selector[operator])
+    return {_key(selector): selector}
+
+
+def _optimize_compound(operator, children):
+    flat = {}
+    for child in children:
+        child = optimize_audience(child)
+        flat.update(_terms(child, operator))
+    children = [flat[key] for key in sorted(flat)]
+    if len(children) < 2:
+        return _node(operator, children)
+
+    # Factor terms shared by every child: (a & b) | (a & c) == a & (b | c),
+    # and absorb children that are only shared terms: a | (a & b) == a.
+    dual = _DUAL[operator]
+    terms = [_terms(child, dual) for child in children]
+    common = set(terms[0]).intersection(*terms[1:])
+    if not common:
+        return {operator: children}
+    shared = [terms[0][key] for key in sorted(common)]
+    rests = []
+    for child_terms in terms:
+        rest = [child_terms[key] for key in sorted(child_terms)
+                if key not in common]
+        if not rest:
+            return _node(dual, shared)
+        rests.append(_node(dual, rest))
+    return optimize_audience({dual: shared + [{operator: rests}]})
+
+
+def optimize_audience(selector):
+    """Rewrite an audience selector into a smaller, canonical equivalent.
+
+    Nested ``and_`` and ``or_`` selectors of the same kind are flattened,
+    duplicate children removed, double ``not_`` selectors folded and
+    children sorted. Terms common to every child of a compound selector are
+    factored out, and children absorbed by a shared term are dropped.
+    Equivalent selectors built in different orders optimize to the same
+    result, so its JSON encoding can be used as a cache key. The selector
+    passed in is not modified.
+
+    >>> optimize_audience(
+    ...     or_(or_(tag('a'), tag('a')), not_(not_(tag('b')))))
+    {'or': [{'tag': 'a'}, {'tag': 'b'}]}
+    >>> optimize_audience(
+    ...     or_(and_(tag('a'), tag('b')), and_(tag('c'), tag('a'))))
+    {'and': [{'or': [{'tag': 'b'}, {'tag': 'c'}]}, {'tag': 'a'}]}
+
+    :param selector: An audience selector, or ``'all'``.
+
+    """
+    if not isinstance(selector, dict) or len(selector) != 1:
+        return selector
+    operator, value = list(selector.items())[0]
+    if operator == 'not':
+        child = optimize_audience(value)
+        if isinstance(child, dict) and list(child) == ['not']:
+            return child['not']
+        return {'not': child}
+    if operator in _DUAL and isinstance(value, list) and value:
+        return _optimize_compound(operator, value)
+    return selector
+
+
 # Location selectors
 
 def location(date=None, **kwargs):
@@ -0,0 +1,142 @@
+import json
+import re
+
+import six
+
+from urbanairship.push.core import Push, RenderedPush
+
+# Unicode noncharacters delimiting variable names inside placeholder
+# strings; they do not occur in real notification text.
+_START = u'\ufdd0'
+_END = u'\ufdd1'
+VALID_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+# A string token in json.dumps output, a placeholder that is a whole
+# string, and placeholders or escapes within a string; escapes are matched
+# so that an escaped backslash or quote is never read as part of one.
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_WHOLE = re.compile(r'"\\ufdd0([A-Za-z0-9_]+)\\ufdd1"$')
+_ENCODED = re.compile(r'\\ufdd0([A-Za-z0-9_]+)\\ufdd1|\\.')
+
+_encode_string = json.encoder.encode_basestring_ascii
+_encode_value = json.JSONEncoder(separators=(',', ':')).encode
+
+
+class Variable(six.text_type):
+    """Placeholder for a per-recipient value in a :py:class:`CompiledPush`.
+
+    A variable is a string, so it passes the checks of the payload helpers
+    and can be concatenated with text, as in ``'Hi ' + Variable('name')``.
+    A variable used as a whole value, such as ``push.audience``, may be
+    replaced by any JSON value; one used inside a string is replaced by text.
+
+    :param name: Variable name; letters, digits and underscores.
+
+    """
+
+    def __new__(cls, name):
+        if not isinstance(name, six.string_types) or \
+                not VALID_NAME.match(name):
+            raise ValueError('Invalid variable name: %r' % (name,))
+        obj = six.text_type.__new__(cls, _START + name + _END)
+        obj.name = name
+        return obj
+
+    def __repr__(self):
+        return 'Variable(%r)' % (self.name,)
+
+
+class CompiledPush(object):
+    """A push encoded once, with :py:class:`Variable` placeholders filled in
+    per recipient.
+
+    The push is built with the usual payload helpers, which validate it,
+    and encoded to JSON when compiled. Rendering only encodes the variable
+    values and joins them with the pre-encoded fragments between them,
+    which is much cheaper than building and encoding a full payload for
+    every recipient.
+
+    >>> push = airship.create_push() # doctest: +SKIP
+    >>> push.audience = ua.Variable('audience') # doctest: +SKIP
+    >>> push.notification = ua.notification(
+    ...     alert='Your order ' + ua.Variable('order') + ' has shipped',
+    ...     ios=ua.ios(badge=1)) # doctest: +SKIP
+    >>> push.device_types = ua.device_types('ios') # doctest: +SKIP
+    >>> compiled = ua.CompiledPush(push) # doctest: +SKIP
+    >>> compiled.bind(audience=ua.named_user('user-1'),
+    ...               order='A-1001').send() # doctest: +SKIP
+
+    :param push: A :py:class:`Push` or push payload dictionary containing
+        variables.
+    :keyword airship: :py:class:`Airship` to send rendered pushes with;
+        defaults to that of ``push``.
+    :ivar variables: Names of the variables to supply when rendering.
+
+    """
+
+    def __init__(self, push, airship=None):
+        if isinstance(push, Push):
+            airship = airship or push._airship
+            payload = push.payload
+        elif isinstance(push, dict):
+            payload = push
+        else:
+            raise TypeError('Only Push objects and push payloads can be '
+                            'compiled')
+        for key in ('audience', 'device_types'):
+            if payload.get(key) is None:
+                raise ValueError('Push must have %s set' % key)
+        if payload.get('notification') is None and \
+                payload.get('message') is None:
+            raise ValueError('Push must have a notification or message')
+        self._airship = airship
+        self._fragments = []
+        self._slots = []
+        encoded = json.dumps(payload, separators=(',', ':'))
+        position = 0
+        for token in _STRING.finditer(encoded):
+            start, end = token.span()
+            match = _WHOLE.match(token.group())
+            if match:
+                self._fragments.append(encoded[position:start])
+                self._slots.append((match.group(1), True))
+                position = end
+                continue
+            for match in _ENCODED.finditer(encoded, start + 1, end - 1):
+                if match.group(1) is None:
+                    continue
+                self._fragments.append(encoded[position:match.start()])
+                self._slots.append((match.group(1), False))
+                position = match.end()
+        self._fragments.append(encoded[position:])
+        self.variables = frozenset(name for name, _ in self._slots)
+
+    def render(self, **values):
+        """Return the encoded payload with the given variable values.
+
+        :returns: The JSON payload, as bytes.
+        :raises ValueError: A variable has no value.
+
+        """
+        parts = [self._fragments[0]]
+        for (name, whole), fragment in zip(self._slots, self._fragments[1:]):
+            try:
+                value = values[name]
+            except KeyError:
+                raise ValueError('No value for variable %r' % name)
+            if not whole:
+                if not isinstance(value, six.string_types):
+                    value = six.text_type(value)
+                parts.append(_encode_string(value)[1:-1])
+            elif isinstance(value, six.string_types):
+                parts.append(_encode_string(value))
+            else:
+                parts.append(_encode_value(value))
+            parts.append(fragment)
+        return u''.join(parts).encode('ascii')
+
+    def bind(self, **values):
+        """Return a :py:class:`RenderedPush` with the given variable values.
+        """
+        if self._airship is None:
+            raise ValueError('An airship is needed to send compiled pushes')
+        return RenderedPush(self._airship, self.render(**values))
@@ -63,6 +63,190 @@ class Push(object):
         return PushResponse(response)
 
 
+class RenderedPush(object):
+    """A push payload encoded by :py:meth:`CompiledPush.bind`.
+
+    Can be sent on its own, added to a :py:class:`PushBatch` or sent with a
+    :py:class:`PushSender`.
+
+    :ivar body: The encoded JSON payload, as bytes.
+
+    """
+
+    def __init__(self, airship, body):
+        self._airship = airship
+        self.body = body
+
+    @property
+    def payload(self):
+        return json.loads(self.body.decode('utf-8'))
+
+    def send(self):
+        """Send the notification.
+
+        :returns: :py:class:`PushResponse` object with ``push_ids`` and
+            other response data.
+        :raises AirshipFailure: Request failed.
+        :raises Unauthorized: Authentication failed.
+
+        """
+        response = self._airship._request(
+            method='POST',
+            body=self.body,
+            url=common.PUSH_URL,
+            content_type='application/json',
+            version=3
+        )
+        data = response.json()
+        logger.info('Push successful. push_ids: %s',
+                    ', '.join(data.get('push_ids', []))
+                    )
+        return PushResponse(response)
+
+
+class PushBatch(object):
+    """Send many pushes in as few requests as possible.
+
+    The push API accepts an array of push objects per request. Pushes added
+    to the batch are serialized once and packed into arrays of at most
+    ``max_pushes`` pushes and ``max_bytes`` bytes each.
+
+    >>> batch = airship.create_push_batch() # doctest: +SKIP
+    >>> for user, text in messages: # doctest: +SKIP
+    ...     push = airship.create_push()
+    ...     push.audience = ua.named_user(user)
+    ...     push.notification = ua.notification(alert=text)
+    ...     push.device_types = ua.all_
+    ...     batch.add(push)
+    >>> responses = batch.send() # doctest: +SKIP
+
+    :ivar max_pushes: Most pushes sent in one request.
+    :ivar max_bytes: Largest request body, in bytes.
+    :ivar responses: After :py:meth:`send`, one :py:class:`PushResponse` per
+        added push, in order; None for pushes not sent because a request
+        failed.
+
+    """
+
+    max_pushes = 100
+    max_bytes = 1024 * 1024
+
+    def __init__(self, airship, pushes=None):
+        self._airship = airship
+        self.pushes = []
+        self.responses = None
+        for push in pushes or ():
+            self.add(push)
+
+    def __len__(self):
+        return len(self.pushes)
+
+    def add(self, push):
+        """Add a :py:class:`Push`, :py:class:`RenderedPush` or push payload
+        dictionary."""
+        if not isinstance(push, (Push, RenderedPush, dict)):
+            raise TypeError(
+                'Only Push objects and push payloads can be batched'
+            )
+        self.pushes.append(push)
+
+    def chunks(self):
+        """Return the request bodies the batch will be sent as.
+
+        :returns: List of ``(indexes, body)`` tuples, where ``indexes`` are
+            the positions of the pushes in the encoded JSON array ``body``.
+        :raises ValueError: A single push is larger than ``max_bytes``.
+
+        """
+        chunks = []
+        indexes, parts, size = [], [], 2
+        for index, push in enumerate(self.pushes):
+            if isinstance(push, RenderedPush):
+                part = push.body
+            else:
+                payload = push.payload if isinstance(push, Push) else push
+                part = json.dumps(payload).encode('utf-8')
+            if len(part) + 2 > self.max_bytes:
+                raise ValueError(
+                    'Push {0} is {1} bytes; the limit is {2}'.format(
+                        index, len(part), self.max_bytes
+                    )
+                )
+            if parts and (len(parts) >= self.max_pushes or
+                          size + 1 + len(part) > self.max_bytes):
+                chunks.append((indexes, b'[' + b','.join(parts) + b']'))
+                indexes, parts, size = [], [], 2
+            size += len(part) + (1 if parts else 0)
+            indexes.append(index)
+            parts.append(part)
+        if parts:
+            chunks.append((indexes, b'[' + b','.join(parts) + b']'))
+        return chunks
+
+    def send(self):
+        """Send every push in the batch.
+
+        :returns: List of :py:class:`PushResponse`, one per added push in the
+            order added. Each holds the push ID assigned to that push.
+        :raises AirshipFailure: A request failed; pushes in earlier requests
+            were sent and their responses are in ``responses``.
+        :raises Unauthorized: Authentication failed.
+
+        """
+        self.responses = [None] * len(self.pushes)
+        return self._send_chunks(self.chunks())
+
+    def resume(self):
+        """Send the pushes whose requests failed or were not made.
+
+        Requests whose pushes already have responses, from an earlier
+        :py:meth:`send` or :py:meth:`resume`, are not sent again, so a
+        batch interrupted by a failed request can be retried without
+        duplicating pushes. On a batch never sent this is the same as
+        :py:meth:`send`.
+
+        :returns: As for :py:meth:`send`.
+        :raises AirshipFailure: As for :py:meth:`send`.
+        :raises Unauthorized: Authentication failed.
+
+        """
+        if self.responses is None or \
+                len(self.responses) != len(self.pushes):
+            return self.send()
+        return self._send_chunks([
+            (indexes, body) for indexes, body in self.chunks()
+            if self.responses[indexes[0]] is None
+        ])
+
+    def _send_chunks(self, chunks):
+        for indexes, body in chunks:
+            response = self._airship._request(
+                method='POST',
+                body=body,
+                url=common.PUSH_URL,
+                content_type='application/json',
+                version=3
+            )
+            data = response.json()
+            push_ids = data.get('push_ids') or []
+            if len(push_ids) != len(indexes):
+                logger.warning(
+                    'Expected %d push_ids for a batch, got %d; push_ids '
+                    'cannot be matched to pushes',
+                    len(indexes), len(push_ids)
+                )
+            for position, index in enumerate(indexes):
+                push_data = dict(data)
+                push_data['push_ids'] = (
+                    [push_ids[position]]
+                    if len(push_ids) == len(indexes) else None
+                )
+                self.responses[index] = PushResponse.from_payload(push_data)
+        logger.info('Sent %d pushes in %d requests',
+                    sum(len(indexes) for indexes, _ in chunks), len(chunks))
+        return self.responses
+
+
 class ScheduledPush(object):
     """A scheduled push notification. Set schedule, push, and send."""
 
@@ -247,7 +431,16 @@ class PushResponse(object):
     payload = None
 
     def __init__(self, response):
-        data = response.json()
+        self._set_payload(response.json())
+
+    @classmethod
+    def from_payload(cls, data):
+        """Create from an already decoded response payload."""
+        obj = cls.__new__(cls)
+        obj._set_payload(data)
+        return obj
+
+    def _set_payload(self, data):
         self.push_ids = data.get('push_ids')
         self.schedule_url = data.get('schedule_urls', [])
         self.operation_id = data.get('operation_id')
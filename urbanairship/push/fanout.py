@@ -0,0 +1,281 @@
+import json
+import logging
+
+import six
+
+from urbanairship.push.audience import or_
+from urbanairship.push.core import Push, PushBatch
+
+logger = logging.getLogger('urbanairship')
+
+# Most selectors combined into one "or" audience.
+MAX_OR_SELECTORS = 1000
+
+# Push attributes copied to coalesced pushes, besides the audience.
+PUSH_ATTRIBUTES = (
+    'notification', 'device_types', 'options', 'campaigns', 'message',
+    'in_app',
+)
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def _copy(push, payload, audience):
+    new = Push(push._airship)
+    for attribute in PUSH_ATTRIBUTES:
+        setattr(new, attribute, payload.get(attribute))
+    new.audience = audience
+    return new
+
+
+class _Group(object):
+    def __init__(self, push, payload):
+        self.push = push
+        self.payload = payload
+        self.selectors = []
+        self.seen = set()
+        self.sources = []
+        self.count = 0
+
+    def new_count(self, selectors):
+        # Selectors that adding ``selectors`` would add, counted as the API
+        # counts them.
+        keys = set()
+        count = 0
+        for selector in selectors:
+            key = _canonical(selector)
+            if key not in self.seen and key not in keys:
+                keys.add(key)
+                count += _selector_count(selector)
+        return count
+
+    def add(self, push, selectors):
+        for selector in selectors:
+            key = _canonical(selector)
+            if key not in self.seen:
+                self.seen.add(key)
+                self.selectors.append(selector)
+                self.count += _selector_count(selector)
+        self.sources.append(push)
+
+    def build(self):
+        if len(self.sources) == 1:
+            return self.sources[0]
+        if len(self.selectors) == 1:
+            audience = self.selectors[0]
+        else:
+            audience = or_(*self.selectors)
+        return _copy(self.push, self.payload, audience)
+
+
+def coalesce_pushes(pushes, max_selectors=MAX_OR_SELECTORS,
+                    with_sources=False):
+    """Merge pushes that differ only in audience into shared-audience pushes.
+
+    Pushes whose payloads are identical apart from ``audience`` are combined
+    into one :py:class:`Push` whose audience is the ``or_`` of their
+    audiences, holding at most ``max_selectors`` selectors. Selectors are
+    counted as the API counts them, so ``{'named_user': [...]}`` counts one
+    per value. Existing ``or`` audiences are flattened and duplicate
+    selectors dropped, so a device selected by several merged pushes
+    receives the notification once.
+    Pushes with an ``'all'`` audience, pushes that are not :py:class:`Push`
+    objects, and pushes that match no other are returned unchanged. The
+    input pushes are never modified.
+
+    >>> pushes = coalesce_pushes(
+    ...     personalized_pushes, max_selectors=500) # doctest: +SKIP
+    >>> for result in PushSender().send(pushes): # doctest: +SKIP
+    ...     pass
+
+    :param pushes: Iterable of pushes.
+    :keyword max_selectors: Most selectors in a merged audience.
+    :keyword with_sources: If True, return ``(push, sources)`` tuples, where
+        ``sources`` lists the input pushes merged into ``push``.
+    :returns: List of pushes, in order of each group's first push.
+
+    """
+    if max_selectors < 1:
+        raise ValueError('max_selectors must be a positive integer')
+    output = []
+    open_groups = {}
+    count = 0
+    for push in pushes:
+        count += 1
+        payload = push.payload if isinstance(push, Push) else None
+        audience = payload.get('audience') if payload else None
+        if not isinstance(audience, dict):
+            output.append(_Group(push, None))
+            output[-1].sources.append(push)
+            continue
+        if list(audience) == ['or']:
+            selectors = audience['or']
+        else:
+            selectors = [audience]
+        rest = dict(payload)
+        del rest['audience']
+        key = _canonical(rest)
+
+        group = open_groups.get(key)
+        if group is not None and \
+                group.count + group.new_count(selectors) > max_selectors:
+            group = None
+        if group is None:
+            group = _Group(push, rest)
+            output.append(group)
+            open_groups[key] = group
+        group.add(push, selectors)
+        if group.count >= max_selectors:
+            open_groups.pop(key, None)
+
+    logger.info('Coalesced %d pushes into %d', count, len(output))
+    if with_sources:
+        return [(group.build(), group.sources) for group in output]
+    return [group.build() for group in output]
+
+
+def _selector_count(selector):
+    if not isinstance(selector, dict):
+        return 1
+    if len(selector) == 1:
+        operator, value = list(selector.items())[0]
+        if operator in ('and', 'or'):
+            return sum(_selector_count(child) for child in value)
+        if operator == 'not':
+            return _selector_count(value)
+        if isinstance(value, list):
+            return len(value)
+    return 1
+
+
+def _audience_parts(audience):
+    # Split an audience into pieces that can be or-ed together in any
+    # grouping: ('ids', key, values) for the explicit values of each
+    # selector key, merged across selectors, and ('selector', selector,
+    # count) for every other selector, in order of first appearance.
+    if list(audience) == ['or']:
+        children = audience['or']
+    else:
+        children = [audience]
+    parts = []
+    streams = {}
+    for child in children:
+        key = list(child)[0] if len(child) == 1 else None
+        values = child[key] if key is not None else None
+        if key in ('and', 'or', 'not', 'location') or \
+                not isinstance(values, (list,) + six.string_types):
+            parts.append(('selector', child, _selector_count(child)))
+            continue
+        if key not in streams:
+            streams[key] = []
+            parts.append(('ids', key, streams[key]))
+        if isinstance(values, list):
+            streams[key].extend(values)
+        else:
+            streams[key].append(values)
+    return parts
+
+
+def chunk_push(push, max_selectors=MAX_OR_SELECTORS,
+               max_bytes=PushBatch.max_bytes):
+    """Split a push to many explicit selectors into pushes within limits.
+
+    An audience that is an ``or_`` of selectors, or a selector with a list
+    of values such as ``{'ios_channel': [...]}``, is divided into as few
+    pushes as possible, each with at most ``max_selectors`` selectors and an
+    encoded payload of at most ``max_bytes`` bytes. Explicit values of the
+    same selector key are merged into one list, such as
+    ``{'ios_channel': [...]}``, before being divided. The pushes are
+    identical apart from their audience, and a push within the limits is
+    returned as the only item. The result can be sent with a
+    :py:class:`PushSender` or :py:class:`PushBatch`.
+
+    >>> push.audience = ua.or_(
+    ...     *[ua.ios_channel(c) for c in channel_ids]) # doctest: +SKIP
+    >>> for result in PushSender().send(chunk_push(push)): # doctest: +SKIP
+    ...     print(result.ok)
+
+    :param push: A :py:class:`Push`.
+    :keyword max_selectors: Most selectors in one push's audience.
+    :keyword max_bytes: Largest encoded push payload, in bytes.
+    :returns: List of :py:class:`Push`.
+    :raises ValueError: A single selector cannot fit in the limits, or the
+        audience is over the limits but is an ``and_`` or ``not_``, which
+        cannot be split.
+
+    """
+    if max_selectors < 1:
+        raise ValueError('max_selectors must be a positive integer')
+    payload = push.payload
+    audience = payload.get('audience')
+    if not isinstance(audience, dict) or not audience:
+        return [push]
+    if _selector_count(audience) <= max_selectors and \
+            len(json.dumps(payload).encode('utf-8')) <= max_bytes:
+        return [push]
+    if list(audience) in (['and'], ['not']):
+        raise ValueError(
+            'Only "or" audiences and lists of selectors can be split; this '
+            'audience has {0} selectors'.format(_selector_count(audience))
+        )
+
+    rest = dict(payload)
+    rest['audience'] = {'or': []}
+    base = len(json.dumps(rest).encode('utf-8'))
+    chunks = []
+    state = {'chunk': [], 'ids': {}, 'count': 0, 'size': base}
+
+    def fit(weight, part, selector):
+        # Start a new chunk if ``weight`` selectors taking ``part`` more
+        # bytes do not fit in the current one.
+        if base + part > max_bytes:
+            raise ValueError(
+                'Selector {0} does not fit in {1} bytes'.format(
+                    json.dumps(selector)[:100], max_bytes)
+            )
+        if state['chunk'] and (state['count'] + weight > max_selectors or
+                               state['size'] + part > max_bytes):
+            chunks.append(state['chunk'])
+            state.update(chunk=[], ids={}, count=0, size=base)
+        state['count'] += weight
+        state['size'] += part
+
+    for kind, first, second in _audience_parts(audience):
+        if kind == 'selector':
+            if second > max_selectors:
+                raise ValueError(
+                    'Selector {0} has {1} selectors, more than {2}'.format(
+                        json.dumps(first)[:100], second, max_selectors)
+                )
+            # json.dumps separates list items with ', '.
+            fit(second, len(json.dumps(first).encode('utf-8')) + 2, first)
+            state['chunk'].append(first)
+            continue
+        key, opening = first, len(json.dumps({first: []}).encode('utf-8'))
+        for value in second:
+            part = len(json.dumps(value).encode('utf-8')) + 2
+            if key not in state['ids']:
+                part += opening
+            fit(1, part, {key: value})
+            if key not in state['ids']:
+                state['ids'][key] = []
+                state['chunk'].append({key: state['ids'][key]})
+            state['ids'][key].append(value)
+    if state['chunk']:
+        chunks.append(state['chunk'])
+    for chunk in chunks:
+        for index, selector in enumerate(chunk):
+            key = list(selector)[0]
+            if key not in ('and', 'or') and len(selector) == 1 and \
+                    isinstance(selector[key], list) and \
+                    len(selector[key]) == 1:
+                chunk[index] = {key: selector[key][0]}
+
+    logger.info('Split a push to %d selectors into %d pushes',
+                _selector_count(audience), len(chunks))
+    return [
+        _copy(push, payload, chunk[0] if len(chunk) == 1 else or_(*chunk))
+        for chunk in chunks
+    ]
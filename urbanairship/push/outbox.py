@@ -0,0 +1,427 @@
+import collections
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from urbanairship import common
+from urbanairship.push.core import Push, PushBatch, RenderedPush
+from urbanairship.push.sender import PushSender
+
+logger = logging.getLogger('urbanairship')
+
+PENDING = 'pending'
+SENT = 'sent'
+FAILED = 'failed'
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        key TEXT UNIQUE,
+        payload BLOB NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        solo INTEGER NOT NULL DEFAULT 0,
+        available_at REAL NOT NULL,
+        created_at REAL NOT NULL,
+        sent_at REAL,
+        push_ids TEXT,
+        last_error TEXT
+    )''',
+    '''CREATE INDEX IF NOT EXISTS outbox_ready
+        ON outbox (status, available_at)''',
+)
+
+_COLUMNS = (
+    'id, key, payload, status, attempts, created_at, sent_at, push_ids, '
+    'last_error, solo'
+)
+
+
+class OutboxEntry(collections.namedtuple('OutboxEntry', [
+        'id', 'key', 'payload', 'status', 'attempts', 'created_at',
+        'sent_at', 'push_ids', 'last_error', 'solo'])):
+    """A push stored in a :py:class:`PushOutbox`.
+
+    :ivar id: Entry ID, assigned in enqueue order.
+    :ivar key: The idempotency key given to :py:meth:`PushOutbox.enqueue`.
+    :ivar payload: The encoded push payload, as bytes.
+    :ivar status: ``'pending'``, ``'sent'`` or ``'failed'``.
+    :ivar attempts: Number of times the push was claimed for sending.
+    :ivar created_at: Enqueue time, as a Unix timestamp.
+    :ivar sent_at: Time the push was accepted, or None.
+    :ivar push_ids: Push IDs the API returned, or None.
+    :ivar last_error: Description of the most recent failure, or None.
+    :ivar solo: True if the push is to be sent in a request of its own,
+        after a batch containing it was rejected.
+
+    """
+
+    __slots__ = ()
+
+
+def _entry(row):
+    values = list(row)
+    values[2] = bytes(values[2])
+    values[7] = json.loads(values[7]) if values[7] is not None else None
+    values[9] = bool(values[9])
+    return OutboxEntry(*values)
+
+
+class PushOutbox(object):
+    """A durable queue of pushes in a local SQLite database.
+
+    Enqueueing writes the push to the database in write-ahead log mode, so
+    it survives a crash of the process, and costs no API request. An
+    :py:class:`OutboxDispatcher` sends the queued pushes and records the
+    ``push_ids`` of each, or the error that stopped it.
+
+    Pushes are claimed with a lease: a push claimed by a dispatcher that
+    crashes before recording the result is claimed again once the lease
+    expires. Delivery is therefore at least once; a push can be sent twice
+    if a crash happens between the API accepting it and the result being
+    recorded.
+
+    >>> outbox = PushOutbox('/var/lib/myapp/outbox.db') # doctest: +SKIP
+    >>> outbox.enqueue(push, key='order-1001-shipped') # doctest: +SKIP
+    1
+
+    :param path: Database file path; created if missing.
+    :keyword synchronous: SQLite ``synchronous`` setting. ``'NORMAL'``
+        survives process crashes; use ``'FULL'`` to also survive power
+        loss.
+    :keyword timeout: Seconds to wait for a lock held by another process.
+
+    """
+
+    def __init__(self, path, synchronous='NORMAL', timeout=30.0):
+        if synchronous.upper() not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError('Invalid synchronous setting: %s' % synchronous)
+        self.path = path
+        self.clock = time.time
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None,
+            check_same_thread=False
+        )
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=%s' % synchronous.upper())
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _transaction(self, function):
+        # Call function(db) in one write transaction.
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                result = function(self._db)
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return result
+
+    def _update(self, sql, args):
+        return self._transaction(lambda db: db.execute(sql, args).rowcount)
+
+    def enqueue(self, push, key=None):
+        """Store a push for sending.
+
+        :param push: A :py:class:`Push`, :py:class:`RenderedPush` or push
+            payload dictionary.
+        :keyword key: Optional idempotency key. A push enqueued with a key
+            already in the outbox is not stored again.
+        :returns: The entry ID.
+
+        """
+        if isinstance(push, RenderedPush):
+            payload = push.body
+        elif isinstance(push, Push):
+            payload = json.dumps(push.payload).encode('utf-8')
+        elif isinstance(push, dict):
+            payload = json.dumps(push).encode('utf-8')
+        else:
+            raise TypeError('Only Push objects and push payloads can be '
+                            'enqueued')
+        now = self.clock()
+
+        def insert(db):
+            cursor = db.execute(
+                'INSERT OR IGNORE INTO outbox (key, payload, status, '
+                'available_at, created_at) VALUES (?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(payload), PENDING, now, now)
+            )
+            if cursor.rowcount:
+                return cursor.lastrowid
+            return db.execute(
+                'SELECT id FROM outbox WHERE key = ?', (key,)
+            ).fetchone()[0]
+
+        return self._transaction(insert)
+
+    def get(self, entry_id):
+        """Return the :py:class:`OutboxEntry` with an ID, or None."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT %s FROM outbox WHERE id = ?' % _COLUMNS, (entry_id,)
+            ).fetchone()
+        return _entry(row) if row is not None else None
+
+    def get_by_key(self, key):
+        """Return the :py:class:`OutboxEntry` with an idempotency key, or
+        None."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT %s FROM outbox WHERE key = ?' % _COLUMNS, (key,)
+            ).fetchone()
+        return _entry(row) if row is not None else None
+
+    def counts(self):
+        """Return a dict of status to number of entries."""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT status, COUNT(*) FROM outbox GROUP BY status'
+            ).fetchall()
+        return dict(rows)
+
+    def claim(self, limit, lease=300.0):
+        """Lease up to ``limit`` pending pushes that are due for sending.
+
+        Claimed pushes are not claimed again until ``lease`` seconds pass or
+        they are released.
+
+        :returns: List of :py:class:`OutboxEntry`, oldest first.
+
+        """
+        now = self.clock()
+
+        def claim(db):
+            rows = db.execute(
+                'SELECT %s FROM outbox WHERE status = ? AND '
+                'available_at <= ? ORDER BY id LIMIT ?' % _COLUMNS,
+                (PENDING, now, limit)
+            ).fetchall()
+            db.executemany(
+                'UPDATE outbox SET attempts = attempts + 1, '
+                'available_at = ? WHERE id = ?',
+                [(now + lease, row[0]) for row in rows]
+            )
+            return rows
+
+        return [
+            _entry(row)._replace(attempts=row[4] + 1)
+            for row in self._transaction(claim)
+        ]
+
+    def mark_sent(self, entry_id, push_ids):
+        """Record that a push was accepted, with its push IDs."""
+        self._update(
+            'UPDATE outbox SET status = ?, sent_at = ?, push_ids = ?, '
+            'last_error = NULL WHERE id = ?',
+            (SENT, self.clock(), json.dumps(push_ids), entry_id)
+        )
+
+    def mark_failed(self, entry_id, error):
+        """Record that a push will not be sent."""
+        self._update(
+            'UPDATE outbox SET status = ?, last_error = ? WHERE id = ?',
+            (FAILED, error, entry_id)
+        )
+
+    def release(self, entry_id, delay=0.0, error=None, solo=False,
+                attempt=True):
+        """Return a claimed push to the queue.
+
+        :keyword delay: Seconds before the push may be claimed again.
+        :keyword error: Description of the failure, if any.
+        :keyword solo: If True, the push is next claimed on its own.
+        :keyword attempt: If False, the claim is not counted as an attempt.
+
+        """
+        self._update(
+            'UPDATE outbox SET available_at = ?, last_error = ?, '
+            'solo = MAX(solo, ?), attempts = attempts - ? WHERE id = ?',
+            (self.clock() + delay, error, int(solo), int(not attempt),
+             entry_id)
+        )
+
+    def purge(self, before):
+        """Delete sent and failed entries last changed before a Unix time.
+
+        :returns: Number of entries deleted.
+
+        """
+        return self._update(
+            'DELETE FROM outbox WHERE status != ? AND '
+            'COALESCE(sent_at, available_at) < ?', (PENDING, before)
+        )
+
+
+class OutboxDispatcher(object):
+    """Send the pushes queued in a :py:class:`PushOutbox`.
+
+    Each round claims up to ``batch_size * max_in_flight`` pushes, packs
+    them into :py:class:`PushBatch` requests of ``batch_size`` pushes and
+    sends the batches concurrently with a :py:class:`PushSender`. The push
+    IDs returned for each push are recorded in the outbox.
+
+    A push in a batch rejected as invalid (a 4xx response other than 429)
+    is retried on its own, so one bad push does not fail the others. A push
+    rejected on its own, or too large for any request, is marked failed.
+    A rate limited (429) request is first resumed by the
+    :py:class:`PushSender`, up to its ``max_retries``, without resending
+    requests of the same batch already accepted. Other failures, such as
+    server errors, and 429s left once the sender's retries run out, are
+    retried after ``retry_delay`` seconds, doubling with each attempt, up
+    to ``max_attempts`` attempts.
+
+    >>> dispatcher = OutboxDispatcher(outbox, airship) # doctest: +SKIP
+    >>> dispatcher.run() # doctest: +SKIP
+
+    :param outbox: A :py:class:`PushOutbox`.
+    :param airship: An :py:class:`Airship` to send with.
+    :keyword batch_size: Most pushes per request.
+    :keyword max_in_flight: Most requests sent at once.
+    :keyword max_attempts: Attempts before a push is marked failed.
+    :keyword retry_delay: Seconds before the first retry.
+    :keyword lease: Seconds a claimed push is reserved for this dispatcher.
+    :keyword rate: Optional limit on requests per second.
+
+    """
+
+    def __init__(self, outbox, airship, batch_size=PushBatch.max_pushes,
+                 max_in_flight=4, max_attempts=5, retry_delay=30.0,
+                 lease=300.0, rate=None):
+        if batch_size < 1 or batch_size > PushBatch.max_pushes:
+            raise ValueError('batch_size must be between 1 and %d'
+                             % PushBatch.max_pushes)
+        self.outbox = outbox
+        self.airship = airship
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.sender = PushSender(max_in_flight=max_in_flight, rate=rate)
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Make :py:meth:`run` return after the current round."""
+        self._stop.set()
+
+    def _batches(self, entries):
+        chunks = [[entry] for entry in entries if entry.solo]
+        grouped = [entry for entry in entries if not entry.solo]
+        for start in range(0, len(grouped), self.batch_size):
+            chunks.append(grouped[start:start + self.batch_size])
+        for chunk in chunks:
+            batch = PushBatch(self.airship, [
+                RenderedPush(self.airship, entry.payload) for entry in chunk
+            ])
+            batch.entries = chunk
+            yield batch
+
+    def _fits(self, entry):
+        # A push too large for any request can never be sent.
+        if len(entry.payload) + 2 <= PushBatch.max_bytes:
+            return True
+        error = 'Push is {0} bytes; the limit is {1}'.format(
+            len(entry.payload), PushBatch.max_bytes - 2
+        )
+        logger.error('Outbox push %d was rejected: %s', entry.id, error)
+        self.outbox.mark_failed(entry.id, error)
+        return False
+
+    def _retry(self, entry, error):
+        if entry.attempts >= self.max_attempts:
+            logger.error('Giving up on outbox push %d after %d attempts: %s',
+                         entry.id, entry.attempts, error)
+            self.outbox.mark_failed(entry.id, error)
+        else:
+            self.outbox.release(
+                entry.id, self.retry_delay * 2 ** (entry.attempts - 1),
+                error
+            )
+
+    def _record(self, result):
+        batch = result.push
+        responses = batch.responses or [None] * len(batch.entries)
+        error = result.error
+        status = getattr(getattr(error, 'response', None), 'status_code',
+                         None)
+        invalid = status is not None and 400 <= status < 500 and \
+            status != 429
+        sent = 0
+        for entry, response in zip(batch.entries, responses):
+            if response is not None:
+                self.outbox.mark_sent(entry.id, response.push_ids)
+                sent += 1
+            elif isinstance(error, common.Unauthorized):
+                self.outbox.release(entry.id, attempt=False)
+            elif invalid and len(batch.entries) > 1:
+                self.outbox.release(entry.id, solo=True, attempt=False)
+            elif invalid:
+                logger.error('Outbox push %d was rejected: %s',
+                             entry.id, error)
+                self.outbox.mark_failed(entry.id, str(error))
+            else:
+                self._retry(entry, str(error))
+        return sent
+
+    def _round(self):
+        entries = self.outbox.claim(
+            self.batch_size * self.sender.max_in_flight, self.lease
+        )
+        if not entries:
+            return 0, 0
+        claimed = len(entries)
+        entries = [entry for entry in entries if self._fits(entry)]
+        sent = 0
+        unauthorized = None
+        for result in self.sender.send(self._batches(entries)):
+            sent += self._record(result)
+            if isinstance(result.error, common.Unauthorized):
+                unauthorized = result.error
+        logger.info('Sent %d of %d outbox pushes', sent, claimed)
+        if unauthorized is not None:
+            raise unauthorized
+        return claimed, sent
+
+    def run_once(self):
+        """Claim, send and record one round of pushes.
+
+        :returns: Number of pushes sent.
+        :raises Unauthorized: Authentication failed; claimed pushes are
+            returned to the outbox.
+
+        """
+        return self._round()[1]
+
+    def run(self, poll_interval=1.0, until_empty=False):
+        """Send pushes until :py:meth:`stop` is called.
+
+        :keyword poll_interval: Seconds to wait when no push is due.
+        :keyword until_empty: If True, return once no push is due.
+        :returns: Number of pushes sent.
+        :raises Unauthorized: Authentication failed.
+
+        """
+        self._stop.clear()
+        sent = 0
+        while not self._stop.is_set():
+            claimed, count = self._round()
+            sent += count
+            if not claimed:
+                if until_empty:
+                    break
+                self._stop.wait(poll_interval)
+        return sent
@@ -14,9 +14,9 @@ class ScheduledList(common.IteratorParent):
     id_key = 'url'
     instance_class = ScheduledPush
 
-    def __init__(self, airship, limit=None):
+    def __init__(self, airship, limit=None, **kwargs):
         params = {'limit': limit} if limit else {}
-        super(ScheduledList, self).__init__(airship, params)
+        super(ScheduledList, self).__init__(airship, params, **kwargs)
 
 
 def scheduled_time(timestamp):
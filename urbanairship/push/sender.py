@@ -0,0 +1,195 @@
+import collections
+import logging
+import threading
+import time
+
+from six.moves import queue
+
+from urbanairship import common
+
+logger = logging.getLogger('urbanairship')
+
+
+class SendResult(collections.namedtuple(
+        'SendResult', ['push', 'response', 'error'])):
+    """Outcome of sending one push with a :py:class:`PushSender`.
+
+    :ivar push: The push object that was sent.
+    :ivar response: Its :py:class:`PushResponse`, or None if sending failed.
+    :ivar error: The exception raised by ``send()``, usually an
+        :py:class:`AirshipFailure`, or None on success.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class _Done(object):
+    pass
+
+
+class _FeedError(object):
+    def __init__(self, exc):
+        self.exc = exc
+
+
+class PushSender(object):
+    """Send pushes concurrently with a bounded number of requests in flight.
+
+    Any object with a ``send()`` method returning a :py:class:`PushResponse`
+    can be sent, such as :py:class:`Push`, :py:class:`TemplatePush` or
+    :py:class:`PushBatch`. Results are yielded as requests complete, so not
+    necessarily in input order; each :py:class:`SendResult` pairs the push
+    with its response or error. Exceptions raised by ``send()`` are
+    captured in the result rather than raised.
+
+    Responses with status 429 are retried after the ``Retry-After`` delay
+    the server asks for, up to ``max_retries`` times. Objects with a
+    ``resume()`` method, such as :py:class:`PushBatch`, are retried with it,
+    so requests that already succeeded are not sent again.
+
+    >>> sender = PushSender(max_in_flight=16, rate=50) # doctest: +SKIP
+    >>> for result in sender.send(pushes): # doctest: +SKIP
+    ...     if not result.ok:
+    ...         log_failure(result.push, result.error)
+
+    :keyword max_in_flight: Most requests sent at once.
+    :keyword rate: Optional limit on sends per second, across all threads.
+    :keyword max_retries: Retries for a push rejected with status 429.
+    :keyword retry_delay: Seconds to wait before retrying a 429 response
+        without a ``Retry-After`` header; doubled on each retry.
+
+    """
+
+    def __init__(self, max_in_flight=8, rate=None, max_retries=3,
+                 retry_delay=1.0):
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be a positive integer')
+        self.max_in_flight = max_in_flight
+        self.limiter = common.RateLimiter(rate) if rate else None
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.sleep = time.sleep
+
+    def _retry_after(self, response, attempt):
+        try:
+            return float(response.headers['Retry-After'])
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return self.retry_delay * 2 ** attempt
+
+    def send_one(self, push):
+        """Send a single push, applying the rate limit and 429 retries.
+
+        :returns: A :py:class:`SendResult`; never raises.
+
+        """
+        attempt = 0
+        send = push.send
+        while True:
+            if self.limiter is not None:
+                self.limiter.wait()
+            try:
+                return SendResult(push, send(), None)
+            except common.AirshipFailure as exc:
+                status = getattr(exc.response, 'status_code', None)
+                if status != 429 or attempt >= self.max_retries:
+                    return SendResult(push, None, exc)
+                delay = self._retry_after(exc.response, attempt)
+                logger.warning(
+                    'Push rate limited; retrying in %.1f seconds', delay
+                )
+                self.sleep(delay)
+                attempt += 1
+                send = getattr(push, 'resume', push.send)
+            except Exception as exc:
+                return SendResult(push, None, exc)
+
+    def send(self, pushes):
+        """Send pushes on a pool of threads, yielding results as they finish.
+
+        ``pushes`` is read lazily, at most ``max_in_flight`` items ahead of
+        the requests in progress. Closing the generator early stops sending
+        pushes not yet started. If iterating ``pushes`` raises, the pushes
+        already read are sent and their results yielded before the
+        exception is raised.
+
+        :param pushes: Iterable of pushes.
+        :returns: Generator of :py:class:`SendResult`.
+
+        """
+        tasks = queue.Queue(self.max_in_flight)
+        results = queue.Queue()
+        stop = threading.Event()
+        done = _Done()
+
+        def feed():
+            try:
+                for push in pushes:
+                    while not stop.is_set():
+                        try:
+                            tasks.put(push, timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+                    if stop.is_set():
+                        break
+            except Exception as exc:
+                results.put(_FeedError(exc))
+            finally:
+                for _ in workers:
+                    tasks.put(done)
+
+        def work():
+            while True:
+                push = tasks.get()
+                if push is done:
+                    results.put(done)
+                    return
+                if not stop.is_set():
+                    results.put(self.send_one(push))
+
+        workers = [
+            threading.Thread(target=work) for _ in range(self.max_in_flight)
+        ]
+        threads = workers + [threading.Thread(target=feed)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        finished = 0
+        error = None
+        try:
+            while finished < len(workers):
+                result = results.get()
+                if result is done:
+                    finished += 1
+                elif isinstance(result, _FeedError):
+                    # Pushes already read are still sent and yielded, so
+                    # the caller knows what went out before this is raised.
+                    error = result.exc
+                else:
+                    yield result
+        finally:
+            stop.set()
+        if error is not None:
+            raise error
+
+    def send_async(self, pushes):
+        """Send pushes from asyncio, yielding results as they finish.
+
+        Requires Python 3.6 or later. ``pushes`` may be an iterable or an
+        async iterable. Requests run on a thread pool of ``max_in_flight``
+        threads.
+
+        >>> async for result in sender.send_async(pushes): # doctest: +SKIP
+        ...     print(result.ok)
+
+        :returns: Async generator of :py:class:`SendResult`.
+
+        """
+        from urbanairship.push._aio import send_async
+        return send_async(self, pushes)
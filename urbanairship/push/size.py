@@ -0,0 +1,267 @@
+import collections
+import json
+
+import six
+
+from urbanairship.push.core import Push
+
+# Largest payload each platform service accepts, in bytes.
+PLATFORM_LIMITS = {
+    'ios': 4096,
+    'android': 4096,
+    'amazon': 6144,
+    'wns': 5000,
+    'web': 4096,
+}
+
+# Bytes the server adds to every delivered payload, such as the push ID and
+# delivery metadata. An estimate; pass ``overhead`` to override it.
+SERVER_OVERHEAD = 200
+
+# Override fields that control delivery and are not sent to the device.
+DELIVERY_KEYS = frozenset([
+    'expiry', 'priority', 'collapse_id', 'collapse_key', 'time_to_live',
+    'delay_while_idle', 'delivery_priority', 'consolidation_key',
+    'expires_after',
+])
+
+# iOS override fields that move into the "aps" dictionary, by APNs name.
+APS_KEYS = (
+    ('badge', 'badge'),
+    ('sound', 'sound'),
+    ('category', 'category'),
+    ('thread_id', 'thread-id'),
+)
+# iOS override fields laid out by _ios_payload itself.
+IOS_KEYS = frozenset([
+    'alert', 'title', 'subtitle', 'content-available', 'mutable_content',
+    'extra',
+]) | frozenset(key for key, _ in APS_KEYS)
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _size(data):
+    return len(_encode(data).encode('utf-8'))
+
+
+class PayloadSize(collections.namedtuple(
+        'PayloadSize', ['platform', 'size', 'limit'])):
+    """Estimated size of the payload delivered to one platform.
+
+    :ivar platform: Device type, such as ``'ios'``.
+    :ivar size: Estimated payload size in bytes.
+    :ivar limit: The platform's payload size limit in bytes.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def over(self):
+        """Bytes over the limit; 0 if the payload fits."""
+        return max(0, self.size - self.limit)
+
+
+def _alert_text(alert):
+    if isinstance(alert, dict):
+        return alert.get('body')
+    return alert
+
+
+def _ios_payload(alert, override):
+    aps = {}
+    alert = override.get('alert', alert)
+    if override.get('title') is not None or \
+            override.get('subtitle') is not None:
+        if not isinstance(alert, dict):
+            alert = {'body': alert} if alert is not None else {}
+        else:
+            alert = dict(alert)
+        for key in ('title', 'subtitle'):
+            if override.get(key) is not None:
+                alert.setdefault(key, override[key])
+    if alert is not None:
+        aps['alert'] = alert
+    for key, aps_key in APS_KEYS:
+        if override.get(key) is not None:
+            aps[aps_key] = override[key]
+    if override.get('content-available'):
+        aps['content-available'] = 1
+    if override.get('mutable_content') or override.get('media_attachment'):
+        aps['mutable-content'] = 1
+    data = {'aps': aps}
+    for key, value in override.items():
+        if key not in DELIVERY_KEYS and key not in IOS_KEYS:
+            data['com.urbanairship.' + key] = value
+    data.update(override.get('extra') or {})
+    return data
+
+
+def _data_map_payload(alert, override):
+    # Android and Amazon deliver a flat map of string values.
+    data = {}
+    alert = override.get('alert', alert)
+    if alert is not None:
+        data['com.urbanairship.push.ALERT'] = alert
+    for key, value in override.items():
+        if key in DELIVERY_KEYS or key in ('alert', 'extra'):
+            continue
+        if not isinstance(value, six.string_types):
+            value = _encode(value)
+        data['com.urbanairship.' + key] = value
+    data.update(override.get('extra') or {})
+    return data
+
+
+def _generic_payload(alert, override):
+    data = dict(
+        (key, value) for key, value in override.items()
+        if key not in DELIVERY_KEYS
+    )
+    if alert is not None:
+        data.setdefault('alert', alert)
+    return data
+
+
+PLATFORM_PAYLOADS = {
+    'ios': _ios_payload,
+    'android': _data_map_payload,
+    'amazon': _data_map_payload,
+}
+
+
+def _platforms(notification, device_types):
+    if device_types is None or device_types == 'all':
+        platforms = set(PLATFORM_LIMITS)
+        platforms.update(
+            key for key in notification if key.startswith('open::')
+        )
+        return sorted(platforms)
+    return list(device_types)
+
+
+def _split(push, device_types):
+    if isinstance(push, Push):
+        if device_types is None:
+            device_types = push.device_types
+        return push.notification or {}, device_types
+    return push, device_types
+
+
+def _platform_size(notification, platform, overhead):
+    override = notification.get(platform) or {}
+    builder = PLATFORM_PAYLOADS.get(platform, _generic_payload)
+    data = builder(notification.get('alert'), override)
+    if notification.get('actions') is not None:
+        data['com.urbanairship.actions'] = notification['actions']
+    if notification.get('interactive') is not None and \
+            'interactive' not in override:
+        data['com.urbanairship.interactive'] = notification['interactive']
+    return _size(data) + overhead
+
+
+def payload_sizes(push, device_types=None, overhead=SERVER_OVERHEAD):
+    """Estimate the payload each platform receives for a push.
+
+    The estimate is the UTF-8 encoded size of the alert, platform override
+    fields that reach the device, ``extra`` and actions, laid out as each
+    platform delivers them, plus ``overhead`` bytes for fields the server
+    adds. It is meant to catch oversize payloads before sending, and needs
+    one JSON encoding per platform.
+
+    >>> for size in payload_sizes(push): # doctest: +SKIP
+    ...     if size.over:
+    ...         print('%s payload is %d bytes too large'
+    ...               % (size.platform, size.over))
+
+    :param push: A :py:class:`Push`, or a notification dictionary as
+        generated by :py:func:`notification`.
+    :keyword device_types: Device types to estimate; defaults to those of
+        ``push``, or every platform for a notification dictionary.
+    :keyword overhead: Bytes added for server generated fields.
+    :returns: List of :py:class:`PayloadSize`, one per platform.
+
+    """
+    notification, device_types = _split(push, device_types)
+    return [
+        PayloadSize(
+            platform, _platform_size(notification, platform, overhead),
+            PLATFORM_LIMITS.get(platform, PLATFORM_LIMITS['android'])
+        )
+        for platform in _platforms(notification, device_types)
+    ]
+
+
+def oversized(push, device_types=None, overhead=SERVER_OVERHEAD):
+    """Return the :py:class:`PayloadSize` of each platform over its limit.
+    """
+    return [
+        size for size in payload_sizes(push, device_types, overhead)
+        if size.over
+    ]
+
+
+def _with_alert(notification, platform, text):
+    notification = dict(notification)
+    override = dict(notification.get(platform) or {})
+    alert = override.get('alert', notification.get('alert'))
+    if isinstance(alert, dict):
+        alert = dict(alert)
+        alert['body'] = text
+    else:
+        alert = text
+    override['alert'] = alert
+    notification[platform] = override
+    return notification
+
+
+def truncate_alerts(push, device_types=None, overhead=SERVER_OVERHEAD,
+                    ellipsis=u'\u2026'):
+    """Shorten alerts so that every platform's payload fits its limit.
+
+    For each platform over its limit, the alert is cut to fit and
+    ``ellipsis`` appended. The shortened alert is set in that platform's
+    override, so platforms within their limits keep the full text. Neither
+    ``push`` nor its notification is modified.
+
+    >>> push.notification = truncate_alerts(push) # doctest: +SKIP
+
+    :param push: A :py:class:`Push`, or a notification dictionary.
+    :keyword device_types: As for :py:func:`payload_sizes`.
+    :keyword overhead: As for :py:func:`payload_sizes`.
+    :keyword ellipsis: Text appended to truncated alerts.
+    :returns: The notification dictionary, with truncated alerts.
+    :raises ValueError: A payload is over its limit without any alert text.
+
+    """
+    notification, device_types = _split(push, device_types)
+    for size in oversized(notification, device_types, overhead):
+        platform = size.platform
+        override = notification.get(platform) or {}
+        text = _alert_text(override.get('alert', notification.get('alert')))
+        if not isinstance(text, six.string_types):
+            raise ValueError(
+                '{0} payload is {1} bytes over its limit and has no alert '
+                'text to truncate'.format(platform, size.over)
+            )
+        low, high = 0, len(text)
+        best = None
+        while low <= high:
+            # Binary search for the longest prefix that fits.
+            middle = (low + high) // 2
+            candidate = _with_alert(
+                notification, platform, text[:middle] + ellipsis
+            )
+            if _platform_size(candidate, platform, overhead) <= size.limit:
+                best = candidate
+                low = middle + 1
+            else:
+                high = middle - 1
+        if best is None:
+            raise ValueError(
+                '{0} payload is over its limit even with an empty '
+                'alert'.format(platform)
+            )
+        notification = best
+    return notification
@@ -1,8 +1,8 @@
-import datetime
 import json
 import logging
 
 from urbanairship import common
+from urbanairship.timestamps import LazyTimestamp, UNKNOWN
 
 
 logger = logging.getLogger('urbanairship')
@@ -60,17 +60,9 @@ class Template(object):
     def template_id(self):
         return self._template_id
 
-    @property
-    def created_at(self):
-        return self._created_at
-
-    @property
-    def modified_at(self):
-        return self._modified_at
-
-    @property
-    def last_used(self):
-        return self._last_used
+    created_at = LazyTimestamp('created_at', readonly=True)
+    modified_at = LazyTimestamp('modified_at', readonly=True)
+    last_used = LazyTimestamp('last_used', readonly=True)
 
     @property
     def payload(self):
@@ -202,13 +194,8 @@ class Template(object):
         obj._template_id = payload[id_key]
         for key in payload:
             if key in ('created_at', 'modified_at', 'last_used'):
-                try:
-                    payload[key] = datetime.datetime.strptime(
-                        payload[key], '%Y-%m-%dT%H:%M:%S.%fZ'
-                    )
-                except:
-                    payload[key] = 'UNKNOWN'
-                setattr(obj, '_' + key, payload[key])
+                value = payload[key]
+                setattr(obj, '_' + key, UNKNOWN if value is None else value)
             elif key == 'template_id':
                 obj._template_id = payload[key]
             else:
@@ -245,9 +232,9 @@ class TemplateList(common.IteratorParent):
     id_key = 'id'
     instance_class = Template
 
-    def __init__(self, airship, limit=None):
+    def __init__(self, airship, limit=None, **kwargs):
         params = {'limit': limit} if limit else {}
-        super(TemplateList, self).__init__(airship, params)
+        super(TemplateList, self).__init__(airship, params, **kwargs)
 
 
 def merge_data(template_id, substitutions):
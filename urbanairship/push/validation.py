@@ -0,0 +1,601 @@
+import collections
+import datetime
+
+import six
+
+from urbanairship.automation.pipeline import Pipeline
+from urbanairship.push.audience import DEVICE_TOKEN_FORMAT, UUID_FORMAT
+from urbanairship.push.core import Push, ScheduledPush
+from urbanairship.push.fanout import MAX_OR_SELECTORS
+from urbanairship.push.payload import VALID_AUTOBADGE
+
+DEVICE_TYPES = frozenset(['ios', 'android', 'amazon', 'wns', 'web'])
+PUSH_KEYS = frozenset([
+    'audience', 'notification', 'device_types', 'options', 'campaigns',
+    'message', 'in_app',
+])
+NOTIFICATION_KEYS = frozenset([
+    'alert', 'actions', 'interactive', 'in_app',
+]) | DEVICE_TYPES
+MESSAGE_KEYS = frozenset([
+    'title', 'body', 'content_type', 'content_encoding', 'extra', 'expiry',
+    'icons', 'options', 'campaigns',
+])
+IN_APP_KEYS = frozenset([
+    'alert', 'display_type', 'expiry', 'display', 'actions', 'interactive',
+    'extra',
+])
+IN_APP_DISPLAY_TYPES = frozenset(['banner'])
+SCHEDULE_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+PIPELINE_KEYS = frozenset([
+    'enabled', 'outcome', 'name', 'immediate_trigger', 'cancellation_trigger',
+    'historical_trigger', 'constraint', 'condition', 'timing',
+])
+MAX_CONDITION_SETS = 20
+MAX_CAMPAIGN_CATEGORIES = 10
+MAX_CATEGORY_LENGTH = 64
+
+# Selector key to a compiled pattern its values must match, or None for
+# free-form strings such as tags.
+ATOMIC_SELECTORS = {
+    'ios_channel': UUID_FORMAT,
+    'android_channel': UUID_FORMAT,
+    'amazon_channel': UUID_FORMAT,
+    'channel': UUID_FORMAT,
+    'open_channel': UUID_FORMAT,
+    'wns': UUID_FORMAT,
+    'apid': UUID_FORMAT,
+    'device_token': DEVICE_TOKEN_FORMAT,
+    'tag': None,
+    'alias': None,
+    'segment': None,
+    'named_user': None,
+    'static_list': None,
+}
+# Extra keys allowed alongside an atomic selector.
+SELECTOR_QUALIFIERS = {'tag': frozenset(['group'])}
+
+
+class PayloadError(collections.namedtuple(
+        'PayloadError', ['path', 'message'])):
+    """A problem found in a payload.
+
+    :ivar path: Dotted location of the problem, such as
+        ``'push.notification.ios.badge'``.
+    :ivar message: Description of the problem.
+
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return '{0}: {1}'.format(self.path, self.message)
+
+
+def _join(path, key):
+    return '{0}.{1}'.format(path, key) if path else key
+
+
+def _is_int(value):
+    return isinstance(value, six.integer_types) and \
+        not isinstance(value, bool)
+
+
+def _check_keys(data, allowed, path, errors):
+    for key in sorted(set(data) - allowed):
+        errors.append(PayloadError(_join(path, key), 'unknown key'))
+
+
+def _check_expiry(value, path, errors):
+    if _is_int(value):
+        if value < 0:
+            errors.append(PayloadError(path, 'must not be negative'))
+    elif not isinstance(value, six.string_types):
+        errors.append(PayloadError(
+            path, 'must be an integer or a UTC time string'
+        ))
+
+
+def _check_device_types(value, path, errors):
+    if value == 'all':
+        return None
+    if not isinstance(value, list) or not value:
+        errors.append(PayloadError(
+            path, "must be 'all' or a non-empty list of device types"
+        ))
+        return None
+    seen = set()
+    for i, device_type in enumerate(value):
+        item = '{0}[{1}]'.format(path, i)
+        if not isinstance(device_type, six.string_types) or (
+                device_type not in DEVICE_TYPES and
+                not device_type.startswith('open::')):
+            errors.append(PayloadError(
+                item, 'invalid device type {0!r}'.format(device_type)
+            ))
+        elif device_type in seen:
+            errors.append(PayloadError(
+                item, 'duplicate device type {0!r}'.format(device_type)
+            ))
+        seen.add(device_type)
+    return seen
+
+
+def _check_selector(selector, path, errors, counter):
+    if not isinstance(selector, dict) or not selector:
+        errors.append(PayloadError(path, 'selector must be a non-empty '
+                                         'dictionary'))
+        return
+    compound = set(selector) & set(['and', 'or', 'not'])
+    if compound:
+        if len(selector) != 1:
+            errors.append(PayloadError(
+                path, 'compound selector must have exactly one key'
+            ))
+            return
+        operator = compound.pop()
+        child = selector[operator]
+        child_path = _join(path, operator)
+        if operator == 'not':
+            _check_selector(child, child_path, errors, counter)
+            return
+        if not isinstance(child, list) or not child:
+            errors.append(PayloadError(child_path, 'must be a non-empty list'))
+            return
+        for i, item in enumerate(child):
+            _check_selector(
+                item, '{0}[{1}]'.format(child_path, i), errors, counter
+            )
+        return
+    if 'location' in selector:
+        location = selector['location']
+        if len(selector) != 1 or not isinstance(location, dict) or \
+                'date' not in location or len(location) != 2:
+            errors.append(PayloadError(
+                _join(path, 'location'),
+                'must hold a date and a single location id or alias'
+            ))
+        counter[0] += 1
+        return
+    keys = [key for key in selector if key in ATOMIC_SELECTORS]
+    if len(keys) != 1:
+        errors.append(PayloadError(
+            path, 'unknown selector {0}'.format(sorted(selector))
+        ))
+        return
+    key = keys[0]
+    _check_keys(
+        selector, SELECTOR_QUALIFIERS.get(key, frozenset()) | set([key]),
+        path, errors
+    )
+    values = selector[key]
+    if not isinstance(values, list):
+        values = [values]
+    elif not values:
+        errors.append(PayloadError(_join(path, key), 'must not be empty'))
+    pattern = ATOMIC_SELECTORS[key]
+    for value in values:
+        counter[0] += 1
+        if not isinstance(value, six.string_types) or not value:
+            errors.append(PayloadError(
+                _join(path, key), 'must be a non-empty string'
+            ))
+        elif pattern is not None and not pattern.match(value):
+            errors.append(PayloadError(
+                _join(path, key), 'invalid value {0!r}'.format(value)
+            ))
+
+
+def _check_audience(audience, path, errors, allow_triggered=False):
+    if audience == 'all' or (allow_triggered and audience == 'triggered'):
+        return
+    if isinstance(audience, six.string_types):
+        errors.append(PayloadError(
+            path, 'invalid audience {0!r}'.format(audience)
+        ))
+        return
+    counter = [0]
+    _check_selector(audience, path, errors, counter)
+    if counter[0] > MAX_OR_SELECTORS:
+        errors.append(PayloadError(
+            path, 'has {0} selectors; the limit is {1}'.format(
+                counter[0], MAX_OR_SELECTORS)
+        ))
+
+
+def _check_ios(ios, path, errors):
+    badge = ios.get('badge')
+    if badge is not None and not _is_int(badge) and not (
+            isinstance(badge, six.string_types) and
+            VALID_AUTOBADGE.match(badge)):
+        errors.append(PayloadError(
+            _join(path, 'badge'), 'must be an integer or autobadge value'
+        ))
+    if ios.get('priority') not in (None, 5, 10):
+        errors.append(PayloadError(
+            _join(path, 'priority'), 'must be 5 or 10'
+        ))
+    if 'expiry' in ios:
+        _check_expiry(ios['expiry'], _join(path, 'expiry'), errors)
+
+
+def _check_android(android, path, errors):
+    ttl = android.get('time_to_live')
+    if ttl is not None:
+        _check_expiry(ttl, _join(path, 'time_to_live'), errors)
+    priority = android.get('priority')
+    if priority is not None and not (_is_int(priority) and
+                                     -2 <= priority <= 2):
+        errors.append(PayloadError(
+            _join(path, 'priority'), 'must be an integer from -2 to 2'
+        ))
+    if android.get('delivery_priority') not in (None, 'high', 'normal'):
+        errors.append(PayloadError(
+            _join(path, 'delivery_priority'), "must be 'high' or 'normal'"
+        ))
+
+
+PLATFORM_CHECKS = {'ios': _check_ios, 'android': _check_android}
+
+
+def _check_notification(notification, path, errors, device_types):
+    if not isinstance(notification, dict):
+        errors.append(PayloadError(path, 'must be a dictionary'))
+        return
+    if not notification:
+        errors.append(PayloadError(path, 'must not be empty'))
+    for key in sorted(notification):
+        key_path = _join(path, key)
+        value = notification[key]
+        if key.startswith('open::'):
+            platform = key
+        elif key in DEVICE_TYPES:
+            platform = key
+        elif key in NOTIFICATION_KEYS:
+            if key == 'alert' and not isinstance(value, six.string_types):
+                errors.append(PayloadError(key_path, 'must be a string'))
+            continue
+        else:
+            errors.append(PayloadError(key_path, 'unknown key'))
+            continue
+        if not isinstance(value, dict):
+            errors.append(PayloadError(key_path, 'must be a dictionary'))
+            continue
+        if device_types is not None and platform not in device_types:
+            errors.append(PayloadError(
+                key_path, 'override for a device type not in device_types'
+            ))
+        check = PLATFORM_CHECKS.get(platform)
+        if check is not None:
+            check(value, key_path, errors)
+
+
+def _check_campaigns(campaigns, path, errors):
+    if not isinstance(campaigns, dict):
+        errors.append(PayloadError(path, 'must be a dictionary'))
+        return
+    _check_keys(campaigns, frozenset(['categories']), path, errors)
+    categories = campaigns.get('categories')
+    if categories is None:
+        return
+    if isinstance(categories, six.string_types):
+        categories = [categories]
+    path = _join(path, 'categories')
+    if not isinstance(categories, list) or \
+            not 1 <= len(categories) <= MAX_CAMPAIGN_CATEGORIES:
+        errors.append(PayloadError(
+            path, 'must hold between 1 and {0} categories'.format(
+                MAX_CAMPAIGN_CATEGORIES)
+        ))
+        return
+    for category in categories:
+        if not isinstance(category, six.string_types) or \
+                not 1 <= len(category) <= MAX_CATEGORY_LENGTH:
+            errors.append(PayloadError(
+                path, 'invalid category {0!r}'.format(category)
+            ))
+
+
+def _check_message(message, path, errors):
+    if not isinstance(message, dict):
+        errors.append(PayloadError(path, 'must be a dictionary'))
+        return
+    _check_keys(message, MESSAGE_KEYS, path, errors)
+    for key in ('title', 'body'):
+        if not isinstance(message.get(key), six.string_types):
+            errors.append(PayloadError(_join(path, key), 'required string'))
+    if 'expiry' in message:
+        _check_expiry(message['expiry'], _join(path, 'expiry'), errors)
+    for key in ('extra', 'icons', 'options'):
+        if key in message and not isinstance(message[key], dict):
+            errors.append(PayloadError(
+                _join(path, key), 'must be a dictionary'
+            ))
+    if 'campaigns' in message:
+        _check_campaigns(
+            message['campaigns'], _join(path, 'campaigns'), errors
+        )
+
+
+def _check_in_app(in_app, path, errors):
+    if not isinstance(in_app, dict):
+        errors.append(PayloadError(path, 'must be a dictionary'))
+        return
+    _check_keys(in_app, IN_APP_KEYS, path, errors)
+    if not isinstance(in_app.get('alert'), six.string_types):
+        errors.append(PayloadError(_join(path, 'alert'), 'required string'))
+    if in_app.get('display_type') not in IN_APP_DISPLAY_TYPES:
+        errors.append(PayloadError(
+            _join(path, 'display_type'), 'must be one of {0}'.format(
+                ', '.join(sorted(IN_APP_DISPLAY_TYPES)))
+        ))
+    if 'expiry' in in_app:
+        _check_expiry(in_app['expiry'], _join(path, 'expiry'), errors)
+
+
+def _check_push(push, path, errors, allow_triggered=False):
+    if isinstance(push, Push):
+        push = push.payload
+    if not isinstance(push, dict):
+        errors.append(PayloadError(path or 'push', 'must be a dictionary'))
+        return
+    _check_keys(push, PUSH_KEYS, path, errors)
+    if push.get('audience') is None:
+        errors.append(PayloadError(_join(path, 'audience'), 'required'))
+    else:
+        _check_audience(
+            push['audience'], _join(path, 'audience'), errors,
+            allow_triggered
+        )
+    device_types = None
+    if push.get('device_types') is None:
+        errors.append(PayloadError(_join(path, 'device_types'), 'required'))
+    else:
+        device_types = _check_device_types(
+            push['device_types'], _join(path, 'device_types'), errors
+        )
+    if all(push.get(key) is None
+           for key in ('notification', 'message', 'in_app')):
+        errors.append(PayloadError(
+            path or 'push', 'needs a notification, message or in_app'
+        ))
+    if push.get('notification') is not None:
+        _check_notification(
+            push['notification'], _join(path, 'notification'), errors,
+            device_types
+        )
+    if push.get('message') is not None:
+        _check_message(push['message'], _join(path, 'message'), errors)
+        if device_types is not None and 'ios' not in device_types and \
+                'android' not in device_types and \
+                'amazon' not in device_types:
+            errors.append(PayloadError(
+                _join(path, 'message'),
+                'needs an ios, android or amazon device type'
+            ))
+    if push.get('in_app') is not None:
+        _check_in_app(push['in_app'], _join(path, 'in_app'), errors)
+    options = push.get('options')
+    if options is not None:
+        if not isinstance(options, dict):
+            errors.append(PayloadError(
+                _join(path, 'options'), 'must be a dictionary'
+            ))
+        elif 'expiry' in options:
+            _check_expiry(
+                options['expiry'], _join(path, 'options.expiry'), errors
+            )
+    if push.get('campaigns') is not None:
+        _check_campaigns(push['campaigns'], _join(path, 'campaigns'), errors)
+
+
+def validate_push(push):
+    """Check a complete push payload without sending it.
+
+    Beyond the per-field checks of the payload helpers, this checks how
+    fields fit together, such as platform overrides for device types the
+    push does not target, selector formats and counts in the audience, and
+    the required fields of messages and in-app messages. Every problem is
+    reported, not only the first.
+
+    >>> for error in validate_push(push): # doctest: +SKIP
+    ...     print(error)
+    notification.android: override for a device type not in device_types
+
+    :param push: A :py:class:`Push` or push payload dictionary.
+    :returns: List of :py:class:`PayloadError`; empty if none were found.
+
+    """
+    errors = []
+    _check_push(push, '', errors)
+    return errors
+
+
+def validate_scheduled_push(scheduled_push):
+    """Check a :py:class:`ScheduledPush` or schedule payload dictionary.
+
+    :returns: List of :py:class:`PayloadError`; empty if none were found.
+
+    """
+    if isinstance(scheduled_push, ScheduledPush):
+        data = {'schedule': scheduled_push.schedule,
+                'push': scheduled_push.push}
+        if scheduled_push.name is not None:
+            data['name'] = scheduled_push.name
+        scheduled_push = data
+    errors = []
+    if not isinstance(scheduled_push, dict):
+        return [PayloadError('schedule', 'must be a dictionary')]
+    _check_keys(scheduled_push, frozenset(['schedule', 'push', 'name']), '',
+                errors)
+    schedule = scheduled_push.get('schedule')
+    times = [key for key in ('scheduled_time', 'local_scheduled_time')
+             if isinstance(schedule, dict) and key in schedule]
+    if not isinstance(schedule, dict) or len(schedule) != 1 or \
+            len(times) != 1:
+        errors.append(PayloadError(
+            'schedule', 'must hold one of scheduled_time or '
+                        'local_scheduled_time'
+        ))
+    else:
+        try:
+            datetime.datetime.strptime(
+                schedule[times[0]], SCHEDULE_TIME_FORMAT
+            )
+        except (TypeError, ValueError):
+            errors.append(PayloadError(
+                _join('schedule', times[0]),
+                'must be a time formatted as YYYY-MM-DDTHH:MM:SS'
+            ))
+    name = scheduled_push.get('name')
+    if name is not None and not isinstance(name, six.string_types):
+        errors.append(PayloadError('name', 'must be a string'))
+    if scheduled_push.get('push') is None:
+        errors.append(PayloadError('push', 'required'))
+    else:
+        _check_push(scheduled_push['push'], 'push', errors)
+    return errors
+
+
+def _pipeline_data(pipeline):
+    # Pipeline.payload raises on the first problem, so read the fields.
+    data = {'enabled': pipeline.enabled, 'outcome': pipeline.outcome}
+    for key in sorted(PIPELINE_KEYS - set(['enabled', 'outcome'])):
+        value = getattr(pipeline, key)
+        if value is not None:
+            data[key] = value
+    return data
+
+
+def _check_timing(timing, errors):
+    if not isinstance(timing, dict):
+        errors.append(PayloadError('timing', 'must be a dictionary'))
+        return
+    if 'delay' in timing and not (
+            _is_int(timing['delay']) and timing['delay'] > 0):
+        errors.append(PayloadError(
+            'timing.delay', 'must be an integer greater than 0'
+        ))
+    schedule = timing.get('schedule')
+    if schedule is None:
+        return
+    if not isinstance(schedule, dict):
+        errors.append(PayloadError('timing.schedule', 'must be a dictionary'))
+        return
+    if schedule.get('type') not in ('local', 'utc'):
+        errors.append(PayloadError(
+            'timing.schedule.type', "must be 'local' or 'utc'"
+        ))
+    if 'dayparts' not in schedule:
+        errors.append(PayloadError('timing.schedule.dayparts', 'required'))
+
+
+def validate_pipeline(pipeline):
+    """Check an automation :py:class:`Pipeline` or pipeline payload.
+
+    Outcome pushes are checked as by :py:func:`validate_push`, except that
+    their audience may also be ``'triggered'``.
+
+    :returns: List of :py:class:`PayloadError`; empty if none were found.
+
+    """
+    if isinstance(pipeline, Pipeline):
+        pipeline = _pipeline_data(pipeline)
+    if not isinstance(pipeline, dict):
+        return [PayloadError('pipeline', 'must be a dictionary')]
+    errors = []
+    _check_keys(pipeline, PIPELINE_KEYS, '', errors)
+    if not isinstance(pipeline.get('enabled'), bool):
+        errors.append(PayloadError('enabled', 'required boolean'))
+    name = pipeline.get('name')
+    if name is not None and not isinstance(name, six.string_types):
+        errors.append(PayloadError('name', 'must be a string'))
+
+    outcomes = pipeline.get('outcome')
+    if not outcomes:
+        errors.append(PayloadError('outcome', 'required'))
+        outcomes = []
+    elif not isinstance(outcomes, list):
+        outcomes = [outcomes]
+    for i, outcome in enumerate(outcomes):
+        path = 'outcome[{0}]'.format(i) if len(outcomes) > 1 else 'outcome'
+        if not isinstance(outcome, dict) or 'push' not in outcome:
+            errors.append(PayloadError(path, 'must hold a push'))
+            continue
+        _check_push(outcome['push'], _join(path, 'push'), errors,
+                    allow_triggered=True)
+
+    if pipeline.get('immediate_trigger') is None and \
+            pipeline.get('historical_trigger') is None:
+        errors.append(PayloadError(
+            'pipeline', 'needs an immediate_trigger or historical_trigger'
+        ))
+    historical = pipeline.get('historical_trigger')
+    if historical is not None:
+        if not isinstance(historical, dict):
+            errors.append(PayloadError(
+                'historical_trigger', 'must be a dictionary'
+            ))
+        else:
+            if historical.get('event') != 'open':
+                errors.append(PayloadError(
+                    'historical_trigger.event', "must be 'open'"
+                ))
+            if historical.get('equals') != 0:
+                errors.append(PayloadError(
+                    'historical_trigger.equals', 'must be 0'
+                ))
+            days = historical.get('days')
+            if not _is_int(days) or not 1 <= days <= 90:
+                errors.append(PayloadError(
+                    'historical_trigger.days', 'must be between 1 and 90'
+                ))
+
+    conditions = pipeline.get('condition')
+    if conditions is not None:
+        if isinstance(conditions, dict):
+            conditions = [conditions]
+        if not isinstance(conditions, list):
+            errors.append(PayloadError(
+                'condition', 'must be a condition set or list of them'
+            ))
+            conditions = []
+        elif len(conditions) > MAX_CONDITION_SETS:
+            errors.append(PayloadError(
+                'condition', 'at most {0} condition sets are allowed'.format(
+                    MAX_CONDITION_SETS)
+            ))
+        for i, condition_set in enumerate(conditions):
+            if not isinstance(condition_set, dict):
+                errors.append(PayloadError(
+                    'condition[{0}]'.format(i), 'must be a dictionary'
+                ))
+                continue
+            for operator in sorted(set(condition_set) - set(['and', 'or'])):
+                errors.append(PayloadError(
+                    'condition[{0}].{1}'.format(i, operator),
+                    "operator must be 'and' or 'or'"
+                ))
+
+    if pipeline.get('timing') is not None:
+        _check_timing(pipeline['timing'], errors)
+    return errors
+
+
+def validate(obj):
+    """Check a :py:class:`Push`, :py:class:`ScheduledPush` or
+    :py:class:`Pipeline`, or a payload dictionary of one.
+
+    Dictionaries with a ``schedule`` key are checked as scheduled pushes and
+    those with an ``outcome`` key as pipelines.
+
+    :returns: List of :py:class:`PayloadError`; empty if none were found.
+
+    """
+    if isinstance(obj, Pipeline) or (
+            isinstance(obj, dict) and 'outcome' in obj):
+        return validate_pipeline(obj)
+    if isinstance(obj, ScheduledPush) or (
+            isinstance(obj, dict) and 'schedule' in obj):
+        return validate_scheduled_push(obj)
+    return validate_push(obj)
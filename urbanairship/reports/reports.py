@@ -14,11 +14,19 @@ class IndividualResponseStats(object):
 
 
 class ResponseList(common.IteratorParent):
+    """Iterator for listing pushes and their response statistics.
+
+    :ivar fields: Optional list of fields to keep for each push, e.g.
+        ``['push_uuid', 'direct_responses']``; other fields are dropped when
+        each page is loaded.
+
+    """
     next_url = common.REPORTS_URL + 'responses/list'
     data_attribute = 'pushes'
 
     def __init__(
-            self, airship, start_date, end_date, limit=None, start_id=None
+            self, airship, start_date, end_date, limit=None, start_id=None,
+            fields=None, **kwargs
     ):
         if not airship or not start_date or not end_date:
             raise TypeError('airship, start_date, & end_date cannot be empty')
@@ -33,7 +41,9 @@ class ResponseList(common.IteratorParent):
             params['limit'] = limit
         if start_id:
             params['start_id'] = start_id
-        super(ResponseList, self).__init__(airship, params)
+        super(ResponseList, self).__init__(
+            airship, params, fields, **kwargs
+        )
 
 
 class DevicesReport(object):
@@ -57,10 +67,18 @@ class DevicesReport(object):
 
 
 class OptInList(common.IteratorParent):
+    """Iterator for a time series report; base class of the other series.
+
+    :ivar fields: Optional list of fields to keep for each entry, e.g.
+        ``['date', 'ios']``; other fields are dropped when each page is
+        loaded.
+
+    """
     next_url = common.REPORTS_URL + 'optins/'
     data_attribute = 'optins'
 
-    def __init__(self, airship, start_date, end_date, precision):
+    def __init__(self, airship, start_date, end_date, precision, fields=None,
+                 **kwargs):
         if not airship or not start_date or not end_date or not precision:
             raise TypeError('None of the function parameters can be empty')
         if not isinstance(start_date, datetime) or not \
@@ -75,7 +93,7 @@ class OptInList(common.IteratorParent):
             'end': end_date.strftime('%Y-%m-%d %H:%M:%S'),
             'precision': precision
         }
-        super(OptInList, self).__init__(airship, params)
+        super(OptInList, self).__init__(airship, params, fields, **kwargs)
 
 
 class OptOutList(OptInList):
@@ -0,0 +1,78 @@
+import datetime
+import re
+
+import six
+
+# Matches the timestamp formats returned by the API:
+# 2016-08-17T23:29:52, 2013-07-17 21:17:42 and 2017-08-11T19:17:33.123Z.
+# Like strptime, single digit month, day and time fields are accepted.
+TIMESTAMP_FORMAT = re.compile(
+    r'^(\d{4})-(\d{1,2})-(\d{1,2})[T ](\d{1,2}):(\d{1,2}):(\d{1,2})'
+    r'(?:\.(\d{1,6})\d*)?Z?$'
+)
+
+UNKNOWN = 'UNKNOWN'
+
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 timestamp returned by the API into a UTC datetime.
+
+    Accepts a ``T`` or space separator, optional fractional seconds, and an
+    optional trailing ``Z``. ``datetime`` objects are returned unchanged.
+
+    >>> parse_timestamp('2016-08-17T23:29:52')
+    datetime.datetime(2016, 8, 17, 23, 29, 52)
+    >>> parse_timestamp('2017-08-11T19:17:33.5Z')
+    datetime.datetime(2017, 8, 11, 19, 17, 33, 500000)
+
+    :raises ValueError: The value is not a timestamp in a supported format.
+
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    if not isinstance(value, six.string_types):
+        raise ValueError('Invalid timestamp: %r' % (value,))
+    match = TIMESTAMP_FORMAT.match(value)
+    if match is None:
+        raise ValueError('Invalid timestamp: %r' % (value,))
+    year, month, day, hour, minute, second, fraction = match.groups()
+    return datetime.datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second),
+        int(fraction.ljust(6, '0')) if fraction else 0
+    )
+
+
+class LazyTimestamp(object):
+    """Attribute holding a raw API timestamp, parsed on first read.
+
+    The raw value is kept in the attribute named ``'_' + name`` (which must be
+    in the owner's ``__slots__`` if it has any). The first read parses it with
+    :py:func:`parse_timestamp` and caches the result; values that cannot be
+    parsed read as ``'UNKNOWN'``. ``None`` is returned as-is.
+
+    :param name: Public attribute name, e.g. ``'created'``.
+    :keyword readonly: If True, assignment raises ``AttributeError``.
+
+    """
+
+    def __init__(self, name, readonly=False):
+        self.name = name
+        self.attr = '_' + name
+        self.readonly = readonly
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.attr, None)
+        if isinstance(value, six.string_types) and value != UNKNOWN:
+            try:
+                value = parse_timestamp(value)
+            except ValueError:
+                value = UNKNOWN
+            setattr(obj, self.attr, value)
+        return value
+
+    def __set__(self, obj, value):
+        if self.readonly:
+            raise AttributeError("can't set attribute %s" % self.name)
+        setattr(obj, self.attr, value)